@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Blog Listing Serialization Benchmark
+Handled by: Backend Team
+Purpose: CPU time per /api/blogs request before and after the orjson fast path
+
+This script measures:
+- The response pipeline for a cached page of blogs: the previous path
+  (jsonable_encoder + stdlib JSONResponse) against FastJSONResponse
+- Optionally (--live), CPU time per GET /api/blogs through the real app,
+  database and Redis, in-process
+
+Usage:
+    python benchmark_blog_list.py [--rows 20] [--iterations 2000]
+    python benchmark_blog_list.py --live [--iterations 500]
+
+    # No Postgres or Redis needed: in-memory backends with synthetic latency
+    DB_BACKEND=memory REDIS_BACKEND=memory DB_MEMORY_LATENCY_MS=2 \
+        python benchmark_blog_list.py --live
+"""
+import argparse
+import asyncio
+import random
+import string
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from core.serialization import FastJSONResponse, orjson
+from endpoints.blogs import format_blog_preview
+
+def make_rows(count: int, content_size: int = 6000) -> list:
+    """Cached rows as the listing query used to return them (with content)"""
+    rows = []
+    for blog_id in range(1, count + 1):
+        created_at = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(hours=blog_id)
+        rows.append({
+            "id": blog_id,
+            "title": f"How to prepare for interview round {blog_id}",
+            "author": "PrepNexus Team",
+            "content": "".join(random.choices(string.ascii_letters + " ", k=content_size)),
+            "image": None,
+            "created_at": created_at,
+            "tags": ["interview", "career"],
+            "slug": f"interview-round-{blog_id}",
+            "avatar": None,
+            "date": created_at.date()
+        })
+    return rows
+
+def before(rows: list) -> bytes:
+    """Previous path: FastAPI ran jsonable_encoder, then JSONResponse used json.dumps"""
+    content = {"blogs": [format_blog_preview(row) for row in rows], "total": len(rows), "limit": 20, "offset": 0, "cached": True}
+    return JSONResponse(jsonable_encoder(content)).body
+
+def after(rows: list) -> bytes:
+    """Current path: the handler returns FastJSONResponse directly"""
+    content = {"blogs": [format_blog_preview(row) for row in rows], "total": len(rows), "limit": 20, "offset": 0, "cached": True}
+    return FastJSONResponse(content).body
+
+def cpu_ms_per_call(func, arg, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        func(arg)
+    return (time.process_time() - start) * 1000 / iterations
+
+async def live_cpu_ms(iterations: int, limit: int) -> float:
+    """CPU time per GET /api/blogs served by the real application"""
+    import httpx
+    from main import app, lifespan
+    
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            # Warm the cache before measuring
+            response = await client.get("/api/blogs/", params={"limit": limit})
+            response.raise_for_status()
+            
+            start = time.process_time()
+            for _ in range(iterations):
+                await client.get("/api/blogs/", params={"limit": limit})
+            return (time.process_time() - start) * 1000 / iterations
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/blogs response serialization")
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--live", action="store_true", help="Also measure the running app against the real database")
+    args = parser.parse_args()
+    
+    random.seed(42)
+    rows = make_rows(args.rows)
+    assert before(rows) and after(rows)
+    
+    print(f"🚀 /api/blogs serialization: {args.rows} blogs, {args.iterations} iterations (orjson {'on' if orjson else 'off'})\n")
+    before_ms = cpu_ms_per_call(before, rows, args.iterations)
+    after_ms = cpu_ms_per_call(after, rows, args.iterations)
+    print(f"  before (jsonable_encoder + json): {before_ms:.3f} ms CPU/request")
+    print(f"  after  (FastJSONResponse):        {after_ms:.3f} ms CPU/request")
+    print(f"✅ {before_ms / after_ms:.1f}x less CPU per request")
+    
+    if args.live:
+        print(f"\n📊 Live app: {asyncio.run(live_cpu_ms(args.iterations, args.rows)):.3f} ms CPU per GET /api/blogs/")
+
+if __name__ == "__main__":
+    main()
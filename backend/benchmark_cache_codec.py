@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Cache Codec Benchmark
+Handled by: DevOps Team
+Purpose: Compare the cache codecs against the old json.dumps encoder
+
+This script measures, per cached blog entry:
+- Encode and decode time
+- Serialized size in bytes
+- Redis MEMORY USAGE (when a Redis server is reachable)
+
+Usage:
+    python benchmark_cache_codec.py [--rows 20] [--content-size 6000] [--iterations 500]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import string
+import time
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+
+from core.cache_codec import CacheCodec, COMPRESSION_NAMES, SERIALIZER_NAMES, msgpack, orjson, zstandard
+from core.redis_manager import DateTimeEncoder
+
+load_dotenv()
+
+def make_blog(blog_id: int, content_size: int) -> dict:
+    """A blog row shaped like the blogs table"""
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(hours=blog_id)
+    words = [
+        "".join(random.choices(string.ascii_lowercase, k=random.randint(2, 10)))
+        for _ in range(content_size // 6)
+    ]
+    return {
+        "id": blog_id,
+        "title": f"How to prepare for interview round {blog_id}",
+        "author": "PrepNexus Team",
+        "content": " ".join(words)[:content_size],
+        "image": f"https://cdn.example.com/blogs/{blog_id}.png",
+        "tags": ["interview", "career", "dsa"],
+        "created_at": created_at,
+        "updated_at": created_at,
+        "published_at": created_at,
+        "status": "published",
+        "slug": f"interview-round-{blog_id}",
+        "meta_description": "Practical tips for technical interviews",
+        "view_count": random.randint(0, 10000),
+        "avatar": None,
+        "date": created_at.date()
+    }
+
+def make_entry(rows: int, content_size: int) -> dict:
+    """A cache entry as stored by the database manager"""
+    return {
+        "value": [make_blog(i, content_size) for i in range(1, rows + 1)],
+        "expires_at": time.time() + 300
+    }
+
+def legacy_encode(value) -> bytes:
+    return json.dumps(value, cls=DateTimeEncoder).encode()
+
+def legacy_decode(data: bytes):
+    return json.loads(data)
+
+def time_it(func, arg, iterations: int) -> float:
+    """Average milliseconds per call"""
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        func(arg)
+    return (time.perf_counter() - start_time) * 1000 / iterations
+
+def candidates():
+    """(label, encode, decode) for the legacy encoder and every installed codec"""
+    yield "json (legacy)", legacy_encode, legacy_decode
+    installed = {"json": True, "orjson": orjson is not None, "msgpack": msgpack is not None}
+    for serializer in SERIALIZER_NAMES:
+        if not installed[serializer]:
+            continue
+        for compression in COMPRESSION_NAMES:
+            if compression == "zstd" and zstandard is None:
+                continue
+            codec = CacheCodec(serializer=serializer, compression=compression)
+            yield codec.name, codec.encode, codec.decode
+
+async def redis_memory_usage(payloads: dict) -> dict:
+    """MEMORY USAGE of each payload stored under a scratch key"""
+    try:
+        import redis.asyncio as redis
+    except ImportError:
+        return {}
+    
+    client = redis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379/0'), socket_connect_timeout=2)
+    usage = {}
+    try:
+        await client.ping()
+        for label, data in payloads.items():
+            key = f"benchmark:codec:{label}"
+            await client.set(key, data, ex=60)
+            usage[label] = await client.memory_usage(key)
+            await client.delete(key)
+    except Exception as e:
+        print(f"⚠️ Redis not available, skipping MEMORY USAGE: {e}")
+    finally:
+        await client.close()
+    return usage
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cache codecs on blog entries")
+    parser.add_argument("--rows", type=int, default=20, help="Blogs per cache entry")
+    parser.add_argument("--content-size", type=int, default=6000, help="Characters of content per blog")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    
+    random.seed(42)
+    entry = make_entry(args.rows, args.content_size)
+    print(f"🚀 Cache codec benchmark: {args.rows} blogs x {args.content_size} chars, {args.iterations} iterations\n")
+    
+    results = []
+    payloads = {}
+    for label, encode, decode in candidates():
+        data = encode(entry)
+        payloads[label] = data
+        results.append({
+            "codec": label,
+            "encode_ms": time_it(encode, entry, args.iterations),
+            "decode_ms": time_it(decode, data, args.iterations),
+            "bytes": len(data)
+        })
+    
+    memory = asyncio.run(redis_memory_usage(payloads))
+    
+    baseline = results[0]
+    print(f"{'codec':<16}{'encode ms':>11}{'decode ms':>11}{'bytes':>10}{'size':>8}{'redis bytes':>13}")
+    for result in results:
+        redis_bytes = memory.get(result["codec"])
+        print(
+            f"{result['codec']:<16}{result['encode_ms']:>11.3f}{result['decode_ms']:>11.3f}"
+            f"{result['bytes']:>10}{result['bytes'] / baseline['bytes']:>7.0%}"
+            f"{redis_bytes if redis_bytes is not None else '-':>13}"
+        )
+    
+    per_blog = {result["codec"]: result["bytes"] / args.rows for result in results}
+    best = min(results[1:], key=lambda result: result["encode_ms"] + result["decode_ms"])
+    print(f"\n📊 Bytes per blog entry: legacy {per_blog[baseline['codec']]:.0f}, {best['codec']} {per_blog[best['codec']]:.0f}")
+    print(f"✅ Fastest round trip: {best['codec']} "
+          f"({(baseline['encode_ms'] + baseline['decode_ms']) / (best['encode_ms'] + best['decode_ms']):.1f}x legacy)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Connection Pooler Benchmark
+Handled by: Database Team
+Purpose: Compare direct and pooled (PgBouncer / Neon -pooler) database throughput
+
+This script measures, for each worker count:
+- Queries per second across all workers, each running the database
+  manager in its own process like a uvicorn worker
+- p50 / p99 query latency and errors
+- Transient retries made by pooler mode
+- Server connections open on the database mid-run (from pg_stat_activity)
+
+The direct run uses the manager's default mode against the compute
+endpoint; the pooled run uses pooler mode (no prepared statements, settings
+per transaction, small per-worker pools) against the -pooler endpoint.
+Queries bypass the cache so every call reaches the database.
+
+Usage:
+    python benchmark_pooler.py [--workers 4 8 16] [--duration 10] [--concurrency 10]
+    python benchmark_pooler.py --direct-url postgresql://... --pooled-url postgresql://...
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def endpoint_urls(database_url: str) -> Dict[str, str]:
+    """Direct and pooled variants of a Neon DSN"""
+    database_url = database_url.replace('postgresql+asyncpg://', 'postgresql://')
+    if '-pooler.' in database_url:
+        return {"direct": database_url.replace('-pooler.', '.'), "pooled": database_url}
+    
+    parts = urlsplit(database_url)
+    endpoint, _, domain = parts.hostname.partition('.')
+    netloc = parts.netloc.replace(parts.hostname, f"{endpoint}-pooler.{domain}")
+    return {"direct": database_url, "pooled": urlunsplit(parts._replace(netloc=netloc))}
+
+def run_worker(database_url: str, pooled: bool, workers: int, concurrency: int, duration: float,
+               ids: List[int], barrier, results):
+    """One uvicorn-like worker: its own database manager, hammered by `concurrency` tasks"""
+    os.environ.update(
+        NEON_DATABASE_URL=database_url,
+        DB_POOLER_MODE='true' if pooled else 'false',
+        WEB_CONCURRENCY=str(workers),
+        DB_CACHE_NOTIFY='false',
+        REDIS_BACKEND='memory'  # Results are never cached; keep Redis out of the measurement
+    )
+    from core import queries
+    from core.optimized_database import db
+    
+    async def client(stop_at: float, latencies: List[float], errors: List[str]):
+        while time.monotonic() < stop_at:
+            start_time = time.perf_counter()
+            try:
+                await db.fetchrow(queries.BLOGS_BY_ID, random.choice(ids), use_cache=False)
+                latencies.append((time.perf_counter() - start_time) * 1000)
+            except Exception as e:
+                errors.append(type(e).__name__)
+    
+    async def main():
+        await db.initialize()
+        try:
+            # Start together once every worker's pool is open
+            await asyncio.get_running_loop().run_in_executor(None, barrier.wait)
+            latencies: List[float] = []
+            errors: List[str] = []
+            stop_at = time.monotonic() + duration
+            await asyncio.gather(*(client(stop_at, latencies, errors) for _ in range(concurrency)))
+            results.put({
+                "latencies": latencies,
+                "errors": errors,
+                "retries": db.get_pooler_stats()["retries"]
+            })
+        finally:
+            await db.close()
+    
+    asyncio.run(main())
+
+async def blog_ids(database_url: str) -> List[int]:
+    import asyncpg
+    
+    conn = await asyncpg.connect(database_url)
+    try:
+        rows = await conn.fetch("SELECT id FROM blogs ORDER BY id LIMIT 1000")
+        return [row["id"] for row in rows] or [1]
+    finally:
+        await conn.close()
+
+async def server_connections(direct_url: str) -> Optional[int]:
+    """Client backends on the database, counted on the compute itself"""
+    import asyncpg
+    
+    try:
+        conn = await asyncpg.connect(direct_url)
+        try:
+            # Pooled server connections don't carry our application_name, so count them all
+            return await conn.fetchval(
+                "SELECT count(*) FROM pg_stat_activity "
+                "WHERE datname = current_database() AND backend_type = 'client backend' AND pid <> pg_backend_pid()"
+            )
+        finally:
+            await conn.close()
+    except Exception as e:
+        print(f"⚠️ Could not count server connections: {e}")
+        return None
+
+def run(mode: str, urls: Dict[str, str], workers: int, concurrency: int, duration: float, ids: List[int]) -> dict:
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=run_worker,
+            args=(urls[mode], mode == "pooled", workers, concurrency, duration, ids, barrier, results)
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    
+    barrier.wait(timeout=120)
+    time.sleep(duration / 2)
+    connections = asyncio.run(server_connections(urls["direct"]))
+    
+    outcomes = [results.get(timeout=duration + 120) for _ in processes]
+    for process in processes:
+        process.join()
+    
+    latencies = sorted(latency for outcome in outcomes for latency in outcome["latencies"])
+    return {
+        "mode": mode,
+        "workers": workers,
+        "qps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] if latencies else 0.0,
+        "errors": sum(len(outcome["errors"]) for outcome in outcomes),
+        "retries": sum(outcome["retries"] for outcome in outcomes),
+        "connections": connections
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark direct vs pooled database throughput")
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds measured per run")
+    parser.add_argument("--concurrency", type=int, default=10, help="In-flight queries per worker")
+    parser.add_argument("--direct-url", help="Compute endpoint DSN (default: NEON_DATABASE_URL without -pooler)")
+    parser.add_argument("--pooled-url", help="Pooler endpoint DSN (default: NEON_DATABASE_URL with -pooler)")
+    args = parser.parse_args()
+    
+    database_url = os.getenv('NEON_DATABASE_URL')
+    if not database_url and not (args.direct_url and args.pooled_url):
+        parser.error("set NEON_DATABASE_URL or pass --direct-url and --pooled-url")
+    urls = endpoint_urls(database_url) if database_url else {}
+    urls["direct"] = args.direct_url or urls["direct"]
+    urls["pooled"] = args.pooled_url or urls["pooled"]
+    
+    ids = asyncio.run(blog_ids(urls["direct"]))
+    print(f"🚀 Pooler benchmark: {args.concurrency} in-flight queries per worker, {args.duration:.0f}s per run\n")
+    print(f"{'mode':<8}{'workers':>8}{'qps':>10}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}{'retries':>9}{'server conns':>14}")
+    
+    results = []
+    for workers in args.workers:
+        for mode in ("direct", "pooled"):
+            result = run(mode, urls, workers, args.concurrency, args.duration, ids)
+            results.append(result)
+            connections = result["connections"]
+            print(
+                f"{mode:<8}{workers:>8}{result['qps']:>10.0f}{result['p50_ms']:>9.1f}{result['p99_ms']:>9.1f}"
+                f"{result['errors']:>8}{result['retries']:>9}{connections if connections is not None else '-':>14}"
+            )
+    
+    for workers in args.workers:
+        direct, pooled = (next(r for r in results if r["workers"] == workers and r["mode"] == mode) for mode in ("direct", "pooled"))
+        if direct["qps"]:
+            print(f"📊 {workers} workers: pooled runs at {pooled['qps'] / direct['qps']:.0%} of direct throughput")
+
+if __name__ == "__main__":
+    main()
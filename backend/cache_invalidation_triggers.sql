@@ -0,0 +1,45 @@
+-- Cache invalidation triggers
+-- Every insert, update or delete on blogs, users and jobs sends a
+-- notification on the cache_invalidation channel. The backend listens on a
+-- dedicated connection and evicts cached queries reading the changed table,
+-- so rows changed outside the API (migrations, admin SQL, scripts) never
+-- stay stale until their TTL runs out.
+-- Safe to run repeatedly; init.sql installs the same triggers.
+
+-- Payload: {"table": "blogs", "op": "UPDATE", "id": 42}
+-- Trigger arguments name columns whose changes alone don't affect cached
+-- results (e.g. view counters); updates touching only those are skipped.
+CREATE OR REPLACE FUNCTION notify_cache_invalidation()
+RETURNS TRIGGER AS $$
+DECLARE
+    row_id BIGINT;
+BEGIN
+    IF TG_OP = 'UPDATE' AND (to_jsonb(OLD) - TG_ARGV) = (to_jsonb(NEW) - TG_ARGV) THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        row_id := OLD.id;
+    ELSE
+        row_id := NEW.id;
+    END IF;
+
+    PERFORM pg_notify(
+        'cache_invalidation',
+        json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'id', row_id)::text
+    );
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS blogs_cache_invalidation ON blogs;
+CREATE TRIGGER blogs_cache_invalidation AFTER INSERT OR UPDATE OR DELETE ON blogs
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation('view_count', 'updated_at');
+
+DROP TRIGGER IF EXISTS users_cache_invalidation ON users;
+CREATE TRIGGER users_cache_invalidation AFTER INSERT OR UPDATE OR DELETE ON users
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation('last_login', 'updated_at');
+
+DROP TRIGGER IF EXISTS jobs_cache_invalidation ON jobs;
+CREATE TRIGGER jobs_cache_invalidation AFTER INSERT OR UPDATE OR DELETE ON jobs
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation();
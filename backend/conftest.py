@@ -0,0 +1,67 @@
+"""
+Test Configuration
+Handled by: Backend Team
+Purpose: Shared pytest fixtures for the backend behaviour tests
+
+This module provides:
+- The in-memory database and Redis backends for every test, so no
+  Postgres or Redis server is needed
+- A fresh, initialized database manager per test
+- A log of the statements that reached the database
+
+The older test_*.py scripts exercise a running server or a live database
+and are run directly (python test_server.py), not collected by pytest.
+"""
+import os
+import sys
+
+import pytest
+
+# Add the backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Must be set before the database manager and Redis manager initialize
+os.environ['DB_BACKEND'] = 'memory'
+os.environ['REDIS_BACKEND'] = 'memory'
+os.environ.setdefault('DB_MEMORY_SEED_BLOGS', '10')
+
+from core.optimized_database import OptimizedDatabaseManager
+
+# Live-service scripts, see above
+collect_ignore = [
+    "minimal_test.py",
+    "test_all_endpoints.py",
+    "test_blog_query.py",
+    "test_blog_system.py",
+    "test_debug_endpoint.py",
+    "test_final_setup.py",
+    "test_performance.py",
+    "test_redis.py",
+    "test_redis_connection.py",
+    "test_server.py"
+]
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+async def database():
+    """An initialized database manager over fresh in-memory tables and Redis"""
+    manager = OptimizedDatabaseManager()
+    await manager.initialize()
+    yield manager
+    await manager.close()
+
+@pytest.fixture
+def statements(database, monkeypatch):
+    """SQL of every statement run against the in-memory tables, in order"""
+    executed = []
+    run = database._memory_db.run
+    
+    def record(sql, args):
+        executed.append(" ".join(sql.split()))
+        return run(sql, args)
+    
+    monkeypatch.setattr(database._memory_db, "run", record)
+    return executed
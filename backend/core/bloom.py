@@ -0,0 +1,191 @@
+"""
+Bloom Filters
+Handled by: Database Team
+Purpose: Reject lookups for keys that certainly do not exist without any I/O
+
+This module provides:
+- BloomFilter, a compact probabilistic set with no false negatives
+- KnownKeys, a Bloom filter over one column of a table that is rebuilt in
+  the background whenever the table is invalidated
+- The known blog slug filter used by /api/blogs/slug/{slug}
+
+KnownKeys only answers "definitely absent" while its filter is complete:
+before the first build, after an invalidation until the rebuild finishes,
+and once the filter is older than max_age, every key is reported as
+possibly present and callers fall back to the (negatively cached) query.
+"""
+import asyncio
+import contextvars
+import hashlib
+import logging
+import math
+import os
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from .database import db
+from . import queries
+from .queries import NamedQuery
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Optimal bit count and number of hash functions for the target rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+    
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+    
+    def add(self, key: str):
+        """Add a key to the filter"""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+class KnownKeys:
+    """Bloom filter of every value of one column, kept in step with table invalidations"""
+    def __init__(self, name: str, query: NamedQuery, column: str, tables: Iterable[str],
+                 error_rate: float = 0.01, min_capacity: int = 1024, max_age: float = 3600.0,
+                 retry_interval: float = 30.0):
+        self.name = name
+        self.query = query
+        self.column = column
+        self.tables = frozenset(tables)
+        self.error_rate = error_rate
+        self.min_capacity = min_capacity
+        self.max_age = max_age  # Seconds before a filter is no longer trusted, in case an invalidation was missed
+        self.retry_interval = retry_interval  # Seconds between rebuild attempts after a failure
+        self._filter: Optional[BloomFilter] = None
+        self._built_at = 0.0
+        self._stale = True
+        self._generation = 0
+        self._last_attempt = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "builds": 0,
+            "build_errors": 0,
+            "rejected": 0,
+            "passed": 0,
+            "unavailable": 0
+        }
+    
+    def is_ready(self) -> bool:
+        """Whether the filter is complete and can be trusted to reject keys"""
+        return (
+            self._filter is not None
+            and not self._stale
+            and time.monotonic() - self._built_at < self.max_age
+        )
+    
+    def might_contain(self, key: str) -> bool:
+        """False only when the key certainly does not exist"""
+        if not self.is_ready():
+            self._stats["unavailable"] += 1
+            if time.monotonic() - self._last_attempt >= self.retry_interval:
+                self.rebuild()
+            return True
+        
+        if key in self._filter:
+            self._stats["passed"] += 1
+            return True
+        self._stats["rejected"] += 1
+        return False
+    
+    def on_invalidation(self, tables: Iterable[str]):
+        """Database invalidation listener: stop rejecting and rebuild when the table changed"""
+        if self.tables.isdisjoint(tables):
+            return
+        self._stale = True
+        self._generation += 1
+        self.rebuild()
+    
+    def rebuild(self) -> Optional[asyncio.Task]:
+        """Rebuild the filter in the background unless a build is already running"""
+        if self._task is None or self._task.done():
+            self._last_attempt = time.monotonic()
+            # A fresh context so a rebuild triggered from a request does not
+            # inherit that request's deadline
+            self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+        return self._task
+    
+    async def stop(self):
+        """Cancel a running build"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+    
+    async def _run(self):
+        # Keys written while a build streams may be missed; build again
+        # until no invalidation arrived in the meantime
+        while True:
+            generation = self._generation
+            try:
+                bloom = await self._build()
+            except Exception as e:
+                self._stats["build_errors"] += 1
+                logger.warning(f"⚠️ Building the {self.name} Bloom filter failed: {e}")
+                return
+            
+            self._filter = bloom
+            self._built_at = time.monotonic()
+            self._stats["builds"] += 1
+            if generation == self._generation:
+                self._stale = False
+                logger.info(f"✅ {self.name} Bloom filter built: {len(bloom)} keys in {bloom.size_bytes} bytes")
+                return
+    
+    async def _build(self) -> BloomFilter:
+        keys = [row[self.column] async for row in db.stream(self.query)]
+        bloom = BloomFilter(max(self.min_capacity, len(keys) * 2), self.error_rate)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Readiness, filter size and rejection counters"""
+        return {
+            "ready": self.is_ready(),
+            "building": self._task is not None and not self._task.done(),
+            "keys": len(self._filter) if self._filter else 0,
+            "size_bytes": self._filter.size_bytes if self._filter else 0,
+            "hash_functions": self._filter.num_hashes if self._filter else 0,
+            "error_rate": self.error_rate,
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if self._filter else None,
+            **self._stats
+        }
+
+# Known blog slugs; main.py builds it at startup and wires it to invalidations
+blog_slugs = KnownKeys(
+    "blog_slugs",
+    queries.BLOGS_ALL_SLUGS,
+    "slug",
+    tables=("blogs",),
+    error_rate=float(os.getenv('BLOG_SLUG_FILTER_ERROR_RATE', '0.01')),
+    max_age=float(os.getenv('BLOG_SLUG_FILTER_MAX_AGE', '3600'))
+)
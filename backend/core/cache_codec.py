@@ -0,0 +1,267 @@
+"""
+Cache Value Codec
+Handled by: DevOps Team
+Purpose: Compact, typed serialization for values stored in Redis
+
+This module provides:
+- Pluggable serializers: orjson, msgpack or the stdlib json fallback
+- Typed round-tripping of datetime, date, Decimal and UUID values
+- zstd (or zlib) compression for values above a size threshold
+- A two byte header (format version, serializer/compression flags) on
+  every value so the format can change without flushing Redis
+
+orjson, msgpack and zstandard are optional; the codec picks the best one
+installed. Values written before the header existed (plain JSON text) are
+still readable.
+"""
+import json
+import logging
+import uuid
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+SERIALIZER_JSON = 0
+SERIALIZER_ORJSON = 1
+SERIALIZER_MSGPACK = 2
+SERIALIZER_NAMES = {"json": SERIALIZER_JSON, "orjson": SERIALIZER_ORJSON, "msgpack": SERIALIZER_MSGPACK}
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSION_NAMES = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "zstd": COMPRESSION_ZSTD}
+
+# JSON serializers store typed values as single-key objects, e.g. {"$dt": "2024-01-01T00:00:00"}
+_JSON_TAGS: Dict[str, Callable[[str], Any]] = {
+    "$dt": datetime.fromisoformat,
+    "$d": date.fromisoformat,
+    "$dec": Decimal,
+    "$uuid": uuid.UUID
+}
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+def _tag(value: Any) -> Any:
+    """Replace typed values with tagged objects before JSON serialization"""
+    value_type = type(value)
+    if value_type in _SCALAR_TYPES:
+        return value
+    if value_type is dict:
+        return {key: _tag(item) for key, item in value.items()}
+    if value_type is list or value_type is tuple:
+        return [_tag(item) for item in value]
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$dec": str(value)}
+    if isinstance(value, uuid.UUID):
+        return {"$uuid": str(value)}
+    if isinstance(value, dict):
+        return {key: _tag(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_tag(item) for item in value]
+    return value
+
+def _revive(obj: Dict[str, Any]) -> Any:
+    """Turn a tagged object back into its typed value"""
+    if len(obj) == 1:
+        key, raw = next(iter(obj.items()))
+        reviver = _JSON_TAGS.get(key)
+        if reviver is not None and isinstance(raw, str):
+            return reviver(raw)
+    return obj
+
+def _untag(value: Any) -> Any:
+    """Revive tagged objects throughout a decoded structure"""
+    value_type = type(value)
+    if value_type is dict:
+        revived = _revive(value)
+        if revived is not value:
+            return revived
+        return {key: _untag(item) for key, item in value.items()}
+    if value_type is list:
+        return [_untag(item) for item in value]
+    return value
+
+# msgpack carries typed values as extension types
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_DECIMAL = 3
+_EXT_UUID = 4
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, date):
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode())
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(value).encode())
+    if isinstance(value, uuid.UUID):
+        return msgpack.ExtType(_EXT_UUID, value.bytes)
+    if isinstance(value, set):
+        return list(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    if code == _EXT_UUID:
+        return uuid.UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(_tag(value), separators=(",", ":")).encode()
+
+def _json_loads(data: bytes) -> Any:
+    return json.loads(data, object_hook=_revive)
+
+def _orjson_dumps(value: Any) -> bytes:
+    return orjson.dumps(_tag(value))
+
+def _orjson_loads(data: bytes) -> Any:
+    return _untag(orjson.loads(data))
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, default=_msgpack_default, use_bin_type=True)
+
+def _msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False)
+
+_SERIALIZERS: Dict[int, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    SERIALIZER_JSON: (_json_dumps, _json_loads),
+    SERIALIZER_ORJSON: (_orjson_dumps, _orjson_loads),
+    SERIALIZER_MSGPACK: (_msgpack_dumps, _msgpack_loads)
+}
+
+def _available_serializer(name: str) -> int:
+    """Resolve a serializer name, picking the fastest installed for 'auto'"""
+    if name == "auto":
+        if orjson is not None:
+            return SERIALIZER_ORJSON
+        if msgpack is not None:
+            return SERIALIZER_MSGPACK
+        return SERIALIZER_JSON
+    
+    serializer = SERIALIZER_NAMES[name]
+    if (serializer == SERIALIZER_ORJSON and orjson is None) or (serializer == SERIALIZER_MSGPACK and msgpack is None):
+        logger.warning(f"⚠️ Cache codec '{name}' is not installed, falling back to json")
+        return SERIALIZER_JSON
+    return serializer
+
+def _available_compression(name: str) -> int:
+    """Resolve a compression name, preferring zstd for 'auto'"""
+    if name == "auto":
+        return COMPRESSION_ZSTD if zstandard is not None else COMPRESSION_ZLIB
+    
+    compression = COMPRESSION_NAMES[name]
+    if compression == COMPRESSION_ZSTD and zstandard is None:
+        logger.warning("⚠️ zstandard is not installed, falling back to zlib compression")
+        return COMPRESSION_ZLIB
+    return compression
+
+class CacheCodec:
+    def __init__(self, serializer: str = "auto", compression: str = "auto", compress_threshold: int = 1024,
+                 compression_level: int = 3):
+        self.serializer = _available_serializer(serializer)
+        self.compression = _available_compression(compression)
+        self.compress_threshold = compress_threshold  # Bytes; smaller payloads are stored as is
+        self.compression_level = compression_level
+        self._zstd_compressor = zstandard.ZstdCompressor(level=compression_level) if zstandard else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+        self._stats = {
+            "encoded": 0,
+            "decoded": 0,
+            "compressed": 0,
+            "legacy_decoded": 0,
+            "bytes_serialized": 0,
+            "bytes_stored": 0
+        }
+    
+    @property
+    def name(self) -> str:
+        """Human readable codec description, e.g. 'orjson+zstd'"""
+        serializer = next(name for name, code in SERIALIZER_NAMES.items() if code == self.serializer)
+        compression = next(name for name, code in COMPRESSION_NAMES.items() if code == self.compression)
+        return f"{serializer}+{compression}"
+    
+    def encode(self, value: Any) -> bytes:
+        """Serialize a value, compressing it when large enough to benefit"""
+        dumps, _ = _SERIALIZERS[self.serializer]
+        payload = dumps(value)
+        serialized_size = len(payload)
+        compression = COMPRESSION_NONE
+        
+        if self.compression != COMPRESSION_NONE and len(payload) >= self.compress_threshold:
+            compressed = self._compress(payload)
+            if len(compressed) < len(payload):
+                payload, compression = compressed, self.compression
+                self._stats["compressed"] += 1
+        
+        data = bytes((FORMAT_VERSION, self.serializer << 4 | compression)) + payload
+        self._stats["encoded"] += 1
+        self._stats["bytes_serialized"] += serialized_size
+        self._stats["bytes_stored"] += len(data)
+        return data
+    
+    def decode(self, data: bytes) -> Any:
+        """Deserialize a value written by encode(), or legacy plain JSON"""
+        if isinstance(data, str):
+            data = data.encode()
+        
+        if not data or data[0] != FORMAT_VERSION:
+            # Written by the old json.dumps encoder
+            self._stats["legacy_decoded"] += 1
+            return json.loads(data)
+        
+        flags = data[1]
+        serializer, compression = flags >> 4, flags & 0x0F
+        payload = data[2:]
+        if compression == COMPRESSION_ZSTD:
+            if self._zstd_decompressor is None:
+                raise ValueError("Cached value is zstd-compressed but zstandard is not installed")
+            payload = self._zstd_decompressor.decompress(payload)
+        elif compression == COMPRESSION_ZLIB:
+            payload = zlib.decompress(payload)
+        
+        _, loads = _SERIALIZERS[serializer]
+        self._stats["decoded"] += 1
+        return loads(payload)
+    
+    def _compress(self, payload: bytes) -> bytes:
+        if self.compression == COMPRESSION_ZSTD:
+            return self._zstd_compressor.compress(payload)
+        return zlib.compress(payload, self.compression_level)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Codec configuration and counters"""
+        return {
+            "codec": self.name,
+            "compress_threshold": self.compress_threshold,
+            **self._stats
+        }
@@ -0,0 +1,157 @@
+"""
+Cache Keyspace Statistics
+Handled by: DevOps Team
+Purpose: Break cache traffic down by key namespace, query tag and Redis command
+
+This module provides:
+- KeyspaceStats, counting hits, misses, sets and bytes read and written
+  per key namespace (db, session, ratelimit, cache:blogs, ...) and per
+  query tag (the tables a cached query reads)
+- CommandLatency, one latency histogram per Redis command
+- Merging of the raw counters published by each worker, and a Prometheus
+  text rendering of the result
+
+Raw snapshots only hold sums and cumulative bucket counts, so snapshots from
+several workers can be added together.
+"""
+from typing import Any, Dict, Iterable, List
+
+from .metrics import LatencyHistogram
+
+# hits include local_hits, the hot-key hits answered from process memory
+COUNTERS = ("hits", "local_hits", "misses", "sets", "bytes_read", "bytes_written")
+
+def namespace(key: Any) -> str:
+    """Namespace of a key: its first segment, or first two for cache:<domain>:... keys"""
+    if isinstance(key, bytes):
+        key = key.decode("utf-8", "replace")
+    parts = key.split(":", 2)
+    if parts[0] == "cache" and len(parts) > 2:
+        return f"cache:{parts[1]}"
+    return parts[0] if len(parts) > 1 else "(none)"
+
+def _add(target: Dict[str, int], counts: Dict[str, int]):
+    for name in COUNTERS:
+        target[name] = target.get(name, 0) + counts.get(name, 0)
+
+def _summary(counts: Dict[str, int]) -> Dict[str, Any]:
+    lookups = counts["hits"] + counts["misses"]
+    redis_hits = counts["hits"] - counts["local_hits"]
+    return {
+        **counts,
+        "hit_rate_percent": round(counts["hits"] / lookups * 100, 2) if lookups else None,
+        "avg_bytes_read": round(counts["bytes_read"] / redis_hits) if redis_hits else 0,
+        "avg_bytes_written": round(counts["bytes_written"] / counts["sets"]) if counts["sets"] else 0
+    }
+
+class KeyspaceStats:
+    """
+    Cache counters by key namespace and by query tag.
+    
+    At most max_tags tags are tracked individually; later ones are counted
+    under "(other)" so callers passing unbounded tags can't grow it forever.
+    """
+    def __init__(self, max_tags: int = 200):
+        self._max_tags = max_tags
+        self._namespaces: Dict[str, Dict[str, int]] = {}
+        self._tags: Dict[str, Dict[str, int]] = {}
+    
+    def record(self, key: Any, tags: Iterable[str] = (), **counts: int):
+        """Add counts (hits=1, bytes_read=..., ...) for one key and its tags"""
+        _add(self._namespaces.setdefault(namespace(key), {}), counts)
+        for tag in tags:
+            if tag not in self._tags and len(self._tags) >= self._max_tags:
+                tag = "(other)"
+            _add(self._tags.setdefault(tag, {}), counts)
+    
+    def raw(self) -> Dict[str, Any]:
+        """Counters for publishing and merging"""
+        return {
+            "namespaces": {name: dict(counts) for name, counts in self._namespaces.items()},
+            "tags": {name: dict(counts) for name, counts in self._tags.items()}
+        }
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return summarize_keyspace(self.raw())
+
+class CommandLatency:
+    """Latency histogram per Redis command, pipeline or script"""
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+    
+    def observe(self, command: str, value_ms: float):
+        histogram = self._histograms.get(command)
+        if histogram is None:
+            histogram = self._histograms[command] = LatencyHistogram()
+        histogram.observe(value_ms)
+    
+    def raw(self) -> Dict[str, Any]:
+        """Counts, sums and cumulative buckets for publishing and merging"""
+        return {
+            command: {
+                "count": histogram.count,
+                "total_ms": histogram.total_ms,
+                "max_ms": histogram.max_ms,
+                "buckets": histogram.merge_counts()
+            }
+            for command, histogram in self._histograms.items()
+        }
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-command summaries, with percentiles over this worker's recent calls"""
+        return {command: histogram.snapshot() for command, histogram in sorted(self._histograms.items())}
+
+def summarize_keyspace(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Add hit rates and average sizes to raw keyspace counters"""
+    return {
+        section: {name: _summary({field: counts.get(field, 0) for field in COUNTERS})
+                  for name, counts in sorted(raw.get(section, {}).items())}
+        for section in ("namespaces", "tags")
+    }
+
+def merge_raw(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Add up raw snapshots ({"keyspace": ..., "commands": ...}) from several workers"""
+    keyspace: Dict[str, Dict[str, Dict[str, int]]] = {"namespaces": {}, "tags": {}}
+    commands: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for section in ("namespaces", "tags"):
+            for name, counts in snapshot.get("keyspace", {}).get(section, {}).items():
+                _add(keyspace[section].setdefault(name, {}), counts)
+        for command, stats in snapshot.get("commands", {}).items():
+            merged = commands.setdefault(command, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": {}})
+            merged["count"] += stats["count"]
+            merged["total_ms"] += stats["total_ms"]
+            merged["max_ms"] = max(merged["max_ms"], stats["max_ms"])
+            for bound, count in stats["buckets"].items():
+                merged["buckets"][bound] = merged["buckets"].get(bound, 0) + count
+    return {"keyspace": keyspace, "commands": commands}
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_prometheus(merged: Dict[str, Any]) -> str:
+    """Render merged counters in the Prometheus text exposition format"""
+    lines = []
+    # Tags get their own metric names: a lookup counts once per tag, so summing
+    # them with the namespace series would double count
+    for section, prefix, label in (("namespaces", "redis_cache", "namespace"), ("tags", "redis_cache_tag", "tag")):
+        entries = sorted(merged["keyspace"][section].items())
+        families = (
+            ("lookups_total", (("hits", ',result="hit"'), ("misses", ',result="miss"'))),
+            ("sets_total", (("sets", ""),)),
+            ("bytes_total", (("bytes_read", ',direction="read"'), ("bytes_written", ',direction="written"')))
+        )
+        for suffix, series in families:
+            lines.append(f"# TYPE {prefix}_{suffix} counter")
+            for name, counts in entries:
+                for field, extra in series:
+                    lines.append(f'{prefix}_{suffix}{{{label}="{_label(name)}"{extra}}} {counts.get(field, 0)}')
+    
+    lines.append("# TYPE redis_command_duration_ms histogram")
+    for command, stats in sorted(merged["commands"].items()):
+        labels = f'command="{_label(command)}"'
+        for bound, count in stats["buckets"].items():
+            lines.append(f'redis_command_duration_ms_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'redis_command_duration_ms_sum{{{labels}}} {round(stats["total_ms"], 3)}')
+        lines.append(f'redis_command_duration_ms_count{{{labels}}} {stats["count"]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,199 @@
+"""
+Cache Warmer
+Handled by: Database Team
+Purpose: Prefetch hot queries and endpoints so users never hit a cold cache
+
+This module provides:
+- A declarative warm-up manifest of queries (WarmQuery) and endpoints
+  (WarmEndpoint)
+- Row-driven entries (RowsOf) that warm one query per row of another,
+  e.g. the most viewed blog pages
+- Bounded-concurrency execution from the application lifespan, re-run
+  after the cache is cleared
+- A readiness flag for /health/ready
+
+Query entries must use the same fetch method, arguments and TTLs as the
+endpoint that reads them, or they will warm a different cache key.
+"""
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+from .database import db
+from .queries import NamedQuery
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class RowsOf:
+    """Arguments taken from each row of an uncached source query"""
+    query: NamedQuery
+    args: Tuple[Any, ...] = ()
+
+@dataclass
+class WarmQuery:
+    """Run a cached read so its result lands in Redis and the local cache"""
+    method: str  # fetch, fetchrow or fetchval
+    query: NamedQuery
+    args: Union[Tuple[Any, ...], RowsOf] = ()
+    cache_ttl: Optional[int] = None
+    stale_ttl: int = 0
+    
+    @property
+    def name(self) -> str:
+        return self.query.name
+
+@dataclass
+class WarmEndpoint:
+    """GET an endpoint in-process, warming everything it reads"""
+    path: str
+    params: Optional[Dict[str, Any]] = None
+    
+    @property
+    def name(self) -> str:
+        return self.path
+
+WarmupEntry = Union[WarmQuery, WarmEndpoint]
+
+class CacheWarmer:
+    def __init__(self, manifest: Sequence[WarmupEntry] = (), concurrency: int = 4, timeout: float = 60.0):
+        self.manifest = list(manifest)
+        self.concurrency = concurrency
+        self.timeout = timeout  # Seconds before a warm-up is abandoned and the instance marked ready anyway
+        self._app = None
+        self._ready = False
+        self._task: Optional[asyncio.Task] = None
+        self._last_run: Dict[str, Any] = {}
+        self._stats = {
+            "runs": 0,
+            "warmed": 0,
+            "failed": 0,
+            "timeouts": 0
+        }
+    
+    def is_ready(self) -> bool:
+        """Whether the startup warm-up has finished (successfully or not)"""
+        return self._ready
+    
+    def start(self, app=None, reason: str = "startup") -> asyncio.Task:
+        """Start a warm-up in the background; endpoint entries need the ASGI app"""
+        if app is not None:
+            self._app = app
+        if self._task is None or self._task.done():
+            # A fresh context so a re-warm triggered from a request does not
+            # inherit that request's deadline
+            self._task = asyncio.create_task(self._run(reason), context=contextvars.Context())
+        return self._task
+    
+    def rewarm(self):
+        """Warm again after the cache was cleared, without affecting readiness"""
+        if self._ready:
+            self.start(reason="cache_clear")
+    
+    async def stop(self):
+        """Cancel a running warm-up"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+    
+    async def _run(self, reason: str):
+        start_time = time.perf_counter()
+        self._stats["runs"] += 1
+        results: List[Tuple[str, bool]] = []
+        status = "complete"
+        try:
+            await asyncio.wait_for(self._warm_all(results), self.timeout)
+        except asyncio.TimeoutError:
+            status = "timed_out"
+            self._stats["timeouts"] += 1
+            logger.warning(f"⚠️ Cache warm-up timed out after {self.timeout}s")
+        finally:
+            warmed = sum(1 for _, ok in results if ok)
+            failed = [name for name, ok in results if not ok]
+            self._stats["warmed"] += warmed
+            self._stats["failed"] += len(failed)
+            self._last_run = {
+                "reason": reason,
+                "status": status,
+                "warmed": warmed,
+                "failed": failed,
+                "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+                "finished_at": time.time()
+            }
+            self._ready = True
+        logger.info(f"🔥 Cache warm-up ({reason}) {status}: {warmed} warmed, {len(failed)} failed "
+                    f"in {self._last_run['duration_ms']:.0f}ms")
+    
+    async def _warm_all(self, results: List[Tuple[str, bool]]):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def warm(name: str, load):
+            async with semaphore:
+                try:
+                    await load()
+                    results.append((name, True))
+                except Exception as e:
+                    results.append((name, False))
+                    logger.warning(f"⚠️ Cache warm-up of {name} failed: {e}")
+        
+        jobs = []
+        for entry in self.manifest:
+            if isinstance(entry, WarmEndpoint):
+                jobs.append(warm(entry.name, lambda entry=entry: self._get_endpoint(entry)))
+                continue
+            
+            if isinstance(entry.args, RowsOf):
+                try:
+                    rows = await db.fetch(entry.args.query, *entry.args.args, use_cache=False)
+                except Exception as e:
+                    results.append((entry.name, False))
+                    logger.warning(f"⚠️ Cache warm-up source {entry.args.query.name} failed: {e}")
+                    continue
+                arg_sets = [tuple(row.values()) for row in rows]
+            else:
+                arg_sets = [entry.args]
+            
+            for args in arg_sets:
+                jobs.append(warm(entry.name, lambda entry=entry, args=args: self._run_query(entry, args)))
+        
+        await asyncio.gather(*jobs)
+    
+    async def _run_query(self, entry: WarmQuery, args: Tuple[Any, ...]):
+        method = getattr(db, entry.method)
+        await method(entry.query, *args, cache_ttl=entry.cache_ttl, stale_ttl=entry.stale_ttl)
+    
+    async def _get_endpoint(self, entry: WarmEndpoint):
+        if self._app is None:
+            raise RuntimeError("no ASGI app to warm endpoints with")
+        
+        transport = httpx.ASGITransport(app=self._app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+            response = await client.get(entry.path, params=entry.params)
+            response.raise_for_status()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Readiness, manifest size and the last run's outcome"""
+        return {
+            "ready": self._ready,
+            "running": self._task is not None and not self._task.done(),
+            "entries": len(self.manifest),
+            "concurrency": self.concurrency,
+            **self._stats,
+            "last_run": self._last_run
+        }
+
+# Global cache warmer instance; main.py sets its manifest
+cache_warmer = CacheWarmer(
+    concurrency=int(os.getenv('CACHE_WARMUP_CONCURRENCY', '4')),
+    timeout=float(os.getenv('CACHE_WARMUP_TIMEOUT', '60'))
+)
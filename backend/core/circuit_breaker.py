@@ -0,0 +1,158 @@
+"""
+Circuit Breaker
+Handled by: Database Team
+Purpose: Fail fast while a dependency is down instead of queueing on timeouts
+
+This module provides:
+- A closed / open / half-open circuit breaker
+- Consecutive-failure tripping with a cool-down before probing
+- Limited half-open probe calls that close or re-open the circuit
+- Transition counters and state timings for monitoring
+
+Callers wrap each dependency call with before_call() and then
+record_success() or record_failure(). Only failures that indicate the
+dependency is unavailable (timeouts, connection errors) should be
+recorded; errors the dependency answered with are successes.
+"""
+import logging
+import time
+from enum import Enum
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency while its circuit is open"""
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit breaker '{name}' is open - retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, success_threshold: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold  # Consecutive failures that open the circuit
+        self.reset_timeout = reset_timeout  # Seconds open before probing
+        self.half_open_max_calls = half_open_max_calls  # Concurrent probes while half-open
+        self.success_threshold = success_threshold  # Probe successes needed to close
+        self._state = CircuitState.CLOSED
+        self._state_since = time.monotonic()
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._probes = 0
+        self._probe_successes = 0
+        self._last_error: Optional[str] = None
+        self._stats = {
+            "successes": 0,
+            "failures": 0,
+            "rejected": 0,
+            "opened": 0
+        }
+        self._transitions: Dict[str, int] = {}
+    
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once the cool-down passes"""
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+    
+    def allows_requests(self) -> bool:
+        """Whether a call would currently be let through, without reserving a probe"""
+        state = self.state
+        if state == CircuitState.OPEN:
+            return False
+        return state == CircuitState.CLOSED or self._probes < self.half_open_max_calls
+    
+    def before_call(self):
+        """Admit a call or raise CircuitOpenError"""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return
+        
+        if state == CircuitState.HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return
+        
+        self._stats["rejected"] += 1
+        raise CircuitOpenError(self.name, self.retry_after())
+    
+    def record_success(self):
+        """Record a call the dependency answered"""
+        self._stats["successes"] += 1
+        self._consecutive_failures = 0
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+            self._probe_successes += 1
+            if self._probe_successes >= self.success_threshold:
+                self._transition(CircuitState.CLOSED)
+    
+    def record_failure(self, error: Optional[BaseException] = None):
+        """Record a call that failed because the dependency was unavailable"""
+        self._stats["failures"] += 1
+        self._consecutive_failures += 1
+        if error is not None:
+            self._last_error = f"{type(error).__name__}: {error}"
+        
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+            self._transition(CircuitState.OPEN)
+        elif self._state == CircuitState.CLOSED and self._consecutive_failures >= self.failure_threshold:
+            self._transition(CircuitState.OPEN)
+    
+    def release(self):
+        """Return a half-open probe slot for a call that ended without an outcome (e.g. cancelled)"""
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+    
+    def retry_after(self) -> float:
+        """Seconds until the circuit will allow a probe"""
+        if self._state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+    
+    def reset(self):
+        """Force the circuit closed"""
+        if self._state != CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
+        self._consecutive_failures = 0
+    
+    def _transition(self, new_state: CircuitState):
+        old_state = self._state
+        key = f"{old_state.value}_to_{new_state.value}"
+        self._transitions[key] = self._transitions.get(key, 0) + 1
+        self._state = new_state
+        self._state_since = time.monotonic()
+        self._probes = 0
+        self._probe_successes = 0
+        
+        if new_state == CircuitState.OPEN:
+            self._opened_at = self._state_since
+            self._stats["opened"] += 1
+            logger.error(f"🚨 Circuit breaker '{self.name}' opened after {self._consecutive_failures} failures: {self._last_error}")
+        elif new_state == CircuitState.HALF_OPEN:
+            logger.warning(f"⚠️ Circuit breaker '{self.name}' half-open - probing")
+        else:
+            logger.info(f"🔄 Circuit breaker '{self.name}' closed")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Breaker state, counters and transition history"""
+        state = self.state
+        return {
+            "state": state.value,
+            "open": state == CircuitState.OPEN,
+            "seconds_in_state": round(time.monotonic() - self._state_since, 2),
+            "retry_after": round(self.retry_after(), 2),
+            "consecutive_failures": self._consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "last_error": self._last_error,
+            **self._stats,
+            "transitions": dict(self._transitions)
+        }
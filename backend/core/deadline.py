@@ -0,0 +1,189 @@
+"""
+Request Deadlines
+Handled by: Backend Team
+Purpose: Give every request a time budget that its database, cache and HTTP calls honor
+
+This module provides:
+- A request-scoped deadline carried in a context variable
+- Remaining-time timeouts for asyncpg, Redis and aiohttp calls
+- DeadlineMiddleware, which sets per-route budgets and cancels requests
+  that run out of time with a 504
+
+Calls made outside a request (startup, background tasks) have no deadline
+and keep their own configured timeouts.
+"""
+import asyncio
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Absolute time.monotonic() deadline of the current request
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+# Upstream callers may send their own remaining budget; it can only shorten ours
+DEADLINE_HEADER = b"x-request-timeout-ms"
+
+_config: Dict[str, Any] = {"default_budget_seconds": None, "budgets": {}}
+_stats = {
+    "requests": 0,
+    "timed_out": 0,
+    "late_errors": 0
+}
+
+class DeadlineExceeded(Exception):
+    """Raised when the current request's time budget has run out"""
+    def __init__(self, message: str = "Request deadline exceeded"):
+        super().__init__(message)
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def expired() -> bool:
+    """Whether the current deadline has passed"""
+    left = remaining()
+    return left is not None and left <= 0
+
+def timeout(default: Optional[float] = None) -> Optional[float]:
+    """
+    Timeout for a single call: the smaller of default and the time left.
+    
+    Raises DeadlineExceeded when no time is left, so callers fail before
+    starting work that cannot finish.
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded()
+    return left if default is None else min(default, left)
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """Run a block with a deadline seconds from now, never later than an enclosing one"""
+    current = _deadline.get()
+    deadline = current
+    if seconds is not None:
+        deadline = time.monotonic() + seconds
+        if current is not None:
+            deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+async def with_deadline(awaitable: Awaitable[Any], default: Optional[float] = None) -> Any:
+    """Await something within the remaining budget, raising DeadlineExceeded if it runs out"""
+    try:
+        limit = timeout(default)
+    except DeadlineExceeded:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        elif asyncio.isfuture(awaitable):
+            awaitable.cancel()
+        raise
+    
+    if limit is None:
+        return await awaitable
+    
+    try:
+        async with asyncio.timeout(limit):
+            return await awaitable
+    except TimeoutError as e:
+        if expired():
+            raise DeadlineExceeded() from e
+        raise
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware giving each request a deadline from a per-route budget.
+    
+    budgets is a sequence of (path prefix, seconds) checked in order; the
+    first match wins and None means no deadline (e.g. streaming exports).
+    Requests over budget are cancelled, releasing their connections, and
+    answered with 504 if the response has not started. Error responses
+    produced after the deadline passed are also reported as 504.
+    """
+    def __init__(self, app, default_budget: Optional[float] = 15.0,
+                 budgets: Sequence[Tuple[str, Optional[float]]] = ()):
+        self.app = app
+        self.default_budget = default_budget
+        self.budgets = list(budgets)
+        _config.update(default_budget_seconds=default_budget, budgets=dict(self.budgets))
+    
+    def budget_for(self, path: str) -> Optional[float]:
+        """Time budget in seconds for a request path"""
+        for prefix, seconds in self.budgets:
+            if path.startswith(prefix):
+                return seconds
+        return self.default_budget
+    
+    def _upstream_budget(self, scope) -> Optional[float]:
+        for name, value in scope.get("headers", ()):
+            if name == DEADLINE_HEADER:
+                try:
+                    return max(0.0, float(value) / 1000)
+                except ValueError:
+                    return None
+        return None
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        budget = self.budget_for(scope["path"])
+        upstream = self._upstream_budget(scope)
+        if upstream is not None:
+            budget = upstream if budget is None else min(budget, upstream)
+        if budget is None:
+            await self.app(scope, receive, send)
+            return
+        
+        _stats["requests"] += 1
+        response_started = False
+        
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                if message["status"] >= 500 and expired():
+                    # A handler turned a deadline error into a generic failure
+                    message = {**message, "status": 504}
+                    _stats["late_errors"] += 1
+            await send(message)
+        
+        with deadline_scope(budget):
+            try:
+                async with asyncio.timeout(budget):
+                    await self.app(scope, receive, send_wrapper)
+            except (TimeoutError, DeadlineExceeded):
+                if not expired():
+                    raise
+                _stats["timed_out"] += 1
+                logger.warning(f"⚠️ {scope['method']} {scope['path']} exceeded its {budget:.1f}s budget")
+                if response_started:
+                    return
+                body = json.dumps({"detail": "Request deadline exceeded"}).encode()
+                await send({
+                    "type": "http.response.start",
+                    "status": 504,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode())
+                    ]
+                })
+                await send({"type": "http.response.body", "body": body})
+
+def get_deadline_stats() -> Dict[str, Any]:
+    """Deadline configuration and counters"""
+    return {**_config, **_stats}
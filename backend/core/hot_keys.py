@@ -0,0 +1,120 @@
+"""
+Hot-Key Detection
+Handled by: Database Team
+Purpose: Find the few cache keys that take most of the Redis traffic
+
+This module provides:
+- CountMinSketch, approximate per-key counts in fixed memory
+- HotKeyTracker, which samples key reads into a sketch, keeps the current
+  top-K keys and says whether a key is read often enough to be hot
+
+Counts are halved every window, so they follow recent traffic: a key read at
+a steady rate r settles at about 2 * r * window counts, which is how counts
+are turned back into reads per second. Sampled counts are scaled by the
+sample rate. Estimates can only overcount, never undercount, a key.
+"""
+import hashlib
+import random
+import time
+from typing import Any, Dict, List
+
+class CountMinSketch:
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self._rows = [[0] * width for _ in range(depth)]
+    
+    def _indexes(self, key: str) -> List[int]:
+        # Double hashing: depth indexes from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + row * h2) % self.width for row in range(self.depth)]
+    
+    def add(self, key: str, count: int = 1) -> int:
+        """Count key and return its new estimate (conservative update)"""
+        indexes = self._indexes(key)
+        estimate = min(row[index] for row, index in zip(self._rows, indexes)) + count
+        for row, index in zip(self._rows, indexes):
+            if row[index] < estimate:
+                row[index] = estimate
+        return estimate
+    
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+    
+    def decay(self):
+        """Halve every counter"""
+        for row in self._rows:
+            for index, value in enumerate(row):
+                if value:
+                    row[index] = value >> 1
+
+class HotKeyTracker:
+    """
+    Samples key reads and tracks the hottest keys.
+    
+    A key is hot once its estimated read rate reaches min_rps. The top-K
+    list keeps the top_k keys with the highest estimates seen this window.
+    """
+    def __init__(self, min_rps: float = 50.0, sample_rate: float = 0.25, top_k: int = 20,
+                 window: float = 10.0, width: int = 2048, depth: int = 4):
+        self.min_rps = min_rps
+        self.sample_rate = sample_rate
+        self.top_k = top_k
+        self.window = window
+        self._sketch = CountMinSketch(width, depth)
+        self._candidates: Dict[str, int] = {}
+        self._next_decay = time.monotonic() + window
+        self._stats = {
+            "reads": 0,
+            "sampled": 0,
+            "decays": 0
+        }
+    
+    def _rps(self, count: int) -> float:
+        return count / self.sample_rate / (2 * self.window)
+    
+    def record(self, key: str) -> bool:
+        """Count one read of key; returns whether the key is currently hot"""
+        self._stats["reads"] += 1
+        now = time.monotonic()
+        if now >= self._next_decay:
+            self._decay(now)
+        
+        if random.random() >= self.sample_rate:
+            return key in self._candidates and self._rps(self._candidates[key]) >= self.min_rps
+        
+        self._stats["sampled"] += 1
+        count = self._sketch.add(key)
+        if key in self._candidates or len(self._candidates) < self.top_k * 2:
+            self._candidates[key] = count
+        else:
+            coldest = min(self._candidates, key=self._candidates.get)
+            if count > self._candidates[coldest]:
+                del self._candidates[coldest]
+                self._candidates[key] = count
+        return self._rps(count) >= self.min_rps
+    
+    def _decay(self, now: float):
+        self._sketch.decay()
+        self._candidates = {key: count >> 1 for key, count in self._candidates.items() if count > 1}
+        self._next_decay = now + self.window
+        self._stats["decays"] += 1
+    
+    def top(self, limit: int = None) -> List[Dict[str, Any]]:
+        """Hottest keys first, with their estimated reads per second"""
+        ranked = sorted(self._candidates.items(), key=lambda item: item[1], reverse=True)[:limit or self.top_k]
+        return [
+            {"key": key, "estimated_rps": round(self._rps(count), 2), "hot": self._rps(count) >= self.min_rps}
+            for key, count in ranked
+        ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "min_rps": self.min_rps,
+            "sample_rate": self.sample_rate,
+            "window_seconds": self.window,
+            "tracked_candidates": len(self._candidates)
+        }
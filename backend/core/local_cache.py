@@ -0,0 +1,153 @@
+"""
+In-Process Local Cache
+Handled by: Database Team
+Purpose: L1 cache in front of Redis for the hottest query results
+
+This module provides:
+- Bounded LRU eviction by entry count and approximate byte size
+- Per-entry TTL expiry
+- Tag index so table invalidations evict matching entries
+- Hit/miss/eviction counters for monitoring
+
+Values are returned by reference, so callers must treat cached results as
+read-only. Entries are kept consistent across workers by the Redis pub/sub
+invalidation channel wired up in the database manager.
+"""
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Set
+
+from .redis_manager import DateTimeEncoder
+
+@dataclass
+class CacheEntry:
+    """Single cached value with its expiry, size and tags"""
+    value: Any
+    expires_at: float
+    size: int
+    tags: Set[str] = field(default_factory=set)
+
+class LocalCache:
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 32 * 1024 * 1024, default_ttl: int = 30):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0
+        }
+    
+    @staticmethod
+    def estimate_size(value: Any) -> int:
+        """Approximate memory cost of a value by its serialized length"""
+        try:
+            return len(json.dumps(value, cls=DateTimeEncoder))
+        except (TypeError, ValueError):
+            return len(repr(value))
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get value if present and not expired, refreshing its LRU position"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return default
+        
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return default
+        
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry.value
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = (), size: Optional[int] = None) -> bool:
+        """Store a value, evicting least recently used entries to stay in budget"""
+        size = size if size is not None else self.estimate_size(value)
+        if size > self.max_bytes:
+            return False
+        
+        if key in self._entries:
+            self._remove(key)
+        
+        ttl = ttl if ttl is not None else self.default_ttl
+        entry = CacheEntry(value=value, expires_at=time.monotonic() + ttl, size=size, tags=set(tags))
+        self._entries[key] = entry
+        self._bytes += size
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        self._stats["sets"] += 1
+        
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._stats["evictions"] += 1
+        
+        return True
+    
+    def delete(self, key: str) -> bool:
+        """Delete a single entry"""
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        return True
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """Evict every entry recorded under the given tags"""
+        keys = set()
+        for tag in tags:
+            keys.update(self._tags.get(tag, ()))
+        
+        for key in keys:
+            self._remove(key)
+        self._stats["invalidations"] += len(keys)
+        return len(keys)
+    
+    def clear(self) -> int:
+        """Evict all entries"""
+        count = len(self._entries)
+        self._entries.clear()
+        self._tags.clear()
+        self._bytes = 0
+        self._stats["invalidations"] += count
+        return count
+    
+    def _remove(self, key: str):
+        """Remove an entry and its tag index references"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get local cache performance statistics"""
+        total_requests = self._stats["hits"] + self._stats["misses"]
+        hit_rate = (self._stats["hits"] / total_requests * 100) if total_requests > 0 else 0
+        
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "default_ttl": self.default_ttl,
+            "total_requests": total_requests,
+            "hit_rate_percent": round(hit_rate, 2)
+        }
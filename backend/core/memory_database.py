@@ -0,0 +1,478 @@
+"""
+In-Memory Database Backend
+Handled by: Database Team
+Purpose: Run the app, tests and benchmarks without a Postgres server
+
+This module provides:
+- MemoryDatabase, tables held in Python dicts and seeded like init.sql
+  plus a configurable number of generated blogs
+- A handler for every registered query (core/queries.py) and for the
+  handful of literal health-check statements
+- MemoryPool and MemoryConnection, implementing the parts of the asyncpg
+  pool and connection interface the database manager uses
+- Synthetic per-round-trip latency
+
+Selected with DB_BACKEND=memory. Queries are matched by their SQL text, not
+parsed: anything without a handler raises FeatureNotSupportedError, and new
+registered queries need a handler here. Transactions are accepted but give
+no isolation and never roll back.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import string
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import asyncpg
+
+from .queries import registry as query_registry
+
+# Columns returned by the blog queries, in table order
+BLOG_COLUMNS = ("id", "title", "author", "content", "image", "created_at", "tags", "slug", "avatar", "date")
+BLOG_PREVIEW_COLUMNS = ("id", "title", "author", "image", "created_at", "tags", "slug", "avatar", "date")
+USER_COLUMNS = ("id", "email", "name", "role", "skills", "target_roles", "created_at", "updated_at")
+PROGRESS_COLUMNS = ("resume_score", "aptitude_tests_completed", "dsa_questions_solved", "interviews_practiced", "updated_at")
+EVENT_COLUMNS = ("event_type", "user_id", "data", "timestamp", "session_id", "page_url", "user_agent")
+
+# A handler returns rows, or a status string for statements without RETURNING
+Result = Union[List[Dict[str, Any]], str]
+
+def _normalize(sql: str) -> str:
+    return " ".join(sql.split())
+
+def _pick(row: Dict[str, Any], columns: Sequence[str]) -> Dict[str, Any]:
+    return {column: row.get(column) for column in columns}
+
+def _as_id(value: Any) -> Optional[int]:
+    # Endpoints pass ids from the URL as strings; Postgres would cast them
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _as_date(value: Any) -> Any:
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+_handlers: Dict[str, Callable[..., Result]] = {}
+
+def handles(name: str):
+    """Register a method as the in-memory implementation of a named query"""
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+class MemoryDatabase:
+    def __init__(self, seed_blogs: int = 50, content_size: int = 6000):
+        self.blogs: Dict[int, Dict[str, Any]] = {}
+        self.users: Dict[int, Dict[str, Any]] = {}
+        self.user_progress: Dict[int, Dict[str, Any]] = {}
+        self.analytics_events: List[Dict[str, Any]] = []
+        self._next_ids = {"blogs": 1, "users": 1}
+        self._by_sql: Dict[str, Callable[..., Result]] = {}
+        self._literal_sql: Dict[str, Callable[..., Result]] = {
+            "SELECT 1": lambda: [{"?column?": 1}],
+            "SELECT COUNT(*) FROM blogs": lambda: [{"count": len(self.blogs)}],
+        }
+        self._seed(seed_blogs, content_size)
+    
+    def _seed(self, seed_blogs: int, content_size: int):
+        """Sample rows from init.sql, then generated blogs"""
+        for title, content, tags, slug in (
+            ("Welcome to PrepNexus", "Welcome to our AI-powered career preparation platform!", ["welcome", "getting-started"], "welcome-to-prepnexus"),
+            ("Getting Started with DSA", "Learn the fundamentals of Data Structures and Algorithms.", ["dsa", "algorithms", "beginner"], "getting-started-with-dsa"),
+            ("Interview Preparation Guide", "Comprehensive guide to ace your technical interviews.", ["interview", "career", "preparation"], "interview-preparation-guide"),
+        ):
+            self._insert_blog(title, "Admin", content, None, tags, slug, None, None)
+        
+        rng = random.Random(42)
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for number in range(1, seed_blogs + 1):
+            words = ("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(content_size // 6))
+            blog = self._insert_blog(
+                f"How to prepare for interview round {number}",
+                "PrepNexus Team",
+                " ".join(words)[:content_size],
+                f"https://cdn.example.com/blogs/{number}.png",
+                ["interview", "career", "dsa"],
+                f"interview-round-{number}",
+                None,
+                None
+            )
+            blog["created_at"] = start + timedelta(hours=number)
+            blog["date"] = blog["created_at"].date()
+            blog["view_count"] = rng.randint(0, 10000)
+        
+        for email, name, role in (
+            ("admin@prepnexus.com", "Admin User", "admin"),
+            ("john@example.com", "John Doe", "user"),
+            ("jane@example.com", "Jane Smith", "user"),
+        ):
+            self._register_user(email, name, role, [], [])
+    
+    def _next_id(self, table: str) -> int:
+        next_id = self._next_ids[table]
+        self._next_ids[table] = next_id + 1
+        return next_id
+    
+    def _insert_blog(self, title, author, content, image, tags, slug, avatar, blog_date) -> Dict[str, Any]:
+        if slug is not None and any(blog["slug"] == slug for blog in self.blogs.values()):
+            raise asyncpg.UniqueViolationError('duplicate key value violates unique constraint "blogs_slug_key"')
+        
+        now = _now()
+        blog = {
+            "id": self._next_id("blogs"),
+            "title": title,
+            "author": author,
+            "content": content,
+            "image": image,
+            "tags": list(tags or []),
+            "created_at": now,
+            "updated_at": now,
+            "status": "published",
+            "slug": slug,
+            "view_count": 0,
+            "avatar": avatar,
+            "date": _as_date(blog_date) or now.date()
+        }
+        self.blogs[blog["id"]] = blog
+        return blog
+    
+    def _register_user(self, email, name, role, skills, target_roles) -> Optional[int]:
+        if any(user["email"] == email for user in self.users.values()):
+            return None
+        
+        now = _now()
+        user_id = self._next_id("users")
+        self.users[user_id] = {
+            "id": user_id,
+            "email": email,
+            "name": name,
+            "role": role,
+            "skills": list(skills or []),
+            "target_roles": list(target_roles or []),
+            "created_at": now,
+            "updated_at": now
+        }
+        self.user_progress[user_id] = {
+            "user_id": user_id,
+            "resume_score": 0,
+            "aptitude_tests_completed": 0,
+            "dsa_questions_solved": 0,
+            "interviews_practiced": 0,
+            "updated_at": now
+        }
+        return user_id
+    
+    def _blogs_newest_first(self) -> List[Dict[str, Any]]:
+        return sorted(self.blogs.values(), key=lambda blog: blog["created_at"], reverse=True)
+    
+    def _blogs_most_viewed(self) -> List[Dict[str, Any]]:
+        return sorted(self.blogs.values(), key=lambda blog: (blog["view_count"], blog["created_at"]), reverse=True)
+    
+    def _blog_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
+        return next((blog for blog in self.blogs.values() if blog["slug"] == slug), None)
+    
+    def _events_since(self, days: int) -> List[Dict[str, Any]]:
+        since = _now() - timedelta(days=days)
+        return [event for event in self.analytics_events if event["timestamp"] >= since]
+    
+    def run(self, sql: str, args: Sequence[Any]) -> Result:
+        """Execute a statement by looking up its handler"""
+        key = _normalize(sql)
+        handler = self._literal_sql.get(key)
+        if handler is not None:
+            return handler(*args)
+        
+        if not self._by_sql:
+            for query in query_registry.all():
+                if query.name in _handlers:
+                    self._by_sql[_normalize(query.sql)] = _handlers[query.name]
+        handler = self._by_sql.get(key)
+        if handler is None:
+            raise asyncpg.FeatureNotSupportedError(f"Statement not supported by the in-memory backend: {key[:120]}")
+        return handler(self, *args)
+    
+    def copy_records(self, table: str, records: Iterable[Sequence[Any]], columns: Sequence[str]) -> int:
+        """COPY rows into a table; only analytics_events is supported"""
+        if table != "analytics_events":
+            raise asyncpg.FeatureNotSupportedError(f"COPY into {table} not supported by the in-memory backend")
+        count = 0
+        for record in records:
+            self._add_event(dict(zip(columns, record)))
+            count += 1
+        return count
+    
+    def _add_event(self, event: Dict[str, Any]):
+        data = event.get("data")
+        if isinstance(data, str):
+            data = json.loads(data)
+        timestamp = event.get("timestamp") or _now()
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        self.analytics_events.append({**_pick(event, EVENT_COLUMNS), "data": data, "timestamp": timestamp})
+    
+    # Blogs
+    @handles("blogs.list")
+    def _blogs_list(self, limit, offset):
+        return [_pick(blog, BLOG_PREVIEW_COLUMNS) for blog in self._blogs_newest_first()[offset:offset + limit]]
+    
+    @handles("blogs.count")
+    def _blogs_count(self):
+        return [{"total": len(self.blogs)}]
+    
+    @handles("blogs.by_id")
+    def _blogs_by_id(self, blog_id):
+        blog = self.blogs.get(_as_id(blog_id))
+        return [_pick(blog, BLOG_COLUMNS)] if blog else []
+    
+    @handles("blogs.by_slug")
+    def _blogs_by_slug(self, slug):
+        blog = self._blog_by_slug(slug)
+        return [_pick(blog, BLOG_COLUMNS)] if blog else []
+    
+    @handles("blogs.insert_if_new")
+    def _blogs_insert_if_new(self, title, author, content, image, tags, slug, avatar, blog_date):
+        if slug is not None and self._blog_by_slug(slug):
+            return "INSERT 0 0"
+        self._insert_blog(title, author, content, image, tags, slug, avatar, blog_date)
+        return "INSERT 0 1"
+    
+    @handles("blogs.ids_by_slugs")
+    def _blogs_ids_by_slugs(self, slugs):
+        wanted = set(slugs)
+        return [
+            {"id": blog["id"], "slug": blog["slug"], "content_md5": hashlib.md5(blog["content"].encode()).hexdigest()}
+            for blog in self.blogs.values() if blog["slug"] in wanted
+        ]
+    
+    @handles("blogs.insert")
+    def _blogs_insert(self, title, author, content, image, tags, slug, avatar, blog_date):
+        return [{"id": self._insert_blog(title, author, content, image, tags, slug, avatar, blog_date)["id"]}]
+    
+    @handles("blogs.increment_views_by_id")
+    def _blogs_increment_views_by_id(self, blog_id):
+        blog = self.blogs.get(_as_id(blog_id))
+        if blog:
+            blog["view_count"] += 1
+        return f"UPDATE {1 if blog else 0}"
+    
+    @handles("blogs.increment_views_by_slug")
+    def _blogs_increment_views_by_slug(self, slug):
+        blog = self._blog_by_slug(slug)
+        if blog:
+            blog["view_count"] += 1
+        return f"UPDATE {1 if blog else 0}"
+    
+    @handles("blogs.top_viewed_ids")
+    def _blogs_top_viewed_ids(self, limit):
+        return [{"id": blog["id"]} for blog in self._blogs_most_viewed()[:limit]]
+    
+    @handles("blogs.top_viewed_slugs")
+    def _blogs_top_viewed_slugs(self, limit):
+        return [{"slug": blog["slug"]} for blog in self._blogs_most_viewed() if blog["slug"] is not None][:limit]
+    
+    @handles("blogs.all_slugs")
+    def _blogs_all_slugs(self):
+        return [{"slug": blog["slug"]} for blog in self.blogs.values() if blog["slug"] is not None]
+    
+    @handles("blogs.recent_for_feed")
+    def _blogs_recent_for_feed(self, limit):
+        return [_pick(blog, ("id", "title", "content", "created_at")) for blog in self._blogs_newest_first()[:limit]]
+    
+    @handles("blogs.for_sitemap")
+    def _blogs_for_sitemap(self):
+        return [_pick(blog, ("id", "created_at")) for blog in self._blogs_newest_first()]
+    
+    @handles("blogs.export")
+    def _blogs_export(self):
+        return [_pick(blog, BLOG_COLUMNS) for blog in sorted(self.blogs.values(), key=lambda blog: blog["id"])]
+    
+    # Users
+    @handles("users.register")
+    def _users_register(self, email, name, role, skills, target_roles):
+        user_id = self._register_user(email, name, role, skills, target_roles)
+        return [] if user_id is None else [{"id": user_id}]
+    
+    @handles("users.profile")
+    def _users_profile(self, user_id):
+        user = self.users.get(_as_id(user_id))
+        return [_pick(user, USER_COLUMNS)] if user else []
+    
+    @handles("user_progress.by_user")
+    def _user_progress_by_user(self, user_id):
+        progress = self.user_progress.get(_as_id(user_id))
+        return [_pick(progress, PROGRESS_COLUMNS)] if progress else []
+    
+    @handles("user_progress.update_resume_score")
+    def _user_progress_update_resume_score(self, score, user_id):
+        user_id = _as_id(user_id)
+        progress = self.user_progress.get(user_id)
+        if progress:
+            progress.update(resume_score=score, updated_at=_now())
+        return [{"user_exists": user_id in self.users, "updated": 1 if progress else 0}]
+    
+    # Analytics
+    @handles("analytics.insert_event")
+    def _analytics_insert_event(self, *values):
+        self._add_event(dict(zip(EVENT_COLUMNS, values)))
+        return "INSERT 0 1"
+    
+    @handles("analytics.user_metrics")
+    def _analytics_user_metrics(self, user_id):
+        events = [event for event in self.analytics_events if event["user_id"] == user_id]
+        timestamps = [event["timestamp"] for event in events]
+        return [{
+            "total_events": len(events),
+            "total_sessions": len({event["session_id"] for event in events if event["session_id"] is not None}),
+            "first_visit": min(timestamps, default=None),
+            "last_visit": max(timestamps, default=None)
+        }]
+    
+    @handles("analytics.page_metrics")
+    def _analytics_page_metrics(self, page_url, days):
+        events = [event for event in self._events_since(days) if event["page_url"] == page_url]
+        return [{
+            "page_views": len(events),
+            "unique_users": len({event["user_id"] for event in events if event["user_id"] is not None}),
+            "unique_sessions": len({event["session_id"] for event in events if event["session_id"] is not None})
+        }]
+    
+    @handles("analytics.export")
+    def _analytics_export(self, days):
+        return [dict(event) for event in sorted(self._events_since(days), key=lambda event: event["timestamp"])]
+
+class MemoryTransaction:
+    """Accepted for compatibility; statements apply immediately and are never rolled back"""
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+class MemoryCursor:
+    def __init__(self, connection: "MemoryConnection", rows: List[Dict[str, Any]]):
+        self._connection = connection
+        self._rows = rows
+        self._position = 0
+    
+    async def fetch(self, n: int, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        await self._connection._round_trip()
+        rows = self._rows[self._position:self._position + n]
+        self._position += len(rows)
+        return rows
+
+class MemoryConnection:
+    def __init__(self, database: MemoryDatabase, latency: float = 0.0):
+        self._database = database
+        self._latency = latency
+        self._closed = False
+    
+    async def _round_trip(self):
+        if self._latency:
+            await asyncio.sleep(self._latency)
+    
+    async def _query(self, sql: str, args: Sequence[Any]) -> Result:
+        await self._round_trip()
+        return self._database.run(sql, args)
+    
+    async def fetch(self, query: str, *args, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        result = await self._query(query, args)
+        return [] if isinstance(result, str) else result
+    
+    async def fetchrow(self, query: str, *args, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        rows = await self.fetch(query, *args)
+        return rows[0] if rows else None
+    
+    async def fetchval(self, query: str, *args, column: int = 0, timeout: Optional[float] = None) -> Any:
+        row = await self.fetchrow(query, *args)
+        return list(row.values())[column] if row else None
+    
+    async def execute(self, query: str, *args, timeout: Optional[float] = None) -> str:
+        result = await self._query(query, args)
+        return result if isinstance(result, str) else f"SELECT {len(result)}"
+    
+    async def executemany(self, command: str, args: Iterable[Sequence[Any]], timeout: Optional[float] = None):
+        await self._round_trip()
+        for arguments in args:
+            self._database.run(command, arguments)
+    
+    async def cursor(self, query: str, *args, prefetch: Optional[int] = None, timeout: Optional[float] = None) -> MemoryCursor:
+        return MemoryCursor(self, await self.fetch(query, *args))
+    
+    async def copy_records_to_table(self, table_name: str, *, records, columns=None, schema_name=None, timeout=None) -> str:
+        await self._round_trip()
+        return f"COPY {self._database.copy_records(table_name, records, columns)}"
+    
+    def transaction(self, isolation: Optional[str] = None, readonly: bool = False, deferrable: bool = False) -> MemoryTransaction:
+        return MemoryTransaction()
+    
+    def is_closed(self) -> bool:
+        return self._closed
+    
+    async def close(self, timeout: Optional[float] = None):
+        self._closed = True
+
+class _Acquire:
+    """Result of MemoryPool.acquire(): awaitable or an async context manager, like asyncpg's"""
+    def __init__(self, pool: "MemoryPool", timeout: Optional[float]):
+        self._pool = pool
+        self._timeout = timeout
+        self._connection: Optional[MemoryConnection] = None
+    
+    def __await__(self):
+        return self._pool._acquire(self._timeout).__await__()
+    
+    async def __aenter__(self) -> MemoryConnection:
+        self._connection = await self._pool._acquire(self._timeout)
+        return self._connection
+    
+    async def __aexit__(self, *exc_info):
+        await self._pool.release(self._connection)
+
+class MemoryPool:
+    """Connection pool over a MemoryDatabase, limited to max_size concurrent connections"""
+    def __init__(self, database: MemoryDatabase, min_size: int = 1, max_size: int = 10, latency: float = 0.0):
+        self._database = database
+        self._min_size = min_size
+        self._max_size = max_size
+        self._latency = latency
+        self._slots = asyncio.Semaphore(max_size)
+        self._in_use = 0
+    
+    def acquire(self, *, timeout: Optional[float] = None) -> _Acquire:
+        return _Acquire(self, timeout)
+    
+    async def _acquire(self, timeout: Optional[float]) -> MemoryConnection:
+        if timeout is None:
+            await self._slots.acquire()
+        else:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        self._in_use += 1
+        return MemoryConnection(self._database, self._latency)
+    
+    async def release(self, connection: MemoryConnection, *, timeout: Optional[float] = None):
+        self._in_use -= 1
+        self._slots.release()
+    
+    def get_size(self) -> int:
+        return max(self._min_size, self._in_use)
+    
+    def get_idle_size(self) -> int:
+        return max(0, self.get_size() - self._in_use)
+    
+    def get_min_size(self) -> int:
+        return self._min_size
+    
+    def get_max_size(self) -> int:
+        return self._max_size
+    
+    async def close(self):
+        pass
@@ -0,0 +1,411 @@
+"""
+In-Memory Redis Backend
+Handled by: Database Team
+Purpose: Run the app, tests and benchmarks without a Redis server
+
+This module provides:
+- MemoryRedis, implementing the redis.asyncio.Redis commands used by the
+  Redis manager on dicts and sets held in this process
+- Pipelines that apply all queued commands in one round trip
+- In-process pub/sub and key expiry
+- Python stand-ins for the manager's Lua scripts
+- Synthetic per-round-trip latency
+
+Selected with REDIS_BACKEND=memory. Like a real client with
+decode_responses=False, keys and values come back as bytes. Data is private
+to one process, so multi-worker behaviour (pub/sub fan-out, leases) is only
+exercised within a single worker. Commands or scripts the manager starts
+using must be added here.
+"""
+import asyncio
+import fnmatch
+import hashlib
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from redis.exceptions import ResponseError
+
+from .redis_manager import RELEASE_LEASE_SCRIPT, FIXED_WINDOW_SCRIPT, SLIDING_WINDOW_SCRIPT, TOKEN_BUCKET_SCRIPT
+from .rate_limit import sliding_window_step, token_bucket_step
+
+def _encode(value: Any) -> bytes:
+    """Encode a key or value the way redis-py does"""
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    if isinstance(value, (int, float)):
+        return repr(value).encode()
+    raise TypeError(f"Invalid input of type {type(value).__name__}")
+
+def _release_lease(client: "MemoryRedis", keys: Sequence[bytes], args: Sequence[bytes]) -> int:
+    if client._get(keys[0]) == args[0]:
+        return client._delete(keys[0])
+    return 0
+
+def _fixed_window(client: "MemoryRedis", keys: Sequence[bytes], args: Sequence[bytes]) -> int:
+    count = client._incr(keys[0])
+    if client._ttl(keys[0]) < 0:
+        client._expire(keys[0], int(args[0]) / 1000)
+    return count
+
+def _sliding_window(client: "MemoryRedis", keys: Sequence[bytes], args: Sequence[bytes]) -> List[int]:
+    # Rate-limit state is kept as a dict, standing in for the script's hash
+    limit, window_ms, cost = (float(arg) for arg in args)
+    state, (allowed, remaining, retry_ms) = sliding_window_step(
+        client._lookup(keys[0], dict), time.time() * 1000, limit, window_ms, cost
+    )
+    if allowed:
+        client._store(keys[0], state, window_ms * 2 / 1000)
+    return [int(allowed), remaining, retry_ms]
+
+def _token_bucket(client: "MemoryRedis", keys: Sequence[bytes], args: Sequence[bytes]) -> List[int]:
+    capacity, rate, cost, idle_ms = (float(arg) for arg in args)
+    state, (allowed, remaining, retry_ms) = token_bucket_step(
+        client._lookup(keys[0], dict), time.time() * 1000, capacity, rate, cost
+    )
+    client._store(keys[0], state, idle_ms / 1000)
+    return [int(allowed), remaining, retry_ms]
+
+# Python equivalents of the Lua scripts registered by the Redis manager
+LUA_SCRIPTS: Dict[str, Callable[["MemoryRedis", Sequence[bytes], Sequence[bytes]], Any]] = {
+    RELEASE_LEASE_SCRIPT: _release_lease,
+    FIXED_WINDOW_SCRIPT: _fixed_window,
+    SLIDING_WINDOW_SCRIPT: _sliding_window,
+    TOKEN_BUCKET_SCRIPT: _token_bucket,
+}
+
+class MemoryScript:
+    """Result of register_script(): called with keys and args like redis-py's Script"""
+    def __init__(self, client: "MemoryRedis", script: str):
+        if script not in LUA_SCRIPTS:
+            raise ResponseError("Script not supported by the in-memory Redis backend")
+        self._client = client
+        self._func = LUA_SCRIPTS[script]
+        self.sha = hashlib.sha1(script.encode("utf-8")).hexdigest()
+    
+    async def __call__(self, keys: Sequence[Any] = (), args: Sequence[Any] = (), client=None) -> Any:
+        await self._client._round_trip()
+        return self._func(self._client, [_encode(key) for key in keys], [_encode(arg) for arg in args])
+
+class MemoryPipeline:
+    """Queues commands and runs them in a single round trip on execute()"""
+    def __init__(self, client: "MemoryRedis"):
+        self._client = client
+        self._commands: List[Tuple[str, tuple, dict]] = []
+    
+    def __getattr__(self, name: str):
+        if not hasattr(self._client, f"_{name}"):
+            raise AttributeError(f"Pipeline command {name} not supported by the in-memory Redis backend")
+        
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue
+    
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        commands, self._commands = self._commands, []
+        await self._client._round_trip()
+        results = []
+        for name, args, kwargs in commands:
+            try:
+                results.append(getattr(self._client, f"_{name}")(*args, **kwargs))
+            except Exception as e:
+                if raise_on_error:
+                    raise
+                results.append(e)
+        return results
+    
+    async def reset(self):
+        self._commands = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.reset()
+
+class MemoryPubSub:
+    def __init__(self, client: "MemoryRedis", ignore_subscribe_messages: bool = False):
+        self._client = client
+        self._ignore_subscribe_messages = ignore_subscribe_messages
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._channels: Set[bytes] = set()
+    
+    async def subscribe(self, *channels: Any):
+        await self._client._round_trip()
+        for channel in map(_encode, channels):
+            self._channels.add(channel)
+            self._client._subscribers.setdefault(channel, set()).add(self._queue)
+            if not self._ignore_subscribe_messages:
+                self._queue.put_nowait({"type": "subscribe", "channel": channel, "data": len(self._channels), "pattern": None})
+    
+    async def listen(self):
+        while self._channels:
+            yield await self._queue.get()
+    
+    async def reset(self):
+        for channel in self._channels:
+            self._client._subscribers.get(channel, set()).discard(self._queue)
+        self._channels.clear()
+
+class MemoryRedis:
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self._data: Dict[bytes, Any] = {}
+        self._expires: Dict[bytes, float] = {}
+        self._subscribers: Dict[bytes, Set[asyncio.Queue]] = {}
+        self._scans: Dict[int, List[bytes]] = {}
+        self._next_scan = 1
+        self._counters = {
+            "total_commands_processed": 0,
+            "keyspace_hits": 0,
+            "keyspace_misses": 0,
+            "expired_keys": 0,
+            "evicted_keys": 0
+        }
+    
+    async def _round_trip(self):
+        self._counters["total_commands_processed"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+    
+    async def _call(self, name: str, *args, **kwargs) -> Any:
+        await self._round_trip()
+        return getattr(self, f"_{name}")(*args, **kwargs)
+    
+    # Keyspace helpers
+    def _alive(self, key: bytes) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            del self._expires[key]
+            self._counters["expired_keys"] += 1
+        return key in self._data
+    
+    def _lookup(self, key: Any, kind: type) -> Any:
+        key = _encode(key)
+        if not self._alive(key):
+            return None
+        value = self._data[key]
+        if not isinstance(value, kind):
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+    
+    def _store(self, key: bytes, value: Any, ttl: Optional[float] = None):
+        self._data[key] = value
+        if ttl is None:
+            self._expires.pop(key, None)
+        else:
+            self._expires[key] = time.monotonic() + ttl
+    
+    # Command implementations, also used by pipelines
+    def _ping(self) -> bool:
+        return True
+    
+    def _get(self, key: Any) -> Optional[bytes]:
+        value = self._lookup(key, bytes)
+        self._counters["keyspace_hits" if value is not None else "keyspace_misses"] += 1
+        return value
+    
+    def _mget(self, *keys: Any) -> List[Optional[bytes]]:
+        if len(keys) == 1 and isinstance(keys[0], (list, tuple)):
+            keys = keys[0]
+        # Unlike GET, MGET answers nil for keys holding another type
+        return [self._get(key) if isinstance(self._lookup(key, object), (bytes, type(None))) else None for key in keys]
+    
+    def _set(self, key: Any, value: Any, ex: Optional[float] = None, px: Optional[float] = None,
+             nx: bool = False, xx: bool = False) -> Optional[bool]:
+        key = _encode(key)
+        exists = self._alive(key)
+        if (nx and exists) or (xx and not exists):
+            return None
+        ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+        self._store(key, _encode(value), ttl)
+        return True
+    
+    def _setex(self, key: Any, ttl: int, value: Any) -> bool:
+        return self._set(key, value, ex=ttl)
+    
+    def _incr(self, key: Any, amount: int = 1) -> int:
+        key = _encode(key)
+        value = int(self._lookup(key, bytes) or 0) + amount
+        self._data[key] = _encode(value)
+        return value
+    
+    def _delete(self, *keys: Any) -> int:
+        deleted = 0
+        for key in map(_encode, keys):
+            if self._alive(key):
+                del self._data[key]
+                self._expires.pop(key, None)
+                deleted += 1
+        return deleted
+    
+    _unlink = _delete
+    
+    def _exists(self, *keys: Any) -> int:
+        return sum(1 for key in map(_encode, keys) if self._alive(key))
+    
+    def _expire(self, key: Any, ttl: int) -> bool:
+        key = _encode(key)
+        if not self._alive(key):
+            return False
+        self._expires[key] = time.monotonic() + ttl
+        return True
+    
+    def _ttl(self, key: Any) -> int:
+        key = _encode(key)
+        if not self._alive(key):
+            return -2
+        expires_at = self._expires.get(key)
+        return -1 if expires_at is None else max(0, round(expires_at - time.monotonic()))
+    
+    def _keys(self, pattern: Any = "*") -> List[bytes]:
+        pattern = _encode(pattern)
+        return [key for key in list(self._data) if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]
+    
+    def _scan(self, cursor: int = 0, match: Any = None, count: Optional[int] = None) -> Tuple[int, List[bytes]]:
+        # The cursor indexes a snapshot of the keyspace taken by the first
+        # call, so keys deleted mid-scan don't make it skip others
+        scan_id, position = divmod(cursor, 1 << 32)
+        if cursor == 0:
+            scan_id, self._next_scan = self._next_scan, self._next_scan + 1
+            self._scans[scan_id] = list(self._data)
+            if len(self._scans) > 64:
+                # Drop the oldest snapshot of a scan that was never finished
+                self._scans.pop(next(iter(self._scans)))
+        keys = self._scans.get(scan_id, [])
+        end = position + (count or 10)
+        pattern = _encode(match or "*")
+        batch = [key for key in keys[position:end] if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]
+        if end >= len(keys):
+            self._scans.pop(scan_id, None)
+            return 0, batch
+        return (scan_id << 32) + end, batch
+    
+    def _sadd(self, key: Any, *members: Any) -> int:
+        key = _encode(key)
+        members = {_encode(member) for member in members}
+        current = self._lookup(key, set)
+        if current is None:
+            current = set()
+            self._store(key, current)
+        added = len(members - current)
+        current.update(members)
+        return added
+    
+    def _smembers(self, key: Any) -> Set[bytes]:
+        return set(self._lookup(key, set) or ())
+    
+    def _flushdb(self) -> bool:
+        self._data.clear()
+        self._expires.clear()
+        return True
+    
+    def _memory_usage(self, key: Any) -> Optional[int]:
+        key = _encode(key)
+        if not self._alive(key):
+            return None
+        value = self._data[key]
+        size = sum(map(len, value)) if isinstance(value, set) else len(value)
+        return size + len(key) + 56  # Rough per-key overhead of a small Redis object
+    
+    def _publish(self, channel: Any, message: Any) -> int:
+        channel = _encode(channel)
+        queues = self._subscribers.get(channel, set())
+        for queue in queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": _encode(message), "pattern": None})
+        return len(queues)
+    
+    def _info_sections(self, section: Optional[str] = None) -> Dict[str, Any]:
+        used_memory = sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in self._data.items())
+        return {
+            "redis_version": "memory",
+            "connected_clients": 1,
+            "used_memory": used_memory,
+            "used_memory_human": f"{used_memory / 1024 / 1024:.2f}M",
+            **self._counters
+        }
+    
+    # redis.asyncio.Redis interface
+    async def ping(self) -> bool:
+        return await self._call("ping")
+    
+    async def get(self, key) -> Optional[bytes]:
+        return await self._call("get", key)
+    
+    async def mget(self, keys, *args) -> List[Optional[bytes]]:
+        return await self._call("mget", keys, *args)
+    
+    async def set(self, key, value, ex=None, px=None, nx=False, xx=False) -> Optional[bool]:
+        return await self._call("set", key, value, ex=ex, px=px, nx=nx, xx=xx)
+    
+    async def setex(self, key, ttl, value) -> bool:
+        return await self._call("setex", key, ttl, value)
+    
+    async def incr(self, key, amount: int = 1) -> int:
+        return await self._call("incr", key, amount)
+    
+    async def delete(self, *keys) -> int:
+        return await self._call("delete", *keys)
+    
+    async def unlink(self, *keys) -> int:
+        return await self._call("unlink", *keys)
+    
+    async def exists(self, *keys) -> int:
+        return await self._call("exists", *keys)
+    
+    async def expire(self, key, ttl) -> bool:
+        return await self._call("expire", key, ttl)
+    
+    async def ttl(self, key) -> int:
+        return await self._call("ttl", key)
+    
+    async def keys(self, pattern="*") -> List[bytes]:
+        return await self._call("keys", pattern)
+    
+    async def scan(self, cursor: int = 0, match=None, count: Optional[int] = None) -> Tuple[int, List[bytes]]:
+        return await self._call("scan", cursor, match, count)
+    
+    async def scan_iter(self, match=None, count: Optional[int] = None):
+        cursor = 0
+        while True:
+            cursor, keys = await self.scan(cursor, match=match, count=count)
+            for key in keys:
+                yield key
+            if cursor == 0:
+                break
+    
+    async def sadd(self, key, *members) -> int:
+        return await self._call("sadd", key, *members)
+    
+    async def smembers(self, key) -> Set[bytes]:
+        return await self._call("smembers", key)
+    
+    async def flushdb(self) -> bool:
+        return await self._call("flushdb")
+    
+    async def memory_usage(self, key) -> Optional[int]:
+        return await self._call("memory_usage", key)
+    
+    async def publish(self, channel, message) -> int:
+        return await self._call("publish", channel, message)
+    
+    async def info(self, section: Optional[str] = None) -> Dict[str, Any]:
+        return await self._call("info_sections", section)
+    
+    def pipeline(self, transaction: bool = True) -> MemoryPipeline:
+        return MemoryPipeline(self)
+    
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> MemoryPubSub:
+        return MemoryPubSub(self, ignore_subscribe_messages)
+    
+    def register_script(self, script: str) -> MemoryScript:
+        return MemoryScript(self, script)
+    
+    async def close(self):
+        pass
+    
+    aclose = close
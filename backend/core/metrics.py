@@ -0,0 +1,71 @@
+"""
+Metrics Primitives
+Handled by: DevOps Team
+Purpose: Lightweight in-process metrics shared by the database and cache layers
+
+This module provides:
+- Latency histograms with fixed buckets for scraping
+- Percentile estimates (p50/p95/p99) from a bounded sample window
+"""
+import math
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+# Bucket upper bounds in milliseconds, roughly logarithmic
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+class LatencyHistogram:
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS_MS, window: int = 1024):
+        self.buckets: List[float] = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def observe(self, value_ms: float):
+        """Record one latency sample"""
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+        self._samples.append(value_ms)
+        
+        for index, bound in enumerate(self.buckets):
+            if value_ms <= bound:
+                self._counts[index] += 1
+                return
+        self._counts[-1] += 1
+    
+    def percentile(self, percent: float) -> Optional[float]:
+        """Nearest-rank percentile over the recent sample window"""
+        if not self._samples:
+            return None
+        
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return ordered[rank - 1]
+    
+    def merge_counts(self) -> Dict[str, int]:
+        """Cumulative bucket counts keyed by upper bound, Prometheus style"""
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets, self._counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = running + self._counts[-1]
+        return cumulative
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary statistics for reporting"""
+        def rounded(value):
+            return round(value, 2) if value is not None else None
+        
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0,
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": rounded(self.percentile(50)),
+            "p95_ms": rounded(self.percentile(95)),
+            "p99_ms": rounded(self.percentile(99)),
+            "buckets": self.merge_counts()
+        }
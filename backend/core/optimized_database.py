@@ -16,11 +16,26 @@ import os
 import logging
 import time
 import json
-from typing import Optional, Dict, Any, List
+import re
+import hashlib
+import contextvars
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Set, Tuple, Callable, Awaitable, Union, Iterable, Sequence, AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from .redis_manager import redis_manager
+from .local_cache import LocalCache
+from .queries import NamedQuery, registry as query_registry
+from .query_metrics import QueryMetrics
+from .pool_controller import PoolController
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .pg_listener import PgNotifyListener
+from . import deadline
+from . import round_trips
+from .deadline import DeadlineExceeded
+from .serialization import register_json_codecs
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -30,6 +45,196 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Monotonic time of the last write made in the current request context
+_last_write_at: ContextVar[float] = ContextVar("db_last_write_at", default=0.0)
+
+# Time spent waiting for the connection currently held in this context
+_acquire_wait_ms: ContextVar[float] = ContextVar("db_acquire_wait_ms", default=0.0)
+
+# Tables a statement reads from, used to tag cached results for invalidation
+_TABLE_PATTERN = re.compile(r'\b(?:FROM|JOIN)\s+([A-Za-z_][\w.]*)', re.IGNORECASE)
+
+# Tables a statement writes to, used to invalidate after bulk writes
+_WRITE_TABLE_PATTERN = re.compile(r'\b(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+([A-Za-z_][\w.]*)', re.IGNORECASE)
+
+def _shared_load_context() -> contextvars.Context:
+    """
+    Context for cache loads and refreshes that outlive the request starting them.
+    
+    They must not inherit that request's deadline or round-trip counter, only
+    its read-your-writes marker so a recent writer's load still reads the primary.
+    """
+    context = contextvars.Context()
+    context.run(_last_write_at.set, _last_write_at.get())
+    return context
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so formatting differences share one cache entry"""
+    return " ".join(query.split())
+
+# Session settings for every connection. Direct connections send them at
+# startup; behind a transaction-mode pooler they would stick to whichever
+# server connection the pooler picked (and PgBouncer rejects them as startup
+# parameters), so there they are set per transaction instead
+_SESSION_SETTINGS = {
+    'jit': 'off',  # Disable JIT for faster queries
+    'work_mem': '4MB',  # Optimize memory usage
+}
+_TRANSACTION_SETTINGS_SQL = "SELECT " + ", ".join(
+    f"set_config('{name}', '{value}', true)" for name, value in _SESSION_SETTINGS.items()
+)
+
+def quote_identifier(name: str) -> str:
+    """Quote a (possibly schema-qualified) identifier for safe use in SQL"""
+    return '.'.join('"' + part.replace('"', '""') + '"' for part in name.split('.'))
+
+# Errors meaning the database is unreachable or overloaded, as opposed to
+# errors it answered with (constraint violations, bad SQL, ...)
+_UNAVAILABLE_ERRORS = (
+    OSError,  # Includes connection resets and asyncio timeouts
+    asyncio.TimeoutError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.OperatorInterventionError,  # Query canceled, admin shutdown, cannot connect now
+    asyncpg.TooManyConnectionsError
+)
+
+def is_unavailable_error(error: BaseException) -> bool:
+    """Whether an error means the database could not serve the request"""
+    return isinstance(error, (CircuitOpenError, *_UNAVAILABLE_ERRORS))
+
+# Errors meaning the statement never ran, so it can be retried even if it writes
+_NOT_EXECUTED_ERRORS = (
+    asyncpg.TooManyConnectionsError,  # Pooler or server at its client limit
+    asyncpg.CannotConnectNowError,  # Compute still starting (e.g. Neon waking from suspend)
+    asyncpg.InvalidSQLStatementNameError,  # Prepared statement lives on another server connection
+    asyncpg.DuplicatePreparedStatementError
+)
+
+# PgBouncer messages sent in place of running a query
+_POOLER_REJECTIONS = ("query_wait_timeout", "no more connections allowed", "pgbouncer cannot connect to server")
+
+def is_transient_error(error: BaseException, started: bool, read_only: bool) -> bool:
+    """
+    Whether a failed statement can be retried on another connection.
+    
+    Failures before the statement reached the database (connecting, or the
+    pooler turning it away) are safe to retry; a connection lost while the
+    statement ran is only retried for reads, since a write may have
+    committed. Timeouts and cancellations are never retried.
+    """
+    if isinstance(error, (asyncio.TimeoutError, asyncpg.QueryCanceledError)):
+        return False
+    if isinstance(error, _NOT_EXECUTED_ERRORS):
+        return True
+    if isinstance(error, asyncpg.ProtocolViolationError) and any(message in str(error) for message in _POOLER_REJECTIONS):
+        return True
+    if not started:
+        return isinstance(error, (OSError, asyncpg.PostgresConnectionError))
+    return read_only and isinstance(error, (ConnectionResetError, asyncpg.PostgresConnectionError, asyncpg.AdminShutdownError))
+
+def is_replica_failure(error: BaseException, started: bool) -> bool:
+    """
+    Whether a read failed because the replica could not serve it.
+    
+    Timeouts and cancellations only count while connecting: a slow query
+    says nothing about the replica and would be as slow on the primary.
+    """
+    if isinstance(error, (asyncio.TimeoutError, asyncpg.QueryCanceledError)):
+        return not started
+    return is_unavailable_error(error) or is_transient_error(error, started, True)
+
+def count_rows(method: str, result: Any) -> int:
+    """Rows returned or affected by a query result"""
+    if method in ("fetch", "cursor"):
+        return len(result)
+    if method in ("fetchrow", "fetchval"):
+        return 0 if result is None else 1
+    if method == "execute" and isinstance(result, str):
+        # Status strings look like "UPDATE 3" or "INSERT 0 1"
+        last = result.rsplit(" ", 1)[-1]
+        return int(last) if last.isdigit() else 0
+    return 0
+
+def is_read_query(query: str) -> bool:
+    """Whether a statement only reads and can be served by a replica"""
+    normalized = query.lstrip().upper()
+    return normalized.startswith('SELECT') and 'FOR UPDATE' not in normalized and 'FOR SHARE' not in normalized
+
+@lru_cache(maxsize=1024)
+def extract_tables(query: str) -> Tuple[str, ...]:
+    """Return the sorted, de-duplicated tables referenced by a query"""
+    return tuple(sorted({name.split('.')[-1].lower() for name in _TABLE_PATTERN.findall(query)}))
+
+@lru_cache(maxsize=1024)
+def extract_written_tables(query: str) -> Tuple[str, ...]:
+    """Return the sorted, de-duplicated tables a statement writes to"""
+    return tuple(sorted({name.split('.')[-1].lower() for name in _WRITE_TABLE_PATTERN.findall(query)}))
+
+class PreparedConnection(asyncpg.Connection):
+    """Connection carrying the registry's statements, prepared once when it opens"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements: Dict[str, Any] = {}
+
+class Transaction:
+    """
+    Unit of work bound to one connection and one database transaction.
+    
+    Statements run on the same connection, so there is a single pool
+    checkout for the whole flow. Tables written by the statements (or
+    passed to invalidate()) are invalidated once, after commit.
+    """
+    def __init__(self, manager: "OptimizedDatabaseManager", conn):
+        self._db = manager
+        self._conn = conn
+        self._tables = set()
+    
+    @property
+    def connection(self):
+        """The underlying connection, for calls not wrapped here"""
+        return self._conn
+    
+    @property
+    def tables(self) -> Tuple[str, ...]:
+        """Tables to invalidate on commit"""
+        return tuple(sorted(self._tables))
+    
+    def invalidate(self, *tables: str):
+        """Invalidate extra tables on commit"""
+        self._tables.update(tables)
+    
+    def _track(self, query: Union[str, NamedQuery]):
+        sql = query.sql if isinstance(query, NamedQuery) else query
+        self._tables.update(extract_written_tables(sql))
+        self._db._record_call(query)
+    
+    async def execute(self, query: Union[str, NamedQuery], *args):
+        """Execute a statement"""
+        self._track(query)
+        return await self._db._run(self._conn, "execute", query, args)
+    
+    async def executemany(self, query: Union[str, NamedQuery], args: Iterable[Sequence[Any]]):
+        """Execute a statement for every argument tuple, pipelined in one round trip"""
+        self._track(query)
+        await self._db._run(self._conn, "executemany", query, (list(args),))
+    
+    async def fetch(self, query: Union[str, NamedQuery], *args) -> List[Dict[str, Any]]:
+        """Fetch rows (uncached, sees this transaction's writes)"""
+        self._track(query)
+        rows = await self._db._run(self._conn, "fetch", query, args)
+        return [dict(row) for row in rows]
+    
+    async def fetchrow(self, query: Union[str, NamedQuery], *args) -> Optional[Dict[str, Any]]:
+        """Fetch a single row (uncached, sees this transaction's writes)"""
+        self._track(query)
+        row = await self._db._run(self._conn, "fetchrow", query, args)
+        return dict(row) if row else None
+    
+    async def fetchval(self, query: Union[str, NamedQuery], *args):
+        """Fetch a single value (uncached, sees this transaction's writes)"""
+        self._track(query)
+        return await self._db._run(self._conn, "fetchval", query, args)
+
 @dataclass
 class DatabaseConfig:
     """Database configuration optimized for performance"""
@@ -42,17 +247,108 @@ class DatabaseConfig:
     max_connections: int = 50  # Increased for high concurrency
     connection_timeout: int = 10  # Reduced timeout
     command_timeout: int = 30  # Reduced timeout
+    read_database_url: Optional[str] = None  # Replica / read endpoint DSN
+    read_min_connections: int = 5
+    read_max_connections: int = 25
+    split_pools: bool = False  # Separate read pool even without a replica DSN
+    replica_lag_window: float = 5.0  # Seconds after a write that reads stay on the primary
+    pooler_mode: bool = False  # Connected through a transaction-mode pooler (PgBouncer, Neon -pooler)
 
 class OptimizedDatabaseManager:
     def __init__(self):
         self._pool: Optional[asyncpg.Pool] = None
+        self._read_pool: Optional[asyncpg.Pool] = None
+        self._pool_controller: Optional[PoolController] = None
+        self._read_pool_controller: Optional[PoolController] = None
+        self._read_pool_healthy = True
+        self._table_write_times: Dict[str, float] = {}
+        self._routing_stats = {
+            "primary_reads": 0,
+            "replica_reads": 0,
+            "replica_fallbacks": 0,
+            "writes": 0
+        }
         self._redis: Optional[redis.Redis] = None
         self._config = self._load_config()
         self._health_check_task: Optional[asyncio.Task] = None
         self._last_health_check = 0
         self._health_check_interval = 60  # Check every 60 seconds
         self._is_healthy = True
+        self._last_health_check_ms = 0.0
         self._cache_ttl = 300  # 5 minutes cache
+        self._stale_if_error_ttl = int(os.getenv('DB_STALE_IF_ERROR_TTL', '300'))  # Extra seconds cached results are kept as an outage fallback
+        self._negative_cache_ttl = int(os.getenv('DB_NEGATIVE_CACHE_TTL', '60'))  # Default lifetime of cached "no row" results
+        breaker_settings = dict(
+            failure_threshold=int(os.getenv('DB_BREAKER_FAILURES', '5')),
+            reset_timeout=float(os.getenv('DB_BREAKER_RESET_TIMEOUT', '30')),
+            half_open_max_calls=int(os.getenv('DB_BREAKER_HALF_OPEN_CALLS', '1'))
+        )
+        self._breaker = CircuitBreaker("database", **breaker_settings)
+        # The replica gets its own breaker so a replica outage never blocks the primary
+        self._read_breaker = CircuitBreaker("database-read", **breaker_settings)
+        self._stale_if_error_served = 0
+        self._invalidation_channel = "db:invalidate"
+        self._instance_id = f"{os.getpid()}:{id(self)}"
+        self._prepare_failures = set()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._lease_ms = int(os.getenv('DB_CACHE_LEASE_MS', '2000'))  # 0 disables cross-worker leases
+        self._lease_poll_interval = 0.05
+        self._single_flight_stats = {
+            "queries": 0,
+            "coalesced_waiters": 0,
+            "lease_waits": 0,
+            "lease_hits": 0
+        }
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._revalidation_stats = {
+            "stale_served": 0,
+            "refreshes": 0,
+            "refresh_errors": 0
+        }
+        self._negative_cache_stats = {
+            "hits": 0,
+            "stored": 0
+        }
+        self._local_cache = LocalCache(
+            max_entries=int(os.getenv('L1_CACHE_MAX_ENTRIES', '1000')),
+            max_bytes=int(os.getenv('L1_CACHE_MAX_BYTES', str(32 * 1024 * 1024))),
+            default_ttl=int(os.getenv('L1_CACHE_TTL', '30'))
+        )
+        self._query_metrics = QueryMetrics(
+            slow_query_ms=float(os.getenv('DB_SLOW_QUERY_MS', '500')),
+            slow_log_size=int(os.getenv('DB_SLOW_QUERY_LOG_SIZE', '100')),
+            explain_interval=float(os.getenv('DB_EXPLAIN_INTERVAL', '600'))
+        )
+        self._explain_slow_queries = os.getenv('DB_EXPLAIN_SLOW_QUERIES', 'false').lower() == 'true'
+        self._explain_tasks = set()
+        self._cache_clear_listeners: List[Callable[[], Any]] = []
+        self._invalidation_listeners: List[Callable[[Tuple[str, ...]], Any]] = []
+        # Row changes announced by the cache_invalidation triggers (see
+        # cache_invalidation_triggers.sql), including writes made outside the API
+        self._notify_enabled = os.getenv('DB_CACHE_NOTIFY', 'true').lower() == 'true'
+        self._notify_channel = "cache_invalidation"
+        self._notify_tables = ("blogs", "users", "jobs")  # Tables carrying the trigger
+        self._notify_debounce = int(os.getenv('DB_NOTIFY_DEBOUNCE_MS', '50')) / 1000  # Bulk writes evict once
+        self._notify_listener: Optional[PgNotifyListener] = None
+        self._notify_pending: Set[str] = set()
+        self._notify_flush_task: Optional[asyncio.Task] = None
+        self._notify_stats = {
+            "flushes": 0,
+            "tables": {},
+            "last_ids": {}
+        }
+        # DB_BACKEND=memory swaps Postgres for in-process tables (see memory_database.py)
+        self._backend = os.getenv('DB_BACKEND', 'postgres').lower()
+        self._memory_db = None
+        # Retries after connection failures and pooler rejections; on by default behind a pooler
+        self._transient_retries = int(os.getenv('DB_TRANSIENT_RETRIES', '2' if self._config.pooler_mode else '0'))
+        self._transient_retry_delay = int(os.getenv('DB_TRANSIENT_RETRY_DELAY_MS', '50')) / 1000
+        self._transient_retry_stats = {
+            "retries": 0,
+            "recovered": 0,
+            "exhausted": 0,
+            "errors": {}
+        }
         
     def _load_config(self) -> DatabaseConfig:
         """Load database configuration from environment"""
@@ -75,7 +371,13 @@ class OptimizedDatabaseManager:
                 min_connections=int(os.getenv('DB_MIN_CONNECTIONS', '10')),
                 max_connections=int(os.getenv('DB_MAX_CONNECTIONS', '50')),
                 connection_timeout=int(os.getenv('DB_CONNECTION_TIMEOUT', '10')),
-                command_timeout=int(os.getenv('DB_COMMAND_TIMEOUT', '30'))
+                command_timeout=int(os.getenv('DB_COMMAND_TIMEOUT', '30')),
+                read_database_url=self._load_read_database_url(),
+                read_min_connections=int(os.getenv('DB_READ_MIN_CONNECTIONS', '5')),
+                read_max_connections=int(os.getenv('DB_READ_MAX_CONNECTIONS', '25')),
+                split_pools=os.getenv('DB_SPLIT_POOLS', 'false').lower() == 'true',
+                replica_lag_window=float(os.getenv('DB_REPLICA_LAG_WINDOW', '5')),
+                pooler_mode=self._load_pooler_mode(database_url)
             )
         else:
             # Fallback to individual environment variables
@@ -88,9 +390,56 @@ class OptimizedDatabaseManager:
                 min_connections=int(os.getenv('DB_MIN_CONNECTIONS', '10')),
                 max_connections=int(os.getenv('DB_MAX_CONNECTIONS', '50')),
                 connection_timeout=int(os.getenv('DB_CONNECTION_TIMEOUT', '10')),
-                command_timeout=int(os.getenv('DB_COMMAND_TIMEOUT', '30'))
+                command_timeout=int(os.getenv('DB_COMMAND_TIMEOUT', '30')),
+                read_database_url=self._load_read_database_url(),
+                read_min_connections=int(os.getenv('DB_READ_MIN_CONNECTIONS', '5')),
+                read_max_connections=int(os.getenv('DB_READ_MAX_CONNECTIONS', '25')),
+                split_pools=os.getenv('DB_SPLIT_POOLS', 'false').lower() == 'true',
+                replica_lag_window=float(os.getenv('DB_REPLICA_LAG_WINDOW', '5')),
+                pooler_mode=self._load_pooler_mode(None)
             )
     
+    def _load_pooler_mode(self, database_url: Optional[str]) -> bool:
+        """DB_POOLER_MODE=true/false, or auto: on for Neon's -pooler endpoints"""
+        mode = os.getenv('DB_POOLER_MODE', 'auto').lower()
+        if os.getenv('DB_BACKEND', 'postgres').lower() == 'memory':
+            return False
+        if mode != 'auto':
+            return mode == 'true'
+        return bool(database_url) and '-pooler.' in database_url
+    
+    def _load_database_url(self) -> Optional[str]:
+        """Load the primary DSN in the format asyncpg expects"""
+        database_url = os.getenv('NEON_DATABASE_URL')
+        if database_url and database_url.startswith('postgresql+asyncpg://'):
+            # Convert to standard postgresql:// format for asyncpg
+            database_url = database_url.replace('postgresql+asyncpg://', 'postgresql://')
+        return database_url
+    
+    def _load_listen_url(self) -> Optional[str]:
+        """
+        Load the DSN for the LISTEN connection.
+        
+        LISTEN does not work through Neon's transaction-mode pooler, so
+        without DB_LISTEN_URL the -pooler suffix is dropped from the primary
+        host to reach the compute directly.
+        """
+        listen_url = os.getenv('DB_LISTEN_URL')
+        if listen_url:
+            return listen_url.replace('postgresql+asyncpg://', 'postgresql://')
+        
+        database_url = self._load_database_url()
+        if database_url:
+            return database_url.replace('-pooler.', '.')
+        return None
+    
+    def _load_read_database_url(self) -> Optional[str]:
+        """Load the read replica DSN, if one is configured"""
+        read_url = os.getenv('NEON_DATABASE_READ_URL') or os.getenv('DB_READ_URL')
+        if read_url and read_url.startswith('postgresql+asyncpg://'):
+            read_url = read_url.replace('postgresql+asyncpg://', 'postgresql://')
+        return read_url
+    
     async def initialize(self):
         """Initialize database and cache connections"""
         logger.info("🚀 Initializing optimized database connections...")
@@ -100,42 +449,40 @@ class OptimizedDatabaseManager:
             await self._initialize_redis()
             
             # Get NEON_DATABASE_URL for Neon connection
-            database_url = os.getenv('NEON_DATABASE_URL')
-            if database_url and database_url.startswith('postgresql+asyncpg://'):
-                # Convert to standard postgresql:// format for asyncpg
-                database_url = database_url.replace('postgresql+asyncpg://', 'postgresql://')
+            database_url = self._load_database_url()
+            
+            # Pools against the same endpoint share its connection budget
+            split_pools = bool(self._config.read_database_url or self._config.split_pools)
+            primary_share = 0.5 if split_pools and not self._config.read_database_url else 1.0
             
-            # Create optimized connection pool
-            if database_url:
-                # Use NEON_DATABASE_URL for Neon
-                self._pool = await asyncpg.create_pool(
-                    database_url,
-                    min_size=self._config.min_connections,
-                    max_size=self._config.max_connections,
-                    command_timeout=self._config.command_timeout,
-                    server_settings={
-                        'application_name': 'prepnexus_backend',
-                        'jit': 'off',  # Disable JIT for faster queries
-                        'work_mem': '4MB',  # Optimize memory usage
-                    }
+            # Create optimized connection pools
+            min_size, max_size = self._pool_bounds(self._config.min_connections, self._config.max_connections, primary_share)
+            self._pool = await self._create_pool(database_url, min_size, max_size)
+            self._pool_controller = self._create_pool_controller("primary", self._pool, min_size, max_size)
+            
+            if split_pools:
+                # Reads go to their own pool so writes never queue behind them
+                min_size, max_size = self._pool_bounds(
+                    self._config.read_min_connections,
+                    self._config.read_max_connections,
+                    primary_share
                 )
+                self._read_pool = await self._create_pool(self._config.read_database_url or database_url, min_size, max_size)
+                self._read_pool_controller = self._create_pool_controller("read", self._read_pool, min_size, max_size)
+                logger.info("✅ Read pool established")
             else:
-                # Fallback to individual parameters
-                self._pool = await asyncpg.create_pool(
-                    host=self._config.host,
-                    port=self._config.port,
-                    database=self._config.database,
-                    user=self._config.user,
-                    password=self._config.password,
-                    min_size=self._config.min_connections,
-                    max_size=self._config.max_connections,
-                    command_timeout=self._config.command_timeout,
-                    server_settings={
-                        'application_name': 'prepnexus_backend',
-                        'jit': 'off',  # Disable JIT for faster queries
-                        'work_mem': '4MB',  # Optimize memory usage
-                    }
+                self._read_pool = self._pool
+                self._read_pool_controller = self._pool_controller
+            
+            # Evict cached queries when triggers report changed rows
+            if self._notify_enabled and self._backend != 'memory':
+                self._notify_listener = PgNotifyListener(
+                    self._connect_listener,
+                    self._notify_channel,
+                    self._handle_table_notification,
+                    on_reconnect=self._handle_notify_reconnect
                 )
+                self._notify_listener.start()
             
             # Start background health check
             self._health_check_task = asyncio.create_task(self._background_health_check())
@@ -149,12 +496,129 @@ class OptimizedDatabaseManager:
             logger.error(f"❌ Database initialization failed: {e}")
             raise
     
+    def _pool_bounds(self, min_size: int, max_size: int, share: float = 1.0) -> Tuple[int, int]:
+        """
+        Clamp a pool's size to this worker's part of the connection budget.
+        
+        DB_CONNECTION_BUDGET is the connection limit of the database endpoint
+        (e.g. Neon's), divided evenly between WEB_CONCURRENCY workers. Behind
+        a pooler, pools are also capped at DB_POOLER_MAX_CONNECTIONS.
+        """
+        budget = os.getenv('DB_CONNECTION_BUDGET')
+        if budget:
+            workers = max(1, int(os.getenv('WEB_CONCURRENCY', '1')))
+            max_size = max(1, min(max_size, int(int(budget) // workers * share)))
+        if self._config.pooler_mode:
+            # A pooled connection only holds a server connection during a
+            # transaction, so a worker needs few; more just queue at the pooler
+            max_size = min(max_size, int(os.getenv('DB_POOLER_MAX_CONNECTIONS', '10')))
+            min_size = min(min_size, int(os.getenv('DB_POOLER_MIN_CONNECTIONS', '2')))
+        return min(min_size, max_size), max_size
+    
+    def _create_pool_controller(self, name: str, pool: asyncpg.Pool, min_size: int, max_size: int) -> PoolController:
+        """Wrap a pool with saturation telemetry and, unless disabled, adaptive sizing"""
+        controller = PoolController(
+            name,
+            pool,
+            min_size=min_size,
+            max_size=max_size,
+            initial_size=int(os.getenv('DB_POOL_INITIAL_SIZE', str(max_size))),
+            acquire_timeout=float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', str(self._config.connection_timeout))),
+            grow_wait_ms=float(os.getenv('DB_POOL_GROW_WAIT_MS', '50')),
+            interval=float(os.getenv('DB_POOL_RESIZE_INTERVAL', '10'))
+        )
+        if os.getenv('DB_ADAPTIVE_POOL', 'true').lower() == 'true':
+            controller.start()
+        else:
+            controller.limit = max_size
+        return controller
+    
+    async def _create_pool(self, database_url: Optional[str], min_size: int, max_size: int) -> asyncpg.Pool:
+        """
+        Create a connection pool from a DSN, or from individual parameters.
+        
+        max_size is the hard ceiling; the pool controller decides how many
+        connections are actually used, and idle ones are closed after
+        DB_POOL_IDLE_LIFETIME seconds.
+        
+        In pooler mode, asyncpg's statement cache is off so every statement
+        is sent unnamed, and session settings are left out of the startup
+        packet (see _TRANSACTION_SETTINGS_SQL).
+        """
+        if self._backend == 'memory':
+            return self._create_memory_pool(min_size, max_size)
+        
+        options = dict(
+            min_size=min_size,
+            max_size=max_size,
+            max_inactive_connection_lifetime=float(os.getenv('DB_POOL_IDLE_LIFETIME', '60')),
+            command_timeout=self._config.command_timeout,
+            connection_class=PreparedConnection,
+            init=self._init_connection,
+            server_settings={'application_name': 'prepnexus_backend'}
+        )
+        if self._config.pooler_mode:
+            # Named statements live on one server connection, which the
+            # pooler hands to a different client after each transaction
+            options['statement_cache_size'] = 0
+        else:
+            options['server_settings'].update(_SESSION_SETTINGS)
+        
+        if database_url:
+            # Use NEON_DATABASE_URL for Neon
+            return await asyncpg.create_pool(database_url, **options)
+        
+        # Fallback to individual parameters
+        return await asyncpg.create_pool(
+            host=self._config.host,
+            port=self._config.port,
+            database=self._config.database,
+            user=self._config.user,
+            password=self._config.password,
+            **options
+        )
+    
+    def _create_memory_pool(self, min_size: int, max_size: int):
+        """Create a pool over the in-memory tables, shared by the primary and read pools"""
+        from .memory_database import MemoryDatabase, MemoryPool
+        
+        if self._memory_db is None:
+            self._memory_db = MemoryDatabase(seed_blogs=int(os.getenv('DB_MEMORY_SEED_BLOGS', '50')))
+            logger.info(f"🧪 Using the in-memory database backend ({len(self._memory_db.blogs)} blogs)")
+        return MemoryPool(
+            self._memory_db,
+            min_size=min_size,
+            max_size=max_size,
+            latency=float(os.getenv('DB_MEMORY_LATENCY_MS', '0')) / 1000
+        )
+    
+    async def _init_connection(self, conn: PreparedConnection):
+        """Register JSON codecs and prepare every registered query on a new pool connection"""
+        # json/jsonb columns arrive as Python objects instead of text to re-parse
+        await register_json_codecs(conn)
+        
+        if self._config.pooler_mode:
+            # Prepared statements would not survive the pooler switching server connections
+            return
+        
+        for named_query in query_registry.preparable():
+            start_time = time.perf_counter()
+            try:
+                conn.prepared_statements[named_query.name] = await conn.prepare(named_query.sql)
+                query_registry.record_prepare(named_query.name, (time.perf_counter() - start_time) * 1000)
+            except Exception as e:
+                # Skip queries the current schema can't satisfy; they run unprepared
+                if named_query.name not in self._prepare_failures:
+                    self._prepare_failures.add(named_query.name)
+                    logger.warning(f"⚠️ Could not prepare query '{named_query.name}': {e}")
+    
     async def _initialize_redis(self):
         """Initialize Redis cache connection"""
         try:
             await redis_manager.initialize()
             self._redis = redis_manager._redis if redis_manager.is_connected() else None
             if self._redis:
+                redis_manager.subscribe(self._invalidation_channel, self._handle_invalidation)
                 logger.info("✅ Redis cache connection established")
             else:
                 logger.warning("⚠️ Redis cache unavailable")
@@ -179,11 +643,22 @@ class OptimizedDatabaseManager:
         if current_time - self._last_health_check < self._health_check_interval:
             return self._is_healthy
         
+        if self._read_pool is not None and self._read_pool is not self._pool:
+            try:
+                async with self._read_pool.acquire() as conn:
+                    await conn.fetchval("SELECT 1")
+                self._read_pool_healthy = True
+            except Exception as e:
+                # Reads fall back to the primary until the replica recovers
+                self._read_pool_healthy = False
+                logger.error(f"Read pool health check failed: {e}")
+        
         try:
             async with self._pool.acquire() as conn:
                 await conn.fetchval("SELECT 1")
                 self._is_healthy = True
                 self._last_health_check = current_time
+                self._last_health_check_ms = (time.time() - current_time) * 1000
                 return True
                 
         except Exception as e:
@@ -197,6 +672,17 @@ class OptimizedDatabaseManager:
         if self._health_check_task:
             self._health_check_task.cancel()
         
+        if self._notify_listener:
+            await self._notify_listener.stop()
+        if self._notify_flush_task:
+            self._notify_flush_task.cancel()
+        
+        for controller in {self._pool_controller, self._read_pool_controller} - {None}:
+            controller.stop()
+        
+        if self._read_pool and self._read_pool is not self._pool:
+            await self._read_pool.close()
+        
         if self._pool:
             await self._pool.close()
         
@@ -204,104 +690,804 @@ class OptimizedDatabaseManager:
         
         logger.info("🛑 Database connections closed")
     
-    def _get_cache_key(self, query: str, *args) -> str:
-        """Generate cache key for query"""
-        return f"db:{hash(query + str(args))}"
+    def _get_cache_key(self, kind: str, query: str, *args) -> str:
+        """
+        Generate a deterministic cache key for a query.
+        
+        Uses a digest of the normalized SQL, the fetch kind and the arguments
+        so every worker process computes the same key for the same query.
+        """
+        payload = f"{kind}\x00{normalize_query(query)}\x00{args!r}"
+        return f"db:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+    
+    async def _get_from_cache(self, cache_key: str, ttl: int = None, tables: List[str] = (), stale_ttl: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Get a cache entry from the local cache, falling back to Redis.
+        
+        Entries are envelopes of the form {"value": ..., "expires_at": epoch}
+        so callers can tell fresh results from ones inside the stale window.
+        """
+        entry = self._local_cache.get(cache_key)
+        if entry is not None:
+            return entry
+        
+        entry = await redis_manager.get(cache_key, tags=tables)
+        if entry is not None:
+            self._set_local_cache(cache_key, entry, ttl, tables, stale_ttl)
+        return entry
     
-    async def _get_from_cache(self, cache_key: str) -> Optional[Any]:
-        """Get data from cache"""
-        return await redis_manager.get(cache_key)
+    def _set_local_cache(self, cache_key: str, entry: Dict[str, Any], ttl: int = None, tables: List[str] = (), stale_ttl: int = 0):
+        """Store a cache entry in the local cache for at most its L1 TTL"""
+        local_ttl = min(self._local_cache.default_ttl, (ttl or self._cache_ttl) + stale_ttl)
+        self._local_cache.set(cache_key, entry, local_ttl, tables)
     
-    async def _set_cache(self, cache_key: str, data: Any, ttl: int = None):
-        """Set data in cache"""
+    async def _set_cache(self, cache_key: str, data: Any, ttl: int = None, tables: List[str] = (), stale_ttl: int = 0):
+        """
+        Set data in both cache tiers, tagged with the tables the query reads.
+        
+        The entry is fresh for ttl seconds and kept for a further stale_ttl
+        seconds so it can be served while a refresh runs.
+        """
         ttl = ttl or self._cache_ttl
-        await redis_manager.set(cache_key, data, ttl)
+        entry = {"value": data, "expires_at": time.time() + ttl}
+        self._set_local_cache(cache_key, entry, ttl, tables, stale_ttl)
+        # Keep the entry past its stale window so it can stand in during an outage
+        await redis_manager.set_with_tags(cache_key, entry, ttl + max(stale_ttl, self._stale_if_error_ttl), tables)
     
-    async def _invalidate_cache_pattern(self, pattern: str):
-        """Invalidate cache entries matching pattern"""
-        await redis_manager.delete_pattern(pattern)
+    async def _set_negative_cache(self, cache_key: str, ttl: int, tables: List[str] = ()):
+        """
+        Remember that a query found no row.
+        
+        Negative entries are tagged like any other, so a write to the table
+        (e.g. creating the missing blog) evicts them. They are never served
+        stale and expire from Redis as soon as they stop being fresh.
+        """
+        entry = {"value": None, "expires_at": time.time() + ttl, "negative": True}
+        self._set_local_cache(cache_key, entry, ttl, tables)
+        await redis_manager.set_with_tags(cache_key, entry, ttl, tables)
+        self._negative_cache_stats["stored"] += 1
+    
+    def _handle_invalidation(self, message: Dict[str, Any]):
+        """Evict local cache entries invalidated by another worker"""
+        if message.get("origin") == self._instance_id:
+            return
+        
+        if message.get("all"):
+            self._local_cache.clear()
+            redis_manager.invalidate_hot_keys()
+        else:
+            tables = message.get("tables", [])
+            self._record_table_writes(tables)
+            self._local_cache.invalidate_tags(*tables)
+            if tables:
+                redis_manager.invalidate_hot_keys(*tables)
+            self._notify_invalidation(tables)
+    
+    async def invalidate_tables(self, *tables: str) -> int:
+        """Invalidate every cached query that reads from the given tables"""
+        self._record_table_writes(tables)
+        self._local_cache.invalidate_tags(*tables)
+        self._notify_invalidation(tables)
+        deleted = await redis_manager.invalidate_tags(*tables)
+        await redis_manager.publish(
+            self._invalidation_channel,
+            {"origin": self._instance_id, "tables": list(tables)}
+        )
+        return deleted
+    
+    async def _connect_listener(self) -> asyncpg.Connection:
+        """Open the dedicated connection used for LISTEN, outside both pools"""
+        listen_url = self._load_listen_url()
+        server_settings = {'application_name': 'prepnexus_backend_listener'}
+        if listen_url:
+            return await asyncpg.connect(listen_url, timeout=self._config.connection_timeout, server_settings=server_settings)
+        return await asyncpg.connect(
+            host=self._config.host,
+            port=self._config.port,
+            database=self._config.database,
+            user=self._config.user,
+            password=self._config.password,
+            timeout=self._config.connection_timeout,
+            server_settings=server_settings
+        )
+    
+    def _handle_table_notification(self, message: Dict[str, Any]):
+        """Queue the table named by a trigger notification for eviction"""
+        table = message.get("table")
+        if not table:
+            return
+        
+        self._notify_stats["tables"][table] = self._notify_stats["tables"].get(table, 0) + 1
+        if message.get("id") is not None:
+            self._notify_stats["last_ids"][table] = message["id"]
+        self._queue_notified_tables(table)
+    
+    def _handle_notify_reconnect(self):
+        """Changes made while the LISTEN connection was down were missed; evict everything it covers"""
+        logger.info("🔄 Re-listening for table changes, evicting cached queries on notified tables")
+        self._queue_notified_tables(*self._notify_tables)
+    
+    def _queue_notified_tables(self, *tables: str):
+        self._notify_pending.update(tables)
+        if self._notify_flush_task is None or self._notify_flush_task.done():
+            self._notify_flush_task = asyncio.create_task(self._flush_notified_tables())
+    
+    async def _flush_notified_tables(self):
+        """
+        Evict cached queries for every table notified during the debounce window.
+        
+        Every worker receives each notification, so each evicts its own local
+        cache; the Redis eviction is repeated per worker but idempotent, and
+        nothing is published since the other workers are listening too.
+        """
+        await asyncio.sleep(self._notify_debounce)
+        # Tables notified while Redis is being cleaned up go in another round
+        while self._notify_pending:
+            tables = tuple(self._notify_pending)
+            self._notify_pending.clear()
+            
+            self._notify_stats["flushes"] += 1
+            self._record_table_writes(tables)
+            self._local_cache.invalidate_tags(*tables)
+            self._notify_invalidation(tables)
+            await redis_manager.invalidate_tags(*tables)
+    
+    def get_notify_stats(self) -> Dict[str, Any]:
+        """Get trigger notification listener statistics"""
+        listener = self._notify_listener.get_stats() if self._notify_listener else {"connected": False}
+        return {
+            "enabled": self._notify_enabled,
+            **listener,
+            **self._notify_stats
+        }
+    
+    def _notify_invalidation(self, tables):
+        """Tell invalidation listeners which tables changed, here or on another worker"""
+        tables = tuple(tables)
+        for listener in self._invalidation_listeners:
+            try:
+                listener(tables)
+            except Exception as e:
+                logger.error(f"Invalidation listener failed: {e}")
+    
+    def _record_table_writes(self, tables):
+        """Remember when tables changed so cache fills avoid a lagging replica"""
+        now = time.monotonic()
+        for table in tables:
+            self._table_write_times[table] = now
+    
+    def _mark_write(self):
+        """Pin this request's following reads to the primary"""
+        _last_write_at.set(time.monotonic())
+        self._routing_stats["writes"] += 1
+    
+    def _use_read_pool(self, query: Union[str, NamedQuery]) -> bool:
+        """
+        Decide whether a statement can be served by the read pool.
+        
+        Writes, reads made shortly after a write in the same request, and
+        reads of tables written recently by any worker go to the primary so
+        callers always see their own writes.
+        """
+        sql = query.sql if isinstance(query, NamedQuery) else query
+        if not is_read_query(sql):
+            self._mark_write()
+            return False
+        
+        if self._read_pool is None or self._read_pool is self._pool or not self._read_pool_healthy \
+                or not self._read_breaker.allows_requests():
+            self._routing_stats["primary_reads"] += 1
+            return False
+        
+        now = time.monotonic()
+        window = self._config.replica_lag_window
+        recently_written = now - _last_write_at.get() < window or any(
+            now - self._table_write_times.get(table, 0.0) < window
+            for table in extract_tables(sql)
+        )
+        self._routing_stats["primary_reads" if recently_written else "replica_reads"] += 1
+        return not recently_written
+    
+    def _mark_read_pool_down(self, error: BaseException):
+        """Route reads to the primary until the next health check finds the replica back"""
+        if self._read_pool_healthy:
+            logger.error(f"Read pool failed, routing reads to the primary: {error}")
+        self._read_pool_healthy = False
     
     @asynccontextmanager
-    async def get_connection(self):
-        """Get database connection (optimized)"""
-        if not self._is_healthy:
-            await self._health_check()
+    async def get_connection(self, read_only: bool = False):
+        """
+        Get database connection (optimized), from the read pool when read_only.
         
-        async with self._pool.acquire() as connection:
-            yield connection
+        Raises CircuitOpenError straight away while the circuit breaker is
+        open. Timeouts and connection errors count towards opening it; the
+        read pool has a breaker of its own and a failure on it also marks it
+        down. Within a request, the acquire wait is bounded by the request's
+        remaining budget and running out of it raises DeadlineExceeded.
+        """
+        replica = read_only and self._read_pool is not None and self._read_pool is not self._pool
+        breaker = self._read_breaker if replica else self._breaker
+        breaker.before_call()
+        acquired = False
+        
+        try:
+            if not self._is_healthy:
+                await self._health_check()
+            
+            if read_only and self._read_pool is not None:
+                pool, controller = self._read_pool, self._read_pool_controller
+            else:
+                pool, controller = self._pool, self._pool_controller
+            acquire_timeout = deadline.timeout()
+            start_time = time.perf_counter()
+            acquire = controller.acquire(timeout=acquire_timeout) if controller else pool.acquire(timeout=acquire_timeout)
+            async with acquire as connection:
+                acquired = True
+                token = _acquire_wait_ms.set((time.perf_counter() - start_time) * 1000)
+                try:
+                    yield connection
+                finally:
+                    _acquire_wait_ms.reset(token)
+        except Exception as e:
+            if isinstance(e, (asyncio.TimeoutError, DeadlineExceeded)) and deadline.expired():
+                # The request ran out of budget, which says nothing about the database
+                breaker.release()
+                if isinstance(e, DeadlineExceeded):
+                    raise
+                raise DeadlineExceeded() from e
+            if is_unavailable_error(e):
+                breaker.record_failure(e)
+            else:
+                breaker.record_success()
+            if replica and is_replica_failure(e, acquired):
+                self._mark_read_pool_down(e)
+            raise
+        except BaseException:
+            # Cancelled: no verdict on the database either way
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
     
-    async def execute(self, query: str, *args):
-        """Execute a query (optimized)"""
+    async def _run(self, conn, method: str, query: Union[str, NamedQuery], args: tuple):
+        """
+        Run a query on a connection and record its fingerprint telemetry.
+        
+        Named queries use the statement prepared for this connection when one
+        exists and also record their timing in the query registry. Within a
+        request, the statement timeout is the request's remaining budget so
+        asyncpg cancels it server-side when the budget runs out.
+        """
+        named = isinstance(query, NamedQuery)
+        sql = query.sql if named else query
+        statement = getattr(conn, 'prepared_statements', {}).get(query.name) if named else None
+        timeout = deadline.timeout(self._config.command_timeout)
+        start_time = time.perf_counter()
+        result = None
+        error = False
+        try:
+            if statement is None:
+                result = await getattr(conn, method)(sql, *args, timeout=timeout)
+            elif method == "execute":
+                await statement.fetch(*args, timeout=timeout)
+                result = statement.get_statusmsg()
+            else:
+                result = await getattr(statement, method)(*args, timeout=timeout)
+            return result
+        except BaseException:
+            # Includes cancellation when a request runs out of budget
+            error = True
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            if named:
+                query_registry.record_call(query.name, duration_ms, error)
+            self._record_execution(sql, method, args, result, duration_ms, error, query.name if named else None)
+    
+    def _record_execution(self, sql: str, method: str, args: tuple, result: Any, duration_ms: float,
+                          error: bool, name: Optional[str]):
+        """Record a round trip and log it if it crossed the slow-query threshold"""
+        round_trips.record("db")
+        rows = 0 if error else count_rows(method, result)
+        acquire_ms = _acquire_wait_ms.get()
+        if not self._query_metrics.record_execution(sql, duration_ms, rows, acquire_ms, error, name):
+            return
+        
+        entry = self._query_metrics.log_slow_query(sql, duration_ms, rows, acquire_ms, name)
+        logger.warning(f"⚠️ Slow query ({duration_ms:.0f}ms, {rows} rows): {entry['query'][:200]}")
+        
+        # EXPLAIN ANALYZE runs the statement again, so only plans for reads are captured
+        if self._explain_slow_queries and method not in ("executemany", "cursor") and is_read_query(sql) \
+                and self._query_metrics.should_explain(sql):
+            task = asyncio.create_task(self._capture_plan(entry, sql, args))
+            self._explain_tasks.add(task)
+            task.add_done_callback(self._explain_tasks.discard)
+    
+    async def _capture_plan(self, entry: Dict[str, Any], sql: str, args: tuple):
+        """Attach an EXPLAIN (ANALYZE, BUFFERS) plan to a slow-query log entry"""
+        try:
+            pool = self._read_pool or self._pool
+            async with pool.acquire() as conn:
+                plan = await conn.fetchval(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", *args)
+            entry["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+        except Exception as e:
+            entry["plan_error"] = str(e)
+            logger.warning(f"⚠️ Could not capture plan for slow query {entry['id']}: {e}")
+    
+    @asynccontextmanager
+    async def transaction(self, isolation: Optional[str] = None, readonly: bool = False):
+        """
+        Run several statements as one unit of work on a single connection.
+        
+        Commits when the block exits normally and rolls back on an exception.
+        Caches for the tables written are invalidated once, after commit.
+        
+            async with db.transaction() as tx:
+                user_id = await tx.fetchval(INSERT_USER, email)
+                await tx.execute(INSERT_PROGRESS, user_id)
+        """
+        if not readonly:
+            self._mark_write()
+        
         async with self.get_connection() as conn:
-            return await conn.execute(query, *args)
+            tx = Transaction(self, conn)
+            async with conn.transaction(isolation=isolation, readonly=readonly):
+                await self._apply_transaction_settings(conn)
+                yield tx
+        
+        if tx.tables:
+            await self.invalidate_tables(*tx.tables)
     
-    async def fetch(self, query: str, *args, use_cache: bool = True, cache_ttl: int = None):
-        """Fetch multiple rows with intelligent caching"""
-        if use_cache and query.strip().upper().startswith('SELECT'):
-            cache_key = self._get_cache_key(query, *args)
-            cached_result = await self._get_from_cache(cache_key)
-            if cached_result is not None:
-                return cached_result
+    async def _apply_transaction_settings(self, conn):
+        """In pooler mode, apply the session settings to the transaction just opened"""
+        if self._config.pooler_mode:
+            await conn.execute(_TRANSACTION_SETTINGS_SQL)
+    
+    async def execute(self, query: Union[str, NamedQuery], *args):
+        """Execute a query (optimized)"""
+        self._record_call(query)
+        return await self._query("execute", query, args)
+    
+    async def _query(self, method: str, query: Union[str, NamedQuery], args: tuple):
+        """
+        Run one statement on a pooled connection, retrying transient failures.
         
+        Up to DB_TRANSIENT_RETRIES further attempts are made, with exponential
+        backoff, for errors is_transient_error() considers safe to retry and
+        only while the request's deadline leaves room for the wait. A read
+        the replica failed is retried on the primary straight away.
+        """
+        sql = query.sql if isinstance(query, NamedQuery) else query
+        use_replica = self._use_read_pool(query)
+        attempt = 0
+        while True:
+            started = False
+            try:
+                async with self.get_connection(read_only=use_replica) as conn:
+                    started = True
+                    result = await self._run(conn, method, query, args)
+                if attempt:
+                    self._transient_retry_stats["recovered"] += 1
+                return result
+            except Exception as e:
+                if use_replica and is_replica_failure(e, started):
+                    self._routing_stats["replica_fallbacks"] += 1
+                    use_replica = False
+                    continue
+                if not is_transient_error(e, started, is_read_query(sql)):
+                    raise
+                delay = self._transient_retry_delay * 2 ** attempt
+                remaining = deadline.remaining()
+                if attempt >= self._transient_retries or (remaining is not None and remaining <= delay):
+                    if self._transient_retries:
+                        self._transient_retry_stats["exhausted"] += 1
+                    raise
+                
+                attempt += 1
+                errors = self._transient_retry_stats["errors"]
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                self._transient_retry_stats["retries"] += 1
+                logger.warning(f"⚠️ Transient database error, retrying ({attempt}/{self._transient_retries}): {e}")
+                await asyncio.sleep(delay)
+    
+    # Bulk write methods
+    async def executemany(self, query: Union[str, NamedQuery], args: Iterable[Sequence[Any]], tables: Optional[Iterable[str]] = None):
+        """
+        Execute a statement for every argument tuple in one round trip.
+        
+        Cached queries reading the written tables (detected from the SQL
+        unless given) are invalidated once for the whole batch.
+        """
+        sql = query.sql if isinstance(query, NamedQuery) else query
+        self._record_call(query)
+        self._mark_write()
         async with self.get_connection() as conn:
-            result = await conn.fetch(query, *args)
-            data = [dict(row) for row in result]
-            
-            if use_cache and query.strip().upper().startswith('SELECT'):
-                await self._set_cache(cache_key, data, cache_ttl)
-            
-            return data
+            await self._run(conn, "executemany", query, (list(args),))
+        
+        await self.invalidate_tables(*(tables if tables is not None else extract_written_tables(sql)))
     
-    async def fetchval(self, query: str, *args, use_cache: bool = True, cache_ttl: int = None):
-        """Fetch single value with caching"""
-        if use_cache and query.strip().upper().startswith('SELECT'):
-            cache_key = self._get_cache_key(query, *args)
-            cached_result = await self._get_from_cache(cache_key)
-            if cached_result is not None:
-                return cached_result
+    async def copy_records(self, table: str, records: Iterable[Sequence[Any]], columns: Sequence[str]) -> int:
+        """
+        Bulk insert rows with COPY, the fastest path into Postgres.
         
+        Returns the number of rows copied and invalidates the table's cache once.
+        """
+        self._mark_write()
         async with self.get_connection() as conn:
-            result = await conn.fetchval(query, *args)
-            
-            if use_cache and query.strip().upper().startswith('SELECT'):
-                await self._set_cache(cache_key, result, cache_ttl)
-            
-            return result
+            status = await self._copy_into(conn, table, records, columns)
+        
+        await self.invalidate_tables(table.split('.')[-1].lower())
+        return int(status.split()[-1])
     
-    async def fetchrow(self, query: str, *args, use_cache: bool = True, cache_ttl: int = None):
-        """Fetch single row with caching"""
-        if use_cache and query.strip().upper().startswith('SELECT'):
-            cache_key = self._get_cache_key(query, *args)
-            cached_result = await self._get_from_cache(cache_key)
-            if cached_result is not None:
-                return cached_result
+    async def upsert_records(self, table: str, records: Iterable[Sequence[Any]], columns: Sequence[str],
+                             conflict_columns: Sequence[str], update_columns: Optional[Sequence[str]] = None) -> int:
+        """
+        Bulk insert-or-update rows through a COPY-loaded staging table.
+        
+        Rows are copied into a temporary table, then merged with a single
+        INSERT ... ON CONFLICT. Columns not listed in update_columns keep
+        their existing values; with no update columns, conflicting rows are
+        skipped. Returns the number of rows inserted or updated.
+        """
+        if update_columns is None:
+            update_columns = [column for column in columns if column not in conflict_columns]
         
+        target = quote_identifier(table)
+        staging_name = f"_staging_{table.split('.')[-1]}"
+        staging = quote_identifier(staging_name)
+        column_list = ", ".join(quote_identifier(column) for column in columns)
+        conflict_list = ", ".join(quote_identifier(column) for column in conflict_columns)
+        if update_columns:
+            action = "DO UPDATE SET " + ", ".join(
+                f"{quote_identifier(column)} = EXCLUDED.{quote_identifier(column)}" for column in update_columns
+            )
+        else:
+            action = "DO NOTHING"
+        
+        self._mark_write()
         async with self.get_connection() as conn:
-            row = await conn.fetchrow(query, *args)
-            result = dict(row) if row else None
-            
-            if use_cache and query.strip().upper().startswith('SELECT'):
-                await self._set_cache(cache_key, result, cache_ttl)
-            
+            async with conn.transaction():
+                await self._apply_transaction_settings(conn)
+                # Only the loaded columns, so no defaults or sequences fire on staging
+                await conn.execute(
+                    f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                    f"SELECT {column_list} FROM {target} WITH NO DATA"
+                )
+                await self._copy_into(conn, staging_name, records, columns)
+                status = await conn.execute(
+                    f"INSERT INTO {target} ({column_list}) "
+                    f"SELECT {column_list} FROM {staging} "
+                    f"ON CONFLICT ({conflict_list}) {action}"
+                )
+        
+        await self.invalidate_tables(table.split('.')[-1].lower())
+        return int(status.split()[-1])
+    
+    async def _copy_into(self, conn, table: str, records: Iterable[Sequence[Any]], columns: Sequence[str]) -> str:
+        """COPY records into a table on an already acquired connection"""
+        schema_name, _, table_name = table.rpartition('.')
+        return await conn.copy_records_to_table(
+            table_name,
+            records=records,
+            columns=list(columns),
+            schema_name=schema_name or None
+        )
+    
+    async def _cached_query(self, kind: str, query: Union[str, NamedQuery], args: tuple, use_cache: bool, cache_ttl: Optional[int], stale_ttl: int, loader: Callable[[], Awaitable[Any]], negative_ttl: int = 0):
+        """
+        Run a read through the cache with single-flight coalescing.
+        
+        Concurrent callers missing on the same cache key await one shared
+        database query instead of each issuing their own. With stale_ttl,
+        expired entries inside the grace window are returned immediately
+        while a background task refreshes them. While the database is
+        unavailable, any expired entry still held is served instead of
+        failing (stale-if-error). With negative_ttl, a None result is cached
+        for that many seconds instead of querying again on every miss.
+        """
+        sql = query.sql if isinstance(query, NamedQuery) else query
+        if not (use_cache and sql.strip().upper().startswith('SELECT')):
+            self._record_call(query)
+            return await loader()
+        
+        tables = extract_tables(sql)
+        cache_key = self._get_cache_key(kind, sql, *args)
+        entry = await self._get_from_cache(cache_key, cache_ttl, tables, stale_ttl)
+        if entry is not None and entry.get("negative"):
+            if entry["expires_at"] > time.time():
+                self._record_call(query, cache_hit=True)
+                self._negative_cache_stats["hits"] += 1
+                return None
+            # An expired "no row" result is a miss, never a stale fallback
+            entry = None
+        if entry is not None:
+            now = time.time()
+            if entry["expires_at"] > now:
+                self._record_call(query, cache_hit=True)
+                return entry["value"]
+            if stale_ttl and entry["expires_at"] + stale_ttl > now:
+                self._record_call(query, cache_hit=True)
+                self._revalidation_stats["stale_served"] += 1
+                self._schedule_refresh(cache_key, cache_ttl, stale_ttl, tables, loader)
+                return entry["value"]
+            if not self._breaker.allows_requests():
+                self._record_call(query, cache_hit=True)
+                self._stale_if_error_served += 1
+                return entry["value"]
+        
+        self._record_call(query, cache_hit=False)
+        inflight = self._inflight.get(cache_key)
+        if inflight is None:
+            inflight = asyncio.create_task(
+                self._load_and_cache(cache_key, cache_ttl, stale_ttl, tables, loader, negative_ttl),
+                context=_shared_load_context()
+            )
+            self._inflight[cache_key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+            # Waiters may give up on their own deadline before the load finishes
+            inflight.add_done_callback(lambda task: task.cancelled() or task.exception())
+        else:
+            self._single_flight_stats["coalesced_waiters"] += 1
+        
+        try:
+            # The shared load has no request deadline of its own (it keeps the
+            # configured timeouts); each waiter stops waiting when its budget runs out
+            return await deadline.with_deadline(asyncio.shield(inflight))
+        except Exception as e:
+            if entry is None or not (is_unavailable_error(e) or isinstance(e, DeadlineExceeded)):
+                raise
+            logger.warning(f"⚠️ Serving stale cache entry, database unavailable: {e}")
+            self._stale_if_error_served += 1
+            return entry["value"]
+    
+    async def _load_and_cache(self, cache_key: str, cache_ttl: Optional[int], stale_ttl: int, tables: Tuple[str, ...], loader: Callable[[], Awaitable[Any]], negative_ttl: int = 0):
+        """Load a query result, holding a short Redis lease so other workers wait for it"""
+        lease_key = f"lease:{cache_key}"
+        lease_token = None
+        if self._lease_ms > 0:
+            lease_token = await redis_manager.acquire_lease(lease_key, self._lease_ms)
+            if lease_token is None:
+                self._single_flight_stats["lease_waits"] += 1
+                entry = await self._wait_for_lease(cache_key, lease_key, cache_ttl, stale_ttl, tables)
+                if entry is not None:
+                    self._single_flight_stats["lease_hits"] += 1
+                    return entry["value"]
+        
+        try:
+            self._single_flight_stats["queries"] += 1
+            result = await loader()
+            if result is not None:
+                await self._set_cache(cache_key, result, cache_ttl, tables, stale_ttl)
+            elif negative_ttl:
+                await self._set_negative_cache(cache_key, negative_ttl, tables)
             return result
+        finally:
+            if lease_token:
+                await redis_manager.release_lease(lease_key, lease_token)
+    
+    async def _wait_for_lease(self, cache_key: str, lease_key: str, cache_ttl: Optional[int], stale_ttl: int, tables: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        """Poll Redis for a result being loaded by another worker until its lease is gone"""
+        wait = self._lease_ms / 1000
+        left = deadline.remaining()
+        if left is not None:
+            wait = min(wait, left)
+        wait_until = time.monotonic() + wait
+        while time.monotonic() < wait_until:
+            await asyncio.sleep(self._lease_poll_interval)
+            entry = await redis_manager.get(cache_key, tags=tables)
+            if entry is not None and entry["expires_at"] > time.time():
+                self._set_local_cache(cache_key, entry, cache_ttl, tables, stale_ttl)
+                return entry
+            if not await redis_manager.exists(lease_key):
+                # Holder finished without caching anything (e.g. no rows)
+                break
+        return None
+    
+    def _schedule_refresh(self, cache_key: str, cache_ttl: Optional[int], stale_ttl: int, tables: Tuple[str, ...], loader: Callable[[], Awaitable[Any]]):
+        """Start a background refresh for a stale entry unless one is already running"""
+        if cache_key in self._refreshing or cache_key in self._inflight:
+            return
+        
+        task = asyncio.create_task(
+            self._refresh(cache_key, cache_ttl, stale_ttl, tables, loader), context=_shared_load_context()
+        )
+        self._refreshing[cache_key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(cache_key, None))
+    
+    async def _refresh(self, cache_key: str, cache_ttl: Optional[int], stale_ttl: int, tables: Tuple[str, ...], loader: Callable[[], Awaitable[Any]]):
+        """Reload a stale entry, using a Redis lease so only one worker refreshes it"""
+        refresh_key = f"refresh:{cache_key}"
+        refresh_token = await redis_manager.acquire_lease(refresh_key, max(self._lease_ms, 1000))
+        if refresh_token is None:
+            # Another worker is refreshing; read its result from Redis next time
+            self._local_cache.delete(cache_key)
+            return
+        
+        try:
+            result = await loader()
+            if result is not None:
+                await self._set_cache(cache_key, result, cache_ttl, tables, stale_ttl)
+            self._revalidation_stats["refreshes"] += 1
+        except Exception as e:
+            self._revalidation_stats["refresh_errors"] += 1
+            logger.warning(f"⚠️ Background cache refresh failed: {e}")
+        finally:
+            await redis_manager.release_lease(refresh_key, refresh_token)
+    
+    async def fetch(self, query: Union[str, NamedQuery], *args, use_cache: bool = True, cache_ttl: int = None, stale_ttl: int = 0):
+        """Fetch multiple rows with intelligent caching"""
+        async def load():
+            result = await self._query("fetch", query, args)
+            return [dict(row) for row in result]
+        
+        return await self._cached_query("fetch", query, args, use_cache, cache_ttl, stale_ttl, load)
+    
+    async def fetchval(self, query: Union[str, NamedQuery], *args, use_cache: bool = True, cache_ttl: int = None, stale_ttl: int = 0,
+                       negative_ttl: Union[int, bool] = 0):
+        """Fetch single value with caching; negative_ttl caches a None result (True for the default TTL)"""
+        async def load():
+            return await self._query("fetchval", query, args)
+        
+        return await self._cached_query("fetchval", query, args, use_cache, cache_ttl, stale_ttl, load,
+                                        self._resolve_negative_ttl(negative_ttl))
+    
+    async def fetchrow(self, query: Union[str, NamedQuery], *args, use_cache: bool = True, cache_ttl: int = None, stale_ttl: int = 0,
+                       negative_ttl: Union[int, bool] = 0):
+        """Fetch single row with caching; negative_ttl caches a missing row (True for the default TTL)"""
+        async def load():
+            row = await self._query("fetchrow", query, args)
+            return dict(row) if row else None
+        
+        return await self._cached_query("fetchrow", query, args, use_cache, cache_ttl, stale_ttl, load,
+                                        self._resolve_negative_ttl(negative_ttl))
+    
+    def _resolve_negative_ttl(self, negative_ttl: Union[int, bool]) -> int:
+        """Seconds to cache a None result for; 0 or False disables it"""
+        if negative_ttl is True:
+            return self._negative_cache_ttl
+        return negative_ttl or 0
+    
+    async def stream(self, query: Union[str, NamedQuery], *args, batch_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over a large result set through a server-side cursor.
+        
+        Rows are fetched batch_size at a time inside a read-only transaction,
+        and the next batch is only requested once the consumer has taken the
+        previous one, so memory stays flat however many rows match. The
+        connection is held until iteration finishes or the iterator is
+        closed, so consume promptly. Results are never cached.
+        
+            async for row in db.stream(queries.BLOGS_FOR_SITEMAP):
+                ...
+        """
+        named = isinstance(query, NamedQuery)
+        sql = query.sql if named else query
+        name = query.name if named else None
+        self._record_call(query)
+        
+        async with self.get_connection(read_only=self._use_read_pool(query)) as conn:
+            async with conn.transaction(readonly=is_read_query(sql)):
+                await self._apply_transaction_settings(conn)
+                statement = getattr(conn, 'prepared_statements', {}).get(name) if named else None
+                cursor = await (statement.cursor(*args) if statement else conn.cursor(sql, *args))
+                while True:
+                    start_time = time.perf_counter()
+                    try:
+                        rows = await cursor.fetch(batch_size, timeout=deadline.timeout(self._config.command_timeout))
+                    except Exception:
+                        self._record_execution(sql, "cursor", args, None, (time.perf_counter() - start_time) * 1000, True, name)
+                        raise
+                    self._record_execution(sql, "cursor", args, rows, (time.perf_counter() - start_time) * 1000, False, name)
+                    
+                    for row in rows:
+                        yield dict(row)
+                    if len(rows) < batch_size:
+                        break
+    
+    def get_single_flight_stats(self) -> Dict[str, Any]:
+        """Get request coalescing statistics"""
+        return {
+            **self._single_flight_stats,
+            "in_flight": len(self._inflight),
+            "lease_ms": self._lease_ms
+        }
+    
+    def get_query_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-query timing for registered queries"""
+        return query_registry.get_stats()
+    
+    def _record_call(self, query: Union[str, NamedQuery], cache_hit: Optional[bool] = None):
+        """Count a call from application code against its fingerprint"""
+        if isinstance(query, NamedQuery):
+            self._query_metrics.record_call(query.sql, query.name, cache_hit)
+        else:
+            self._query_metrics.record_call(query, cache_hit=cache_hit)
+    
+    def get_fingerprint_stats(self, sort_by: str = "total_ms", limit: int = 50) -> Dict[str, Any]:
+        """Get per-fingerprint telemetry and the slow-query log"""
+        return {
+            **self._query_metrics.get_summary(),
+            "explain_slow_queries": self._explain_slow_queries,
+            "fingerprints": self._query_metrics.get_stats(sort_by, limit),
+            "slow_queries": self._query_metrics.get_slow_queries()
+        }
+    
+    def reset_fingerprint_stats(self):
+        """Clear per-fingerprint telemetry and the slow-query log"""
+        self._query_metrics.reset()
+    
+    def get_circuit_breaker_stats(self) -> Dict[str, Any]:
+        """Get circuit breaker state, transitions and stale fallbacks served"""
+        stats = self._breaker.get_stats()
+        return {
+            **stats,
+            "error_count": stats["failures"],
+            "threshold": stats["failure_threshold"],
+            "stale_if_error_served": self._stale_if_error_served,
+            "stale_if_error_ttl": self._stale_if_error_ttl,
+            "read_pool": self._read_breaker.get_stats()
+        }
+    
+    def get_negative_cache_stats(self) -> Dict[str, Any]:
+        """Get counters for cached "no row" results"""
+        return {**self._negative_cache_stats, "default_ttl": self._negative_cache_ttl}
+    
+    def get_revalidation_stats(self) -> Dict[str, Any]:
+        """Get stale-while-revalidate statistics"""
+        return {
+            **self._revalidation_stats,
+            "refreshing": len(self._refreshing)
+        }
+    
+    def get_pooler_stats(self) -> Dict[str, Any]:
+        """Get pooler mode and transient retry statistics"""
+        return {
+            "pooler_mode": self._config.pooler_mode,
+            "prepared_statements": not self._config.pooler_mode,
+            "retry_limit": self._transient_retries,
+            **self._transient_retry_stats
+        }
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get saturation statistics for each connection pool"""
+        stats = {}
+        if self._pool_controller:
+            stats["primary"] = self._pool_controller.get_stats()
+        if self._read_pool_controller and self._read_pool_controller is not self._pool_controller:
+            stats["read"] = self._read_pool_controller.get_stats()
+        return stats
     
     async def get_health_report(self) -> Dict[str, Any]:
         """Get health report (optimized)"""
-        pool_stats = self._pool.get_size() if self._pool else {}
+        pool_stats = self.get_pool_stats()
+        primary = pool_stats.get("primary", {})
         
         return {
             "status": "healthy" if self._is_healthy else "unhealthy",
             "database": {
+                "backend": self._backend,
                 "host": self._config.host,
                 "port": self._config.port,
                 "database": self._config.database,
                 "user": self._config.user
             },
             "performance": {
-                "active_connections": pool_stats.get('active', 0) if isinstance(pool_stats, dict) else 0,
-                "total_connections": pool_stats.get('total', 0) if isinstance(pool_stats, dict) else 0,
+                "response_time_ms": round(self._last_health_check_ms, 2),
+                "active_connections": primary.get("in_use", 0),
+                "total_connections": primary.get("size", 0),
+                "pool_limit": primary.get("limit", 0),
                 "cache_available": redis_manager.is_connected()
             },
+            "pools": pool_stats,
+            "read_routing": {
+                "split_pools": self._read_pool is not None and self._read_pool is not self._pool,
+                "read_pool_healthy": self._read_pool_healthy,
+                **self._routing_stats
+            },
+            "circuit_breaker": self.get_circuit_breaker_stats(),
+            "pooler": self.get_pooler_stats(),
+            "single_flight": self.get_single_flight_stats(),
+            "stale_while_revalidate": self.get_revalidation_stats(),
             "last_health_check": datetime.fromtimestamp(self._last_health_check).isoformat(),
             "optimizations": {
                 "connection_pooling": True,
@@ -314,16 +1500,46 @@ class OptimizedDatabaseManager:
     # Cache management methods
     async def clear_cache(self):
         """Clear all cache"""
+        # Our own "all" message is ignored when it comes back, so drop this
+        # worker's in-process copies here
+        self._local_cache.clear()
+        redis_manager.invalidate_hot_keys()
         if self._redis:
             await self._redis.flushdb()
+            await redis_manager.publish(
+                self._invalidation_channel,
+                {"origin": self._instance_id, "all": True}
+            )
+        
+        for listener in self._cache_clear_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"Cache clear listener failed: {e}")
+    
+    def add_cache_clear_listener(self, listener: Callable[[], Any]):
+        """Call listener (e.g. the cache warmer) after every clear_cache()"""
+        self._cache_clear_listeners.append(listener)
+    
+    def add_invalidation_listener(self, listener: Callable[[Tuple[str, ...]], Any]):
+        """Call listener with the invalidated tables after every local or remote invalidation"""
+        self._invalidation_listeners.append(listener)
+    
+    def get_local_cache_stats(self) -> Dict[str, Any]:
+        """Get in-process (L1) cache statistics"""
+        return self._local_cache.get_stats()
     
     async def invalidate_blogs_cache(self):
         """Invalidate blogs-related cache"""
-        await self._invalidate_cache_pattern("db:*blogs*")
+        await self.invalidate_tables("blogs")
     
     async def invalidate_users_cache(self):
         """Invalidate users-related cache"""
-        await self._invalidate_cache_pattern("db:*users*")
+        await self.invalidate_tables("users")
+    
+    async def invalidate_jobs_cache(self):
+        """Invalidate jobs-related cache"""
+        await self.invalidate_tables("jobs")
 
 # Global optimized database manager instance
 db = OptimizedDatabaseManager() 
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Postgres Notification Listener
+Handled by: Database Team
+Purpose: Receive LISTEN/NOTIFY messages on a dedicated connection
+
+This module provides:
+- PgNotifyListener, a background task holding one connection outside the
+  pools and LISTENing on a channel
+- Automatic reconnection with backoff, and keepalive probes so a silently
+  dropped connection is noticed
+- A reconnect hook, since notifications sent while disconnected are lost
+
+LISTEN needs a session-level connection: it does not work through a
+transaction-mode pooler such as PgBouncer or Neon's -pooler endpoint.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+class PgNotifyListener:
+    def __init__(self, connect: Callable[[], Awaitable[asyncpg.Connection]], channel: str,
+                 handler: Callable[[Dict[str, Any]], Any], on_reconnect: Optional[Callable[[], Any]] = None,
+                 keepalive: float = 30.0, max_backoff: float = 30.0):
+        self.channel = channel
+        self.keepalive = keepalive  # Seconds between probes of an idle connection
+        self.max_backoff = max_backoff
+        self._connect = connect
+        self._handler = handler
+        self._on_reconnect = on_reconnect
+        self._conn: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "notifications": 0,
+            "handler_errors": 0,
+            "connects": 0,
+            "disconnects": 0
+        }
+    
+    def is_connected(self) -> bool:
+        """Whether the listening connection is currently open"""
+        return self._conn is not None and not self._conn.is_closed()
+    
+    def start(self) -> asyncio.Task:
+        """Start listening in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+    
+    async def stop(self):
+        """Stop listening and close the connection"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+    
+    async def _run(self):
+        backoff = 1.0
+        while True:
+            connects = self._stats["connects"]
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ LISTEN {self.channel} connection lost: {e}")
+            self._stats["disconnects"] += 1
+            if self._stats["connects"] > connects:
+                # Connected fine before dropping; retry promptly
+                backoff = 1.0
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+    
+    async def _listen(self):
+        terminated = asyncio.Event()
+        conn = await self._connect()
+        try:
+            conn.add_termination_listener(lambda _: terminated.set())
+            await conn.add_listener(self.channel, self._on_notification)
+            self._conn = conn
+            self._stats["connects"] += 1
+            logger.info(f"✅ Listening for {self.channel} notifications")
+            
+            if self._stats["connects"] > 1 and self._on_reconnect:
+                # Anything sent while we were disconnected was missed
+                self._call(self._on_reconnect)
+            
+            while not terminated.is_set():
+                try:
+                    await asyncio.wait_for(terminated.wait(), self.keepalive)
+                except asyncio.TimeoutError:
+                    await conn.execute("SELECT 1", timeout=self.keepalive)
+            raise ConnectionError("connection closed by server")
+        finally:
+            self._conn = None
+            if not conn.is_closed():
+                try:
+                    await asyncio.shield(conn.close(timeout=5))
+                except Exception:
+                    conn.terminate()
+    
+    def _on_notification(self, conn, pid: int, channel: str, payload: str):
+        self._stats["notifications"] += 1
+        self._stats["last_notification_at"] = time.time()
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            self._stats["handler_errors"] += 1
+            logger.error(f"Invalid {channel} notification payload: {payload[:200]}")
+            return
+        self._call(self._handler, message)
+    
+    def _call(self, callback: Callable[..., Any], *args):
+        try:
+            result = callback(*args)
+            if asyncio.iscoroutine(result):
+                task = asyncio.create_task(result)
+                task.add_done_callback(self._log_task_error)
+        except Exception as e:
+            self._stats["handler_errors"] += 1
+            logger.error(f"{self.channel} notification handler error: {e}")
+    
+    def _log_task_error(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            self._stats["handler_errors"] += 1
+            logger.error(f"{self.channel} notification handler error: {task.exception()}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection state and notification counters"""
+        return {
+            "channel": self.channel,
+            "connected": self.is_connected(),
+            **self._stats
+        }
@@ -0,0 +1,233 @@
+"""
+Adaptive Connection Pool Controller
+Handled by: Database Team
+Purpose: Pool saturation telemetry and load-based pool sizing
+
+This module provides:
+- An admission gate in front of an asyncpg pool with an adjustable limit
+- In-use, idle, waiting and timeout counters
+- Acquire-wait latency histograms
+- A background controller that grows the limit when callers queue and
+  shrinks it when connections sit idle, always within [min, max]
+
+The asyncpg pool is created with max_size set to the hard ceiling and opens
+connections lazily, so the controller's limit is the number of connections
+the worker actually holds. Idle connections above the limit are closed by
+asyncpg's max_inactive_connection_lifetime.
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, List, Optional
+
+from .metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+def _expire(waiter: asyncio.Future):
+    """Fail a queued acquire whose wait ran past its timeout"""
+    if not waiter.done():
+        waiter.set_exception(asyncio.TimeoutError())
+
+class PoolController:
+    def __init__(self, name: str, pool, min_size: int, max_size: int, initial_size: Optional[int] = None,
+                 acquire_timeout: float = 10.0, grow_wait_ms: float = 50.0,
+                 shrink_utilization: float = 0.5, shrink_after: int = 3, interval: float = 10.0):
+        self.name = name
+        self.pool = pool
+        self.min_size = min_size
+        self.max_size = max_size
+        self.limit = max(min_size, min(initial_size or max_size, max_size))
+        self.acquire_timeout = acquire_timeout
+        self.grow_wait_ms = grow_wait_ms  # Window p95 acquire wait that triggers growth
+        self.shrink_utilization = shrink_utilization  # Peak in-use fraction below which a window counts as idle
+        self.shrink_after = shrink_after  # Consecutive idle windows before shrinking
+        self.interval = interval
+        self._waiters: Deque[asyncio.Future] = deque()  # Queued callers, first come first served
+        self._in_use = 0
+        self._waiting = 0
+        self._task: Optional[asyncio.Task] = None
+        self._acquire_wait = LatencyHistogram()
+        self._window_waits: List[float] = []
+        self._window_peak = 0
+        self._window_timeouts = 0
+        self._idle_windows = 0
+        self._stats = {
+            "acquires": 0,
+            "timeouts": 0,
+            "grows": 0,
+            "shrinks": 0
+        }
+    
+    @asynccontextmanager
+    async def acquire(self, timeout: Optional[float] = None):
+        """
+        Acquire a connection once the limit allows, recording the wait.
+        
+        timeout can shorten acquire_timeout (e.g. to a request's remaining
+        budget); only waits that used the full acquire_timeout count as
+        pool timeouts.
+        """
+        start_time = time.perf_counter()
+        acquire_timeout = self.acquire_timeout if timeout is None else min(timeout, self.acquire_timeout)
+        deadline = time.monotonic() + acquire_timeout
+        self._waiting += 1
+        try:
+            await self._admit(acquire_timeout)
+        except asyncio.TimeoutError:
+            if acquire_timeout >= self.acquire_timeout:
+                self._record_timeout()
+            raise
+        finally:
+            self._waiting -= 1
+        
+        try:
+            try:
+                connection = await self.pool.acquire(timeout=max(deadline - time.monotonic(), 0.001))
+            except asyncio.TimeoutError:
+                if acquire_timeout >= self.acquire_timeout:
+                    self._record_timeout()
+                raise
+            
+            wait_ms = (time.perf_counter() - start_time) * 1000
+            self._acquire_wait.observe(wait_ms)
+            self._window_waits.append(wait_ms)
+            self._window_peak = max(self._window_peak, self._in_use)
+            self._stats["acquires"] += 1
+            try:
+                yield connection
+            finally:
+                await self.pool.release(connection)
+        finally:
+            self._release()
+    
+    async def _admit(self, timeout: float):
+        """
+        Take a slot, queueing behind earlier callers while the limit is reached.
+        
+        Slots are handed to queued callers by _release, so a caller that gives
+        up after being handed one passes it on instead of losing the wakeup.
+        """
+        if self._in_use < self.limit and not self._waiters:
+            self._in_use += 1
+            return
+        
+        # The waiter is awaited directly rather than through asyncio.wait_for,
+        # which can swallow a cancellation that arrives as the slot is handed over
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        expiry = loop.call_later(timeout, _expire, waiter)
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # Handed a slot as the caller was cancelled: give it to the next one
+                self._release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+        finally:
+            expiry.cancel()
+    
+    def _release(self):
+        """Give a slot back, synchronously so a cancelled caller can't leak it"""
+        self._in_use -= 1
+        self._wake_waiters()
+    
+    def _wake_waiters(self):
+        """Hand free slots to queued callers, skipping ones that gave up"""
+        while self._waiters and self._in_use < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_use += 1
+                waiter.set_result(None)
+    
+    def _record_timeout(self):
+        self._stats["timeouts"] += 1
+        self._window_timeouts += 1
+        logger.warning(f"⚠️ {self.name} pool acquire timed out after {self.acquire_timeout}s (limit {self.limit})")
+    
+    def start(self):
+        """Start the background sizing loop"""
+        if self._task is None and self.max_size > self.min_size:
+            self._task = asyncio.create_task(self._run())
+    
+    def stop(self):
+        """Stop the background sizing loop"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+    
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.sleep(self.interval)
+                await self.evaluate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{self.name} pool sizing failed: {e}")
+    
+    async def evaluate(self) -> int:
+        """
+        Adjust the limit from the last window's acquire waits and utilization.
+        
+        Grows by a quarter when acquires timed out, callers are still queued,
+        or the window's p95 wait exceeded grow_wait_ms. Shrinks by a quarter
+        after shrink_after windows whose peak in-use stayed under
+        shrink_utilization of the limit, never below that peak.
+        """
+        waits = sorted(self._window_waits)
+        p95_wait = waits[max(0, math.ceil(len(waits) * 0.95) - 1)] if waits else 0.0
+        peak = max(self._window_peak, self._in_use)
+        saturated = self._window_timeouts > 0 or self._waiting > 0 or p95_wait > self.grow_wait_ms
+        
+        step = max(1, self.limit // 4)
+        new_limit = self.limit
+        if saturated:
+            self._idle_windows = 0
+            new_limit = min(self.max_size, self.limit + step)
+        elif peak < self.limit * self.shrink_utilization:
+            self._idle_windows += 1
+            if self._idle_windows >= self.shrink_after:
+                self._idle_windows = 0
+                new_limit = max(self.min_size, peak + 1, self.limit - step)
+        else:
+            self._idle_windows = 0
+        
+        self._window_waits = []
+        self._window_peak = self._in_use
+        self._window_timeouts = 0
+        
+        if new_limit != self.limit:
+            direction = "grows" if new_limit > self.limit else "shrinks"
+            self._stats[direction] += 1
+            logger.info(f"🔧 {self.name} pool limit {self.limit} -> {new_limit} (p95 wait {p95_wait:.1f}ms, peak in use {peak})")
+            self.limit = new_limit
+            self._wake_waiters()
+        return self.limit
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool saturation statistics"""
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        return {
+            "size": size,
+            "idle": idle,
+            "in_use": self._in_use,
+            "waiting": self._waiting,
+            "limit": self.limit,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "utilization_percent": round(self._in_use / self.limit * 100, 2) if self.limit else 0,
+            "adaptive": self._task is not None,
+            **self._stats,
+            "acquire_wait": self._acquire_wait.snapshot()
+        }
@@ -19,6 +19,7 @@ from typing import Optional, Dict, Any
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from .circuit_breaker import CircuitBreaker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -60,9 +61,11 @@ class ProductionDatabaseManager:
             last_check=datetime.now(),
             error_count=0
         )
-        self._circuit_breaker_open = False
-        self._circuit_breaker_threshold = 5
-        self._circuit_breaker_timeout = 60  # seconds
+        self._circuit_breaker = CircuitBreaker(
+            "production_database",
+            failure_threshold=5,
+            reset_timeout=60  # seconds
+        )
         
     def _load_config(self) -> DatabaseConfig:
         """Load database configuration from environment"""
@@ -122,19 +125,17 @@ class ProductionDatabaseManager:
                 result = await conn.fetchval("SELECT 1")
                 
                 # Get connection pool stats
-                pool_stats = self._pool.get_size()
+                total_connections = self._pool.get_size()
                 
                 # Update health status
                 self._health_status.is_healthy = True
                 self._health_status.response_time_ms = (time.time() - start_time) * 1000
-                self._health_status.active_connections = pool_stats['active']
-                self._health_status.total_connections = pool_stats['total']
+                self._health_status.active_connections = total_connections - self._pool.get_idle_size()
+                self._health_status.total_connections = total_connections
                 self._health_status.last_check = datetime.now()
                 
-                # Reset circuit breaker if healthy
-                if self._circuit_breaker_open:
-                    self._circuit_breaker_open = False
-                    logger.info("🔄 Circuit breaker closed - database is healthy")
+                # Close the circuit breaker if healthy
+                self._circuit_breaker.reset()
                 
                 return True
                 
@@ -144,10 +145,8 @@ class ProductionDatabaseManager:
             self._health_status.last_error = str(e)
             self._health_status.last_check = datetime.now()
             
-            # Check circuit breaker
-            if self._health_status.error_count >= self._circuit_breaker_threshold:
-                self._circuit_breaker_open = True
-                logger.error(f"🚨 Circuit breaker opened - too many errors: {e}")
+            # Count towards opening the circuit breaker
+            self._circuit_breaker.record_failure(e)
             
             return False
     
@@ -160,14 +159,27 @@ class ProductionDatabaseManager:
     @asynccontextmanager
     async def get_connection(self):
         """Get database connection with health check"""
-        if self._circuit_breaker_open:
-            raise Exception("Circuit breaker is open - database unavailable")
-        
-        if not self._health_status.is_healthy:
-            await self._health_check()
+        # Raises CircuitOpenError while open; lets a probe through once half-open
+        self._circuit_breaker.before_call()
         
-        async with self._pool.acquire() as connection:
-            yield connection
+        try:
+            if not self._health_status.is_healthy:
+                await self._health_check()
+            
+            async with self._pool.acquire() as connection:
+                yield connection
+        except (OSError, asyncio.TimeoutError, asyncpg.PostgresConnectionError) as e:
+            self._circuit_breaker.record_failure(e)
+            raise
+        except Exception:
+            # The database answered, so it is reachable
+            self._circuit_breaker.record_success()
+            raise
+        except BaseException:
+            self._circuit_breaker.release()
+            raise
+        else:
+            self._circuit_breaker.record_success()
     
     async def execute(self, query: str, *args):
         """Execute a query with error handling"""
@@ -227,9 +239,9 @@ class ProductionDatabaseManager:
                 "total_connections": self._health_status.total_connections
             },
             "circuit_breaker": {
-                "open": self._circuit_breaker_open,
+                **self._circuit_breaker.get_stats(),
                 "error_count": self._health_status.error_count,
-                "threshold": self._circuit_breaker_threshold
+                "threshold": self._circuit_breaker.failure_threshold
             },
             "last_check": self._health_status.last_check.isoformat(),
             "last_error": self._health_status.last_error
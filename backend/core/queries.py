@@ -0,0 +1,254 @@
+"""
+Named Query Registry
+Handled by: Database Team
+Purpose: Central catalogue of the SQL used by endpoints and services
+
+This module provides:
+- One place to find and review every hot query
+- Names used to prepare statements on each new pool connection
+- Per-query timing for monitoring
+
+Endpoints pass the registered NamedQuery objects straight to db.fetch*,
+for example ``await db.fetch(queries.BLOGS_LIST, limit, offset)``.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+@dataclass(frozen=True)
+class NamedQuery:
+    """A registered SQL statement"""
+    name: str
+    sql: str
+    prepare: bool = True  # Prepare on every new pool connection
+
+class QueryRegistry:
+    def __init__(self):
+        self._queries: Dict[str, NamedQuery] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+    
+    def register(self, name: str, sql: str, prepare: bool = True) -> NamedQuery:
+        """Register a query under a unique name"""
+        if name in self._queries:
+            raise ValueError(f"Query '{name}' is already registered")
+        
+        query = NamedQuery(name=name, sql=sql, prepare=prepare)
+        self._queries[name] = query
+        self._stats[name] = {
+            "calls": 0,
+            "errors": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0,
+            "prepares": 0,
+            "prepare_ms": 0.0
+        }
+        return query
+    
+    def get(self, name: str) -> NamedQuery:
+        """Look up a query by name"""
+        try:
+            return self._queries[name]
+        except KeyError:
+            raise KeyError(f"Unknown query '{name}'") from None
+    
+    def all(self) -> List[NamedQuery]:
+        """All registered queries"""
+        return list(self._queries.values())
+    
+    def preparable(self) -> List[NamedQuery]:
+        """Queries to prepare on each new connection"""
+        return [query for query in self._queries.values() if query.prepare]
+    
+    def record_call(self, name: str, duration_ms: float, error: bool = False):
+        """Record the execution time of a named query"""
+        stats = self._stats[name]
+        stats["calls"] += 1
+        stats["total_ms"] += duration_ms
+        stats["max_ms"] = max(stats["max_ms"], duration_ms)
+        if error:
+            stats["errors"] += 1
+    
+    def record_prepare(self, name: str, duration_ms: float):
+        """Record the time spent preparing a named query on a connection"""
+        stats = self._stats[name]
+        stats["prepares"] += 1
+        stats["prepare_ms"] += duration_ms
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-query timing statistics"""
+        report = {}
+        for name, stats in self._stats.items():
+            calls = stats["calls"]
+            prepares = stats["prepares"]
+            report[name] = {
+                "calls": calls,
+                "errors": stats["errors"],
+                "avg_ms": round(stats["total_ms"] / calls, 2) if calls else 0,
+                "max_ms": round(stats["max_ms"], 2),
+                "prepares": prepares,
+                "avg_prepare_ms": round(stats["prepare_ms"] / prepares, 2) if prepares else 0
+            }
+        return report
+
+# Global query registry instance
+registry = QueryRegistry()
+
+# Blogs
+# Listing previews never show content, so it is not fetched
+BLOGS_LIST = registry.register("blogs.list", """
+    SELECT id, title, author, image, created_at, tags, slug, avatar, date
+    FROM blogs
+    ORDER BY created_at DESC
+    LIMIT $1 OFFSET $2
+""")
+
+BLOGS_COUNT = registry.register("blogs.count", """
+    SELECT COUNT(*) as total
+    FROM blogs
+""")
+
+BLOGS_BY_ID = registry.register("blogs.by_id", """
+    SELECT id, title, author, content, image, created_at, tags, slug, avatar, date
+    FROM blogs
+    WHERE id = $1
+""")
+
+BLOGS_BY_SLUG = registry.register("blogs.by_slug", """
+    SELECT id, title, author, content, image, created_at, tags, slug, avatar, date
+    FROM blogs
+    WHERE slug = $1
+""")
+
+BLOGS_INSERT = registry.register("blogs.insert", """
+    INSERT INTO blogs (title, author, content, image, tags, slug, avatar, date)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+    RETURNING id
+""")
+
+# Bulk inserts of generated posts: a slug taken meanwhile skips that row
+# instead of failing the whole batch
+BLOGS_INSERT_IF_NEW = registry.register("blogs.insert_if_new", """
+    INSERT INTO blogs (title, author, content, image, tags, slug, avatar, date)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+    ON CONFLICT (slug) DO NOTHING
+""")
+
+# Ids of rows written by a bulk insert, which does not return them; the
+# content hash tells our rows from ones a concurrent writer inserted
+BLOGS_IDS_BY_SLUGS = registry.register("blogs.ids_by_slugs", """
+    SELECT id, slug, md5(content) AS content_md5 FROM blogs WHERE slug = ANY($1::text[])
+""")
+
+# Not prepared: view_count is missing from older schemas and these are best effort
+BLOGS_INCREMENT_VIEWS_BY_ID = registry.register("blogs.increment_views_by_id", """
+    UPDATE blogs SET view_count = COALESCE(view_count, 0) + 1 WHERE id = $1
+""", prepare=False)
+
+BLOGS_INCREMENT_VIEWS_BY_SLUG = registry.register("blogs.increment_views_by_slug", """
+    UPDATE blogs SET view_count = COALESCE(view_count, 0) + 1 WHERE slug = $1
+""", prepare=False)
+
+# Most viewed posts, used to warm their pages; not prepared for the same reason
+BLOGS_TOP_VIEWED_IDS = registry.register("blogs.top_viewed_ids", """
+    SELECT id FROM blogs ORDER BY view_count DESC NULLS LAST, created_at DESC LIMIT $1
+""", prepare=False)
+
+BLOGS_TOP_VIEWED_SLUGS = registry.register("blogs.top_viewed_slugs", """
+    SELECT slug FROM blogs WHERE slug IS NOT NULL ORDER BY view_count DESC NULLS LAST, created_at DESC LIMIT $1
+""", prepare=False)
+
+# Every slug, streamed to build the known-slug Bloom filter
+BLOGS_ALL_SLUGS = registry.register("blogs.all_slugs", """
+    SELECT slug FROM blogs WHERE slug IS NOT NULL
+""")
+
+BLOGS_RECENT_FOR_FEED = registry.register("blogs.recent_for_feed", """
+    SELECT id, title, content, created_at
+    FROM blogs
+    ORDER BY created_at DESC
+    LIMIT $1
+""")
+
+BLOGS_FOR_SITEMAP = registry.register("blogs.for_sitemap", """
+    SELECT id, created_at
+    FROM blogs
+    ORDER BY created_at DESC
+""")
+
+BLOGS_EXPORT = registry.register("blogs.export", """
+    SELECT id, title, author, content, image, created_at, tags, slug, avatar, date
+    FROM blogs
+    ORDER BY id
+""")
+
+# Users
+# Creates the user and their progress row in one statement; no row means the email is taken
+USERS_REGISTER = registry.register("users.register", """
+    WITH new_user AS (
+        INSERT INTO users (email, name, role, skills, target_roles, created_at, updated_at)
+        VALUES ($1, $2, $3, $4, $5, NOW(), NOW())
+        ON CONFLICT (email) DO NOTHING
+        RETURNING id
+    ), new_progress AS (
+        INSERT INTO user_progress (user_id, resume_score, aptitude_tests_completed, dsa_questions_solved, interviews_practiced, updated_at)
+        SELECT id, 0, 0, 0, 0, NOW() FROM new_user
+    )
+    SELECT id FROM new_user
+""")
+
+USERS_PROFILE = registry.register("users.profile", """
+    SELECT id, email, name, role, skills, target_roles, created_at, updated_at
+    FROM users
+    WHERE id = $1
+""")
+
+USER_PROGRESS_BY_USER = registry.register("user_progress.by_user", """
+    SELECT up.resume_score, up.aptitude_tests_completed, up.dsa_questions_solved, up.interviews_practiced, up.updated_at
+    FROM user_progress up
+    JOIN users u ON up.user_id = u.id
+    WHERE u.id = $1
+""")
+
+# Updates the score and reports whether the user exists in one statement
+USER_PROGRESS_UPDATE_RESUME_SCORE = registry.register("user_progress.update_resume_score", """
+    WITH target AS (
+        SELECT id FROM users WHERE id = $2
+    ), updated AS (
+        UPDATE user_progress SET resume_score = $1, updated_at = NOW()
+        WHERE user_id IN (SELECT id FROM target)
+        RETURNING user_id
+    )
+    SELECT EXISTS (SELECT 1 FROM target) AS user_exists, (SELECT COUNT(*) FROM updated) AS updated
+""")
+
+# Analytics
+ANALYTICS_INSERT_EVENT = registry.register("analytics.insert_event", """
+    INSERT INTO analytics_events (event_type, user_id, data, timestamp, session_id, page_url, user_agent)
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+""")
+
+ANALYTICS_USER_METRICS = registry.register("analytics.user_metrics", """
+    SELECT
+        COUNT(*) as total_events,
+        COUNT(DISTINCT session_id) as total_sessions,
+        MIN(timestamp) as first_visit,
+        MAX(timestamp) as last_visit
+    FROM analytics_events
+    WHERE user_id = $1
+""")
+
+ANALYTICS_PAGE_METRICS = registry.register("analytics.page_metrics", """
+    SELECT
+        COUNT(*) as page_views,
+        COUNT(DISTINCT user_id) as unique_users,
+        COUNT(DISTINCT session_id) as unique_sessions
+    FROM analytics_events
+    WHERE page_url = $1
+    AND timestamp >= NOW() - make_interval(days => $2)
+""")
+
+ANALYTICS_EXPORT = registry.register("analytics.export", """
+    SELECT event_type, user_id, data, timestamp, session_id, page_url, user_agent
+    FROM analytics_events
+    WHERE timestamp >= NOW() - make_interval(days => $1)
+    ORDER BY timestamp
+""")
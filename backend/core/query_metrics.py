@@ -0,0 +1,183 @@
+"""
+Query Fingerprint Telemetry
+Handled by: Database Team
+Purpose: Find slow and hot SQL by normalized statement shape
+
+This module provides:
+- Query fingerprinting (literals stripped, whitespace collapsed)
+- Per-fingerprint call counts, cache hit ratio, rows returned,
+  execution latency and pool-acquire wait histograms
+- A bounded slow-query log with optional EXPLAIN plans
+
+Parameter values are never stored, only the normalized SQL, so the
+report is safe to expose on the monitoring endpoints.
+"""
+import hashlib
+import re
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from .metrics import LatencyHistogram
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMERIC_LITERAL = re.compile(r"(?<![$\w.])\d+(?:\.\d+)?\b")  # Not $1 placeholders or identifiers
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|\$\d+)\s*,)+\s*(?:\?|\$\d+)\s*\)", re.IGNORECASE)
+
+@lru_cache(maxsize=2048)
+def fingerprint_query(query: str) -> str:
+    """Normalize a statement so executions differing only in literals group together"""
+    fingerprint = _STRING_LITERAL.sub("?", query)
+    fingerprint = _NUMERIC_LITERAL.sub("?", fingerprint)
+    fingerprint = _IN_LIST.sub("IN (...)", fingerprint)
+    return " ".join(fingerprint.split())
+
+def fingerprint_id(fingerprint: str) -> str:
+    """Short stable identifier for a fingerprint"""
+    return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+class FingerprintStats:
+    """Counters and histograms for one query fingerprint"""
+    def __init__(self, fingerprint: str, name: Optional[str] = None):
+        self.fingerprint = fingerprint
+        self.name = name
+        self.calls = 0
+        self.executions = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.rows = 0
+        self.slow = 0
+        self.latency = LatencyHistogram()
+        self.acquire_wait = LatencyHistogram()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Report for the monitoring endpoint"""
+        cache_lookups = self.cache_hits + self.cache_misses
+        return {
+            "id": fingerprint_id(self.fingerprint),
+            "name": self.name,
+            "query": self.fingerprint,
+            "calls": self.calls,
+            "executions": self.executions,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_ratio": round(self.cache_hits / cache_lookups, 4) if cache_lookups else None,
+            "rows_returned": self.rows,
+            "avg_rows": round(self.rows / self.executions, 2) if self.executions else 0,
+            "slow_executions": self.slow,
+            "total_ms": round(self.latency.total_ms, 2),
+            "latency": self.latency.snapshot(),
+            "acquire_wait": self.acquire_wait.snapshot()
+        }
+
+class QueryMetrics:
+    def __init__(self, slow_query_ms: float = 500, slow_log_size: int = 100,
+                 max_fingerprints: int = 500, explain_interval: float = 600):
+        self.slow_query_ms = slow_query_ms
+        self.max_fingerprints = max_fingerprints
+        self.explain_interval = explain_interval  # Seconds between plans for one fingerprint
+        self._fingerprints: Dict[str, FingerprintStats] = {}
+        self._slow_log = deque(maxlen=slow_log_size)
+        self._last_explain: Dict[str, float] = {}
+        self._dropped = 0
+    
+    def _stats_for(self, query: str, name: Optional[str]) -> Optional[FingerprintStats]:
+        """Find or create the stats for a query, bounded by max_fingerprints"""
+        fingerprint = fingerprint_query(query)
+        stats = self._fingerprints.get(fingerprint)
+        if stats is None:
+            if len(self._fingerprints) >= self.max_fingerprints:
+                self._dropped += 1
+                return None
+            stats = self._fingerprints[fingerprint] = FingerprintStats(fingerprint, name)
+        return stats
+    
+    def record_call(self, query: str, name: Optional[str] = None, cache_hit: Optional[bool] = None):
+        """Record one call made by application code, with its cache outcome if cached"""
+        stats = self._stats_for(query, name)
+        if stats is None:
+            return
+        
+        stats.calls += 1
+        if cache_hit is True:
+            stats.cache_hits += 1
+        elif cache_hit is False:
+            stats.cache_misses += 1
+    
+    def record_execution(self, query: str, duration_ms: float, rows: int = 0, acquire_ms: float = 0.0,
+                         error: bool = False, name: Optional[str] = None) -> bool:
+        """Record one database round trip; returns True when it was slow"""
+        stats = self._stats_for(query, name)
+        is_slow = duration_ms >= self.slow_query_ms
+        if stats is None:
+            return is_slow
+        
+        stats.executions += 1
+        stats.rows += rows
+        stats.latency.observe(duration_ms)
+        stats.acquire_wait.observe(acquire_ms)
+        if error:
+            stats.errors += 1
+        if is_slow:
+            stats.slow += 1
+        return is_slow
+    
+    def log_slow_query(self, query: str, duration_ms: float, rows: int, acquire_ms: float,
+                       name: Optional[str] = None) -> Dict[str, Any]:
+        """Append a slow execution to the log and return its entry"""
+        fingerprint = fingerprint_query(query)
+        entry = {
+            "id": fingerprint_id(fingerprint),
+            "name": name,
+            "query": fingerprint,
+            "duration_ms": round(duration_ms, 2),
+            "rows": rows,
+            "acquire_ms": round(acquire_ms, 2),
+            "timestamp": time.time(),
+            "plan": None
+        }
+        self._slow_log.append(entry)
+        return entry
+    
+    def should_explain(self, query: str) -> bool:
+        """Rate-limit plan captures to one per fingerprint per explain_interval"""
+        fingerprint = fingerprint_query(query)
+        now = time.monotonic()
+        last = self._last_explain.get(fingerprint)
+        if last is not None and now - last < self.explain_interval:
+            return False
+        self._last_explain[fingerprint] = now
+        return True
+    
+    def get_stats(self, sort_by: str = "total_ms", limit: int = 50) -> List[Dict[str, Any]]:
+        """Fingerprint reports, heaviest first"""
+        reports = [stats.to_dict() for stats in self._fingerprints.values()]
+        if sort_by in ("p50_ms", "p95_ms", "p99_ms", "max_ms"):
+            key = lambda report: report["latency"][sort_by] or 0
+        else:
+            key = lambda report: report.get(sort_by) or 0
+        reports.sort(key=key, reverse=True)
+        return reports[:limit]
+    
+    def get_slow_queries(self) -> List[Dict[str, Any]]:
+        """Slow-query log, newest first"""
+        return list(reversed(self._slow_log))
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Collector-level counters"""
+        return {
+            "fingerprints": len(self._fingerprints),
+            "dropped_fingerprints": self._dropped,
+            "slow_query_ms": self.slow_query_ms,
+            "slow_log_entries": len(self._slow_log)
+        }
+    
+    def reset(self):
+        """Forget all collected statistics"""
+        self._fingerprints.clear()
+        self._slow_log.clear()
+        self._last_explain.clear()
+        self._dropped = 0
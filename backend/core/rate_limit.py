@@ -0,0 +1,244 @@
+"""
+Rate Limiting
+Handled by: Backend Team
+Purpose: Shed bursts on expensive endpoints before they queue up
+
+This module provides:
+- RateLimitPolicy, a per-route limit applied per client or shared by all
+  clients of the route
+- Sliding-window and token-bucket limits, run atomically in Redis by Lua
+  scripts so every worker shares one count
+- An in-process limiter used while Redis is unavailable
+- RateLimitMiddleware, which answers requests over a limit with 429 and a
+  Retry-After header
+
+The sliding window is the usual two-window estimate: the previous fixed
+window's count, weighted by how much of it still overlaps the sliding
+window, plus the current window's count. The step functions below are the
+Python form of the Lua scripts in redis_manager; the in-process limiter and
+the in-memory Redis backend both use them.
+"""
+import json
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .redis_manager import redis_manager
+
+logger = logging.getLogger(__name__)
+
+SLIDING_WINDOW = "sliding_window"
+TOKEN_BUCKET = "token_bucket"
+
+# (allowed, remaining, retry after in milliseconds)
+Decision = Tuple[bool, int, int]
+
+_config: Dict[str, Any] = {"enabled": False, "policies": []}
+_stats = {
+    "checked": 0,
+    "limited": 0,
+    "fallback": 0
+}
+_limited_by_policy: Dict[str, int] = {}
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """
+    Limit requests to a path prefix to limit per window_seconds.
+    
+    per_client policies count each client separately; others are one quota
+    shared by every client of the route. Token buckets allow bursts of up
+    to limit and refill at limit per window_seconds.
+    """
+    prefix: str
+    limit: int
+    window_seconds: float = 60.0
+    algorithm: str = SLIDING_WINDOW
+    per_client: bool = True
+    methods: Tuple[str, ...] = ("POST",)
+    
+    @property
+    def name(self) -> str:
+        scope = "client" if self.per_client else "global"
+        return f"{self.prefix}:{scope}"
+    
+    def matches(self, method: str, path: str) -> bool:
+        return method in self.methods and path.startswith(self.prefix)
+
+def sliding_window_step(state: Optional[Dict[str, float]], now_ms: float, limit: int, window_ms: float,
+                        cost: int = 1) -> Tuple[Dict[str, float], Decision]:
+    """Apply one request to sliding-window state {w: window index, c: current count, p: previous count}"""
+    index = math.floor(now_ms / window_ms)
+    state = state or {}
+    current, previous = state.get("c", 0), state.get("p", 0)
+    if state.get("w") == index - 1:
+        current, previous = 0, current
+    elif state.get("w") != index:
+        current, previous = 0, 0
+    
+    elapsed = now_ms - index * window_ms
+    estimate = previous * (window_ms - elapsed) / window_ms + current
+    if estimate + cost > limit:
+        if previous > 0 and current + cost <= limit:
+            # Wait for enough of the previous window to slide out
+            wait = window_ms - elapsed - (limit - current - cost) * window_ms / previous
+        else:
+            # Wait for the next window, then for this one to slide out enough
+            wait = window_ms - elapsed
+            if current > 0:
+                wait += max(0, window_ms - (limit - cost) * window_ms / current)
+        return {"w": index, "c": current, "p": previous}, (False, 0, max(1, math.ceil(wait)))
+    
+    return {"w": index, "c": current + cost, "p": previous}, (True, math.floor(limit - estimate - cost), 0)
+
+def token_bucket_step(state: Optional[Dict[str, float]], now_ms: float, capacity: int, refill_per_second: float,
+                      cost: int = 1) -> Tuple[Dict[str, float], Decision]:
+    """Apply one request to token-bucket state {t: tokens, ts: last update in ms}"""
+    state = state or {}
+    tokens = state.get("t", capacity)
+    last = state.get("ts", now_ms)
+    tokens = min(capacity, tokens + max(0, now_ms - last) * refill_per_second / 1000)
+    if tokens >= cost:
+        return {"t": tokens - cost, "ts": now_ms}, (True, math.floor(tokens - cost), 0)
+    wait = math.ceil((cost - tokens) * 1000 / refill_per_second)
+    return {"t": tokens, "ts": now_ms}, (False, 0, wait)
+
+class LocalRateLimiter:
+    """
+    In-process limiter used while Redis is unavailable.
+    
+    Each worker only sees its own requests, so limits are divided between
+    WEB_CONCURRENCY workers. At most max_keys clients are tracked; the least
+    recently seen are forgotten first.
+    """
+    def __init__(self, max_keys: int = 10000, workers: int = 1):
+        self._max_keys = max_keys
+        self._workers = max(1, workers)
+        self._states: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+    
+    def check(self, key: str, policy: RateLimitPolicy) -> Decision:
+        limit = max(1, policy.limit // self._workers)
+        now_ms = time.monotonic() * 1000
+        state = self._states.pop(key, None)
+        if policy.algorithm == TOKEN_BUCKET:
+            state, decision = token_bucket_step(state, now_ms, limit, limit / policy.window_seconds)
+        else:
+            state, decision = sliding_window_step(state, now_ms, limit, policy.window_seconds * 1000)
+        self._states[key] = state
+        while len(self._states) > self._max_keys:
+            self._states.popitem(last=False)
+        return decision
+    
+    def size(self) -> int:
+        return len(self._states)
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing rate-limit policies before requests reach the app.
+    
+    Every policy matching a request is checked, so a route can have both a
+    per-client and a global limit. Clients are identified by their address;
+    with trust_proxy the first X-Forwarded-For entry is used instead. Redis
+    checks that take longer than redis_timeout seconds, or fail, fall back
+    to the in-process limiter rather than delaying the request.
+    """
+    def __init__(self, app, policies: Sequence[RateLimitPolicy] = (), enabled: bool = True,
+                 trust_proxy: bool = False, redis_timeout: float = 0.1):
+        self.app = app
+        self.policies = list(policies)
+        self.enabled = enabled
+        self.trust_proxy = trust_proxy
+        self.redis_timeout = redis_timeout
+        self.local = LocalRateLimiter(workers=int(os.getenv('WEB_CONCURRENCY', '1')))
+        _config.update(
+            enabled=enabled,
+            policies=[
+                {"name": policy.name, "limit": policy.limit, "window_seconds": policy.window_seconds,
+                 "algorithm": policy.algorithm}
+                for policy in self.policies
+            ]
+        )
+    
+    def client_id(self, scope) -> str:
+        if self.trust_proxy:
+            for name, value in scope.get("headers", ()):
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+    
+    async def check(self, policy: RateLimitPolicy, client: str) -> Decision:
+        key = f"ratelimit:{policy.algorithm}:{policy.prefix}:{client if policy.per_client else '*'}"
+        if policy.algorithm == TOKEN_BUCKET:
+            decision = await redis_manager.token_bucket(
+                key, policy.limit, policy.limit / policy.window_seconds, timeout=self.redis_timeout
+            )
+        else:
+            decision = await redis_manager.sliding_window(
+                key, policy.limit, int(policy.window_seconds * 1000), timeout=self.redis_timeout
+            )
+        if decision is None:
+            _stats["fallback"] += 1
+            decision = self.local.check(key, policy)
+        return decision
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+        
+        policies = [policy for policy in self.policies if policy.matches(scope["method"], scope["path"])]
+        if not policies:
+            await self.app(scope, receive, send)
+            return
+        
+        client = self.client_id(scope)
+        _stats["checked"] += 1
+        decisions: List[Tuple[RateLimitPolicy, Decision]] = []
+        for policy in policies:
+            decision = await self.check(policy, client)
+            decisions.append((policy, decision))
+            if not decision[0]:
+                await self._reject(policy, decision, client, send)
+                return
+        
+        # Report the policy closest to its limit
+        policy, (_, remaining, _) = min(decisions, key=lambda item: item[1][1])
+        headers = [
+            (b"x-ratelimit-limit", str(policy.limit).encode()),
+            (b"x-ratelimit-remaining", str(remaining).encode())
+        ]
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), *headers]}
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+    
+    async def _reject(self, policy: RateLimitPolicy, decision: Decision, client: str, send):
+        _stats["limited"] += 1
+        _limited_by_policy[policy.name] = _limited_by_policy.get(policy.name, 0) + 1
+        retry_after = max(1, math.ceil(decision[2] / 1000))
+        logger.warning(f"⚠️ Rate limit {policy.name} exceeded by {client}, retry in {retry_after}s")
+        body = json.dumps({"detail": f"Rate limit exceeded, retry in {retry_after} seconds"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+                (b"x-ratelimit-limit", str(policy.limit).encode()),
+                (b"x-ratelimit-remaining", b"0")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+def get_rate_limit_stats() -> Dict[str, Any]:
+    """Rate-limit policies, counters and 429s by policy"""
+    return {**_config, **_stats, "limited_by_policy": dict(_limited_by_policy)}
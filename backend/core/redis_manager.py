@@ -9,15 +9,42 @@ This module provides:
 - Cache invalidation patterns
 - Performance monitoring
 - Fallback mechanisms
+- Cache reads and fills bounded by the request deadline (see deadline.py);
+  deletes and invalidations always run to completion
+- Pattern operations built on SCAN, UNLINK and MGET batches, never KEYS,
+  so no single command blocks Redis for long however large the keyspace
+- Multi-key get_many/set_many in one round trip, and an opt-in auto-batcher
+  merging concurrent get() calls into one MGET (REDIS_AUTO_BATCH)
+- Round trips counted per request (see round_trips.py)
+- Atomic fixed-window, sliding-window and token-bucket rate limits in Lua
+  (see rate_limit.py)
+- Hits, misses, sets and bytes per key namespace and query tag, and latency
+  histograms per command, published to Redis for a cross-worker view
+  (see cache_stats.py)
+- Hot-key detection: reads are sampled into a count-min sketch, the top-K
+  keys are reported, and keys read often enough are served from process
+  memory for a short TTL (see hot_keys.py)
+
+Values are stored through CacheCodec (see cache_codec.py), so datetimes,
+dates, Decimals and UUIDs come back with their original types.
 """
 import redis.asyncio as redis
 import json
+import math
 import os
 import logging
 import time
-from typing import Optional, Any, Dict, List
+import asyncio
+import socket
+import uuid
+from typing import Optional, Any, Dict, List, Callable, AsyncIterator, Iterable, Tuple, Awaitable, Sequence
 from datetime import datetime, date
 from dotenv import load_dotenv
+from .cache_codec import CacheCodec
+from .cache_stats import KeyspaceStats, CommandLatency, merge_raw
+from .hot_keys import HotKeyTracker
+from .deadline import with_deadline
+from . import round_trips
 
 # Load environment variables
 load_dotenv()
@@ -25,6 +52,78 @@ load_dotenv()
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Deletes a lease only while it still holds the caller's token
+RELEASE_LEASE_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) else return 0 end"
+)
+
+# Fixed-window counter: the expiry is set once per window, not pushed back on every hit
+FIXED_WINDOW_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if redis.call('PTTL', KEYS[1]) < 0 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+# Sliding-window estimate over two fixed windows (see rate_limit.sliding_window_step).
+# ARGV: limit, window ms, cost. Returns {allowed, remaining, retry after ms}.
+SLIDING_WINDOW_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local limit, window, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local index = math.floor(now / window)
+local state = redis.call('HMGET', KEYS[1], 'w', 'c', 'p')
+local stored, current, previous = tonumber(state[1]), tonumber(state[2]) or 0, tonumber(state[3]) or 0
+if stored == index - 1 then
+    previous, current = current, 0
+elseif stored ~= index then
+    previous, current = 0, 0
+end
+local elapsed = now - index * window
+local estimate = previous * (window - elapsed) / window + current
+if estimate + cost > limit then
+    local wait
+    if previous > 0 and current + cost <= limit then
+        wait = window - elapsed - (limit - current - cost) * window / previous
+    else
+        wait = window - elapsed
+        if current > 0 then
+            wait = wait + math.max(0, window - (limit - cost) * window / current)
+        end
+    end
+    return {0, 0, math.max(1, math.ceil(wait))}
+end
+redis.call('HSET', KEYS[1], 'w', index, 'c', current + cost, 'p', previous)
+redis.call('PEXPIRE', KEYS[1], window * 2)
+return {1, math.floor(limit - estimate - cost), 0}
+"""
+
+# Token bucket (see rate_limit.token_bucket_step).
+# ARGV: capacity, refill per second, cost, idle expiry ms. Returns {allowed, remaining, retry after ms}.
+TOKEN_BUCKET_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local capacity, rate, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local last = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * rate / 1000)
+local allowed, wait = 0, 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = math.ceil((cost - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return {allowed, allowed == 1 and math.floor(tokens) or 0, wait}
+"""
+
+_MISSING = object()
+
 class DateTimeEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle datetime objects"""
     def default(self, obj):
@@ -36,22 +135,68 @@ class RedisManager:
     def __init__(self):
         self._redis: Optional[redis.Redis] = None
         self._is_connected = False
+        self._tag_ttl = 86400  # Tag index sets outlive any single cache entry
+        self._subscriber_tasks: List[asyncio.Task] = []
+        self._scripts: Dict[str, Any] = {}  # Registered Lua scripts, by source
+        self._scan_count = int(os.getenv('REDIS_SCAN_COUNT', '500'))  # Keys per SCAN, UNLINK and MGET batch
+        self._scan_page_calls = 10  # SCAN calls made at most for one page of keys
+        # Auto-batching: get() calls made in the same event loop tick share one MGET
+        self._auto_batch = os.getenv('REDIS_AUTO_BATCH', 'false').lower() == 'true'
+        self._batch_pending: Dict[str, List[asyncio.Future]] = {}
+        self._batch_requests: Dict[int, Dict[str, int]] = {}  # Round-trip counters of the waiting requests
+        self._batch_tasks = set()
+        self._batch_stats = {
+            "batches": 0,
+            "gets": 0,
+            "keys": 0,
+            "max_keys": 0
+        }
+        self._codec = CacheCodec(
+            serializer=os.getenv('REDIS_CACHE_CODEC', 'auto'),
+            compression=os.getenv('REDIS_CACHE_COMPRESSION', 'auto'),
+            compress_threshold=int(os.getenv('REDIS_COMPRESS_THRESHOLD', '1024'))
+        )
         self._cache_stats = {
             "hits": 0,
             "misses": 0,
             "sets": 0,
             "deletes": 0
         }
+        self._keyspace = KeyspaceStats()
+        self._command_latency = CommandLatency()
+        # Each worker publishes its raw counters here for get_cluster_metrics()
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._metrics_interval = int(os.getenv('REDIS_METRICS_PUBLISH_SECONDS', '15'))  # 0 disables publishing
+        self._next_metrics_publish = 0.0
+        self._metrics_task: Optional[asyncio.Task] = None
+        # Hot keys: keys read at least REDIS_HOT_KEY_MIN_RPS times a second are
+        # kept in process for REDIS_HOT_KEY_TTL seconds; other workers' writes
+        # can take that long to show
+        self._hot_keys = HotKeyTracker(
+            min_rps=float(os.getenv('REDIS_HOT_KEY_MIN_RPS', '50')),
+            sample_rate=float(os.getenv('REDIS_HOT_KEY_SAMPLE_RATE', '0.25')),
+            top_k=int(os.getenv('REDIS_HOT_KEY_TOP_K', '20'))
+        )
+        self._hot_key_ttl = float(os.getenv('REDIS_HOT_KEY_TTL', '2'))  # 0 disables promotion
+        self._hot_cache = None  # LocalCache, created by initialize()
+        self._hot_key_stats = {
+            "local_hits": 0,
+            "promotions": 0
+        }
         
     async def initialize(self):
         """Initialize Redis connection"""
         try:
             # Check for REDIS_URL first (Render/Cloud standard)
             redis_url = os.getenv('REDIS_URL')
-            if redis_url:
+            if os.getenv('REDIS_BACKEND', 'redis').lower() == 'memory':
+                # Offline benchmarks and tests: no server needed
+                from .memory_redis import MemoryRedis
+                self._redis = MemoryRedis(latency_ms=float(os.getenv('REDIS_MEMORY_LATENCY_MS', '0')))
+            elif redis_url:
                 self._redis = redis.from_url(
                     redis_url,
-                    decode_responses=True,
+                    decode_responses=False,  # Cache values are binary (see CacheCodec)
                     socket_connect_timeout=5,
                     socket_timeout=5,
                     retry_on_timeout=True,
@@ -64,17 +209,23 @@ class RedisManager:
                     port=int(os.getenv('REDIS_PORT', '6379')),
                     password=os.getenv('REDIS_PASSWORD'),
                     db=int(os.getenv('REDIS_DB', '0')),
-                    decode_responses=True,
+                    decode_responses=False,  # Cache values are binary (see CacheCodec)
                     socket_connect_timeout=5,
                     socket_timeout=5,
                     retry_on_timeout=True,
                     health_check_interval=30
                 )
             
+            self._scripts = {}
+            if self._hot_key_ttl > 0:
+                # Imported here because local_cache imports this module
+                from .local_cache import LocalCache
+                self._hot_cache = LocalCache(max_entries=self._hot_keys.top_k * 2, max_bytes=8 * 1024 * 1024)
+            
             # Test connection
             await self._redis.ping()
             self._is_connected = True
-            logger.info("✅ Redis connection established")
+            logger.info(f"✅ Redis connection established (codec: {self._codec.name})")
             
         except Exception as e:
             logger.warning(f"⚠️ Redis connection failed: {e}")
@@ -83,6 +234,10 @@ class RedisManager:
     
     async def close(self):
         """Close Redis connection"""
+        for task in self._subscriber_tasks:
+            task.cancel()
+        self._subscriber_tasks = []
+        
         if self._redis:
             await self._redis.close()
             logger.info("🛑 Redis connection closed")
@@ -92,46 +247,210 @@ class RedisManager:
         return self._is_connected
     
     # Cache Management Methods
-    async def get(self, key: str, default: Any = None) -> Any:
-        """Get value from cache"""
+    async def get(self, key: str, default: Any = None, tags: Sequence[str] = ()) -> Any:
+        """
+        Get value from cache.
+        
+        Hot keys may be answered from process memory, so returned values must
+        be treated as read-only. tags attribute the lookup in the keyspace
+        stats and let invalidate_tags() evict a promoted copy.
+        """
         if not self._is_connected:
             return default
         
+        if self._hot_cache is not None:
+            value = self._hot_cache.get(key, _MISSING)
+            if value is not _MISSING:
+                self._hot_keys.record(key)
+                self._hot_key_stats["local_hits"] += 1
+                # Still a cache hit for the hit rates; no bytes came from Redis
+                self._cache_stats["hits"] += 1
+                self._keyspace.record(key, tags, hits=1, local_hits=1)
+                return value
+        hot = self._hot_keys.record(key)
+        
         try:
-            value = await self._redis.get(key)
+            if self._auto_batch:
+                value = await with_deadline(self._batched_get(key))
+            else:
+                value = await self._send("GET", self._redis.get(key), bounded=True)
             if value is not None:
                 self._cache_stats["hits"] += 1
-                return json.loads(value)
+                self._keyspace.record(key, tags, hits=1, bytes_read=len(value))
+                value = self._codec.decode(value)
+                if hot and self._hot_cache is not None:
+                    self._hot_cache.set(key, value, self._hot_key_ttl, tags)
+                    self._hot_key_stats["promotions"] += 1
+                return value
             else:
                 self._cache_stats["misses"] += 1
+                self._keyspace.record(key, tags, misses=1)
                 return default
         except Exception as e:
             logger.error(f"Redis get error: {e}")
             self._cache_stats["misses"] += 1
+            self._keyspace.record(key, tags, misses=1)
             return default
     
     async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
         """Set value in cache with TTL"""
+        self._evict_hot(key)
         if not self._is_connected:
             return False
         
         try:
-            # Use custom encoder to handle datetime objects
-            serialized_value = json.dumps(value, cls=DateTimeEncoder)
-            await self._redis.setex(key, ttl, serialized_value)
+            serialized_value = self._codec.encode(value)
+            await self._send("SETEX", self._redis.setex(key, ttl, serialized_value), bounded=True)
             self._cache_stats["sets"] += 1
+            self._keyspace.record(key, sets=1, bytes_written=len(serialized_value))
             return True
         except Exception as e:
             logger.error(f"Redis set error: {e}")
             return False
     
+    async def get_many(self, keys: Sequence[str], default: Any = None) -> List[Any]:
+        """Get several values in one round trip (MGET), in key order; misses come back as default"""
+        if not self._is_connected or not keys:
+            return [default] * len(keys)
+        
+        try:
+            values = await self._send("MGET", self._redis.mget(list(keys)), bounded=True)
+        except Exception as e:
+            logger.error(f"Redis get many error: {e}")
+            self._cache_stats["misses"] += len(keys)
+            for key in keys:
+                self._keyspace.record(key, misses=1)
+            return [default] * len(keys)
+        
+        result = []
+        for key, value in zip(keys, values):
+            if value is not None:
+                try:
+                    result.append(self._codec.decode(value))
+                    self._cache_stats["hits"] += 1
+                    self._keyspace.record(key, hits=1, bytes_read=len(value))
+                    continue
+                except Exception as e:
+                    logger.error(f"Redis get many decode error for {key}: {e}")
+            self._cache_stats["misses"] += 1
+            self._keyspace.record(key, misses=1)
+            result.append(default)
+        return result
+    
+    async def set_many(self, items: Dict[str, Any], ttl: int = 300) -> bool:
+        """Set several values with the same TTL in one pipelined round trip"""
+        self._evict_hot(*items)
+        if not self._is_connected or not items:
+            return False
+        
+        try:
+            encoded = {key: self._codec.encode(value) for key, value in items.items()}
+            pipe = self._redis.pipeline(transaction=False)
+            for key, value in encoded.items():
+                pipe.setex(key, ttl, value)
+            await self._send("pipeline:set_many", pipe.execute(), bounded=True)
+            self._cache_stats["sets"] += len(items)
+            for key, value in encoded.items():
+                self._keyspace.record(key, sets=1, bytes_written=len(value))
+            return True
+        except Exception as e:
+            logger.error(f"Redis set many error: {e}")
+            return False
+    
+    async def _send(self, command: str, awaitable: Awaitable[Any], bounded: bool = False,
+                    timeout: Optional[float] = None) -> Any:
+        """
+        Await one round trip to Redis, counted against the current request
+        and timed in command's latency histogram.
+        
+        Bounded round trips honor the request deadline; timeout caps them
+        further, in seconds.
+        """
+        round_trips.record("redis")
+        start_time = time.perf_counter()
+        try:
+            if bounded or timeout is not None:
+                return await with_deadline(awaitable, timeout)
+            return await awaitable
+        finally:
+            self._observe(command, start_time)
+    
+    def _observe(self, command: str, start_time: float):
+        self._command_latency.observe(command, (time.perf_counter() - start_time) * 1000)
+        if self._metrics_interval and time.monotonic() >= self._next_metrics_publish:
+            self._next_metrics_publish = time.monotonic() + self._metrics_interval
+            if self._metrics_task is None or self._metrics_task.done():
+                self._metrics_task = asyncio.create_task(self._publish_metrics())
+    
+    def _script(self, source: str):
+        """Lua script registered once per client; redis-py runs it by SHA and reloads it if needed"""
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = self._redis.register_script(source)
+        return script
+    
+    def _batched_get(self, key: str) -> asyncio.Future:
+        """
+        Queue a GET for the next auto-batch flush.
+        
+        Every GET queued before the event loop runs the flush callback goes
+        out in one MGET, and duplicate keys share a slot. Each waiting
+        request is charged one round trip per batch.
+        """
+        loop = asyncio.get_running_loop()
+        if not self._batch_pending:
+            loop.call_soon(self._flush_batch)
+        future = loop.create_future()
+        self._batch_pending.setdefault(key, []).append(future)
+        counts = round_trips.current()
+        if counts is not None:
+            self._batch_requests[id(counts)] = counts
+        self._batch_stats["gets"] += 1
+        return future
+    
+    def _flush_batch(self):
+        pending, self._batch_pending = self._batch_pending, {}
+        requests, self._batch_requests = self._batch_requests, {}
+        if not pending:
+            return
+        task = asyncio.create_task(self._execute_batch(pending, list(requests.values())))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _execute_batch(self, pending: Dict[str, List[asyncio.Future]], requests: List[Dict[str, int]]):
+        keys = list(pending)
+        self._batch_stats["batches"] += 1
+        self._batch_stats["keys"] += len(keys)
+        self._batch_stats["max_keys"] = max(self._batch_stats["max_keys"], len(keys))
+        for counts in requests:
+            counts["redis"] = counts.get("redis", 0) + 1
+        
+        start_time = time.perf_counter()
+        try:
+            values = await self._redis.mget(keys)
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        finally:
+            self._observe("MGET:auto_batch", start_time)
+        
+        for key, value in zip(keys, values):
+            for future in pending[key]:
+                # Waiters that ran out of budget have already cancelled theirs
+                if not future.done():
+                    future.set_result(value)
+    
     async def delete(self, key: str) -> bool:
         """Delete key from cache"""
+        self._evict_hot(key)
         if not self._is_connected:
             return False
         
         try:
-            result = await self._redis.delete(key)
+            result = await self._send("DEL", self._redis.delete(key))
             self._cache_stats["deletes"] += 1
             return result > 0
         except Exception as e:
@@ -144,7 +463,7 @@ class RedisManager:
             return False
         
         try:
-            return await self._redis.exists(key) > 0
+            return await self._send("EXISTS", self._redis.exists(key), bounded=True) > 0
         except Exception as e:
             logger.error(f"Redis exists error: {e}")
             return False
@@ -155,24 +474,71 @@ class RedisManager:
             return False
         
         try:
-            return await self._redis.expire(key, ttl)
+            return await self._send("EXPIRE", self._redis.expire(key, ttl))
         except Exception as e:
             logger.error(f"Redis expire error: {e}")
             return False
     
     # Pattern-based operations
+    async def _scan_batches(self, pattern: str) -> AsyncIterator[List[bytes]]:
+        """Yield the keys matching pattern one SCAN batch at a time"""
+        cursor = 0
+        while True:
+            cursor, keys = await self._send("SCAN", self._redis.scan(cursor, match=pattern, count=self._scan_count))
+            if keys:
+                yield keys
+            if cursor == 0:
+                return
+    
+    async def _unlink(self, keys: Iterable[Any]) -> int:
+        """
+        Delete keys with UNLINK, in batches sent in one round trip.
+        
+        UNLINK frees large values off Redis's main thread, and batching
+        keeps each command short however many keys there are.
+        """
+        keys = list(keys)
+        if not keys:
+            return 0
+        
+        pipe = self._redis.pipeline(transaction=False)
+        for start in range(0, len(keys), self._scan_count):
+            pipe.unlink(*keys[start:start + self._scan_count])
+        deleted = sum(await self._send("pipeline:unlink", pipe.execute()))
+        self._cache_stats["deletes"] += deleted
+        return deleted
+    
+    async def _get_values(self, keys: List[bytes]) -> Dict[str, Any]:
+        """Decoded values of keys, read with one MGET per batch in a single round trip"""
+        if not keys:
+            return {}
+        
+        pipe = self._redis.pipeline(transaction=False)
+        for start in range(0, len(keys), self._scan_count):
+            pipe.mget(keys[start:start + self._scan_count])
+        values = [value for batch in await self._send("pipeline:mget", pipe.execute()) for value in batch]
+        
+        result = {}
+        for key, value in zip(keys, values):
+            if value is None:
+                continue  # Expired, or not a string (e.g. a tag set)
+            try:
+                result[key.decode() if isinstance(key, bytes) else key] = self._codec.decode(value)
+            except Exception:
+                pass  # Not a cache entry (e.g. a lease token)
+        return result
+    
     async def delete_pattern(self, pattern: str) -> int:
         """Delete all keys matching pattern"""
+        self.invalidate_hot_keys()
         if not self._is_connected:
             return 0
         
         try:
-            keys = await self._redis.keys(pattern)
-            if keys:
-                result = await self._redis.delete(*keys)
-                self._cache_stats["deletes"] += result
-                return result
-            return 0
+            deleted = 0
+            async for keys in self._scan_batches(pattern):
+                deleted += await self._unlink(keys)
+            return deleted
         except Exception as e:
             logger.error(f"Redis delete pattern error: {e}")
             return 0
@@ -183,34 +549,209 @@ class RedisManager:
             return {}
         
         try:
-            keys = await self._redis.keys(pattern)
             result = {}
-            for key in keys:
-                value = await self.get(key)
-                if value is not None:
-                    result[key] = value
+            async for keys in self._scan_batches(pattern):
+                result.update(await self._get_values(keys))
             return result
         except Exception as e:
             logger.error(f"Redis get pattern error: {e}")
             return {}
     
+    async def get_pattern_page(self, pattern: str, cursor: int = 0, limit: int = 100) -> Tuple[int, Dict[str, Any]]:
+        """
+        Get one page of keys and values matching pattern.
+        
+        Pass the returned cursor to fetch the next page; 0 means the scan is
+        complete. A page holds about limit keys (SCAN's count is only a
+        hint) and may come back short, even empty, when few keys match,
+        since at most a fixed number of SCAN calls are made per page.
+        """
+        if not self._is_connected:
+            return 0, {}
+        
+        try:
+            keys = []
+            for _ in range(self._scan_page_calls):
+                cursor, batch = await self._send("SCAN", self._redis.scan(cursor, match=pattern, count=min(limit, self._scan_count)))
+                keys.extend(batch)
+                if cursor == 0 or len(keys) >= limit:
+                    break
+            return cursor, await self._get_values(keys)
+        except Exception as e:
+            logger.error(f"Redis get pattern page error: {e}")
+            return 0, {}
+    
+    # Tag-based operations
+    def _tag_key(self, tag: str) -> str:
+        """Redis set holding every cache key tagged with ``tag``"""
+        return f"tag:{tag}"
+    
+    async def set_with_tags(self, key: str, value: Any, ttl: int = 300, tags: List[str] = ()) -> bool:
+        """Set value in cache and record the key in each tag's index set"""
+        self._evict_hot(key)
+        if not self._is_connected:
+            return False
+        
+        try:
+            serialized_value = self._codec.encode(value)
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.setex(key, ttl, serialized_value)
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, key)
+                pipe.expire(tag_key, self._tag_ttl)
+            await self._send("pipeline:set_with_tags", pipe.execute(), bounded=True)
+            self._cache_stats["sets"] += 1
+            self._keyspace.record(key, tags, sets=1, bytes_written=len(serialized_value))
+            return True
+        except Exception as e:
+            logger.error(f"Redis set with tags error: {e}")
+            return False
+    
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every cache key recorded under the given tags"""
+        if not tags:
+            return 0
+        self.invalidate_hot_keys(*tags)
+        if not self._is_connected:
+            return 0
+        
+        try:
+            # Read and drop the index sets atomically so keys tagged after
+            # this point land in a fresh set instead of being lost
+            pipe = self._redis.pipeline(transaction=True)
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                pipe.smembers(tag_key)
+                pipe.delete(tag_key)
+            results = await self._send("pipeline:smembers", pipe.execute())
+            
+            keys = set()
+            for members in results[::2]:
+                keys.update(members)
+            self._evict_hot(*(key.decode() if isinstance(key, bytes) else key for key in keys))
+            return await self._unlink(keys)
+        except Exception as e:
+            logger.error(f"Redis invalidate tags error: {e}")
+            return 0
+    
+    # Hot keys
+    def _evict_hot(self, *keys: str):
+        if self._hot_cache is not None:
+            for key in keys:
+                self._hot_cache.delete(key)
+    
+    def invalidate_hot_keys(self, *tags: str) -> int:
+        """Drop in-process copies of hot keys with any of the given tags, or all of them"""
+        if self._hot_cache is None:
+            return 0
+        return self._hot_cache.invalidate_tags(*tags) if tags else self._hot_cache.clear()
+    
+    def get_hot_keys(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """This worker's hottest keys by estimated reads per second, and promotion counters"""
+        return {
+            "top": self._hot_keys.top(limit),
+            "promotion_enabled": self._hot_cache is not None,
+            "promotion_ttl_seconds": self._hot_key_ttl,
+            **self._hot_key_stats,
+            "tracker": self._hot_keys.get_stats(),
+            "local_cache": self._hot_cache.get_stats() if self._hot_cache is not None else None
+        }
+    
     # Cache invalidation helpers
     async def invalidate_blogs_cache(self):
         """Invalidate all blog-related cache"""
-        return await self.delete_pattern("cache:blogs:*")
+        return await self.delete_pattern("cache:blogs:*") + await self.invalidate_tags("blogs")
     
     async def invalidate_users_cache(self):
         """Invalidate all user-related cache"""
-        return await self.delete_pattern("cache:users:*")
+        return await self.delete_pattern("cache:users:*") + await self.invalidate_tags("users")
     
     async def invalidate_jobs_cache(self):
         """Invalidate all job-related cache"""
-        return await self.delete_pattern("cache:jobs:*")
+        return await self.delete_pattern("cache:jobs:*") + await self.invalidate_tags("jobs")
     
     async def invalidate_all_cache(self):
         """Invalidate all cache"""
         return await self.delete_pattern("cache:*")
     
+    # Short-lived leases
+    async def acquire_lease(self, key: str, ttl_ms: int) -> Optional[str]:
+        """
+        Try to take an exclusive lease on key for ttl_ms milliseconds.
+        
+        Returns a token to release the lease with, or None if another holder
+        has it. Fails open when Redis is unavailable so callers never block.
+        """
+        token = uuid.uuid4().hex
+        if not self._is_connected:
+            return token
+        
+        try:
+            acquired = await self._send("SET", self._redis.set(key, token, nx=True, px=ttl_ms), bounded=True)
+            return token if acquired else None
+        except Exception as e:
+            logger.error(f"Redis acquire lease error: {e}")
+            return token
+    
+    async def release_lease(self, key: str, token: str) -> bool:
+        """Release a lease only if it is still held with the given token"""
+        if not self._is_connected:
+            return False
+        
+        try:
+            return await self._send("script:release_lease", self._script(RELEASE_LEASE_SCRIPT)(keys=[key], args=[token])) > 0
+        except Exception as e:
+            logger.error(f"Redis release lease error: {e}")
+            return False
+    
+    # Pub/sub messaging
+    async def publish(self, channel: str, message: Dict[str, Any]) -> int:
+        """Publish a JSON message to a channel"""
+        if not self._is_connected:
+            return 0
+        
+        try:
+            return await self._send("PUBLISH", self._redis.publish(channel, json.dumps(message, cls=DateTimeEncoder)))
+        except Exception as e:
+            logger.error(f"Redis publish error: {e}")
+            return 0
+    
+    def subscribe(self, channel: str, handler: Callable[[Dict[str, Any]], Any]) -> Optional[asyncio.Task]:
+        """Start a background task calling handler for every message on channel"""
+        if not self._is_connected:
+            return None
+        
+        task = asyncio.create_task(self._listen(channel, handler))
+        self._subscriber_tasks.append(task)
+        return task
+    
+    async def _listen(self, channel: str, handler: Callable[[Dict[str, Any]], Any]):
+        """Listen on a channel, resubscribing after connection errors"""
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(channel)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        result = handler(json.loads(message["data"]))
+                        if asyncio.iscoroutine(result):
+                            await result
+                    except Exception as e:
+                        logger.error(f"Redis subscriber handler error on {channel}: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Redis subscription to {channel} lost: {e}")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+    
     # Session management
     async def set_session(self, session_id: str, data: Dict[str, Any], ttl: int = 3600) -> bool:
         """Set session data"""
@@ -226,16 +767,16 @@ class RedisManager:
     
     # Rate limiting
     async def increment_rate_limit(self, key: str, ttl: int = 60) -> int:
-        """Increment rate limit counter"""
+        """Increment a fixed-window rate limit counter; the window starts with its first hit"""
         if not self._is_connected:
             return 0
         
         try:
-            pipe = self._redis.pipeline()
-            pipe.incr(key)
-            pipe.expire(key, ttl)
-            results = await pipe.execute()
-            return results[0]
+            count = await self._send(
+                "script:fixed_window", self._script(FIXED_WINDOW_SCRIPT)(keys=[key], args=[ttl * 1000])
+            )
+            self._keyspace.record(key, sets=1)
+            return count
         except Exception as e:
             logger.error(f"Redis rate limit error: {e}")
             return 0
@@ -245,6 +786,52 @@ class RedisManager:
         current = await self.increment_rate_limit(key)
         return current <= limit
     
+    async def sliding_window(self, key: str, limit: int, window_ms: int, cost: int = 1,
+                             timeout: Optional[float] = None) -> Optional[Tuple[bool, int, int]]:
+        """
+        Count a request against a sliding-window limit in one atomic script.
+        
+        Returns (allowed, remaining, retry after ms), or None when Redis is
+        unavailable so callers can fall back to a local limit.
+        """
+        if not self._is_connected:
+            return None
+        
+        try:
+            allowed, remaining, retry_ms = await self._send(
+                "script:sliding_window",
+                self._script(SLIDING_WINDOW_SCRIPT)(keys=[key], args=[limit, window_ms, cost]), timeout=timeout
+            )
+            self._keyspace.record(key, sets=1)
+            return bool(allowed), remaining, retry_ms
+        except Exception as e:
+            logger.error(f"Redis sliding window error: {e}")
+            return None
+    
+    async def token_bucket(self, key: str, capacity: int, refill_per_second: float, cost: int = 1,
+                           timeout: Optional[float] = None) -> Optional[Tuple[bool, int, int]]:
+        """
+        Take cost tokens from a bucket in one atomic script.
+        
+        Returns (allowed, remaining, retry after ms), or None when Redis is
+        unavailable so callers can fall back to a local limit.
+        """
+        if not self._is_connected:
+            return None
+        
+        idle_ms = math.ceil(capacity * 1000 / refill_per_second) + 1000
+        try:
+            allowed, remaining, retry_ms = await self._send(
+                "script:token_bucket",
+                self._script(TOKEN_BUCKET_SCRIPT)(keys=[key], args=[capacity, refill_per_second, cost, idle_ms]),
+                timeout=timeout
+            )
+            self._keyspace.record(key, sets=1)
+            return bool(allowed), remaining, retry_ms
+        except Exception as e:
+            logger.error(f"Redis token bucket error: {e}")
+            return None
+    
     # Performance monitoring
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache performance statistics"""
@@ -259,16 +846,83 @@ class RedisManager:
             "deletes": self._cache_stats["deletes"],
             "total_requests": total_requests,
             "hit_rate_percent": round(hit_rate, 2),
-            "efficiency": "excellent" if hit_rate > 80 else "good" if hit_rate > 60 else "needs_optimization"
+            "efficiency": "excellent" if hit_rate > 80 else "good" if hit_rate > 60 else "needs_optimization",
+            "codec": self._codec.get_stats(),
+            "auto_batch": self.get_batch_stats(),
+            "keyspace": self._keyspace.snapshot(),
+            "commands": self._command_latency.snapshot(),
+            "hot_keys": {**self._hot_key_stats, "hot": [item["key"] for item in self._hot_keys.top() if item["hot"]]}
         }
     
+    def _raw_metrics(self) -> Dict[str, Any]:
+        return {
+            "worker": self._worker_id,
+            "published_at": time.time(),
+            "keyspace": self._keyspace.raw(),
+            "commands": self._command_latency.raw()
+        }
+    
+    async def _publish_metrics(self):
+        """Store this worker's raw counters in Redis for get_cluster_metrics()"""
+        if not self._is_connected:
+            return
+        try:
+            await self._redis.setex(
+                f"metrics:redis:{self._worker_id}", self._metrics_interval * 4, self._codec.encode(self._raw_metrics())
+            )
+        except Exception as e:
+            logger.debug(f"Redis metrics publish error: {e}")
+    
+    async def get_cluster_metrics(self) -> Dict[str, Any]:
+        """
+        Raw keyspace and command counters added up across every worker.
+        
+        Other workers' counters are as of their last publish (at most
+        REDIS_METRICS_PUBLISH_SECONDS old); this worker's are current.
+        Workers that stopped publishing drop out when their entry expires.
+        """
+        snapshots = {self._worker_id: self._raw_metrics()}
+        if self._is_connected:
+            try:
+                async for keys in self._scan_batches("metrics:redis:*"):
+                    for snapshot in (await self._get_values(keys)).values():
+                        if isinstance(snapshot, dict):
+                            snapshots.setdefault(snapshot.get("worker"), snapshot)
+            except Exception as e:
+                logger.error(f"Redis cluster metrics error: {e}")
+        return {"workers": len(snapshots), **merge_raw(list(snapshots.values()))}
+    
+    def get_batch_stats(self) -> Dict[str, Any]:
+        """Get auto-batching statistics"""
+        batches = self._batch_stats["batches"]
+        return {
+            "enabled": self._auto_batch,
+            **self._batch_stats,
+            "avg_keys_per_batch": round(self._batch_stats["keys"] / batches, 2) if batches else 0
+        }
+    
+    async def get_eviction_stats(self) -> Dict[str, Any]:
+        """Get server-side eviction and expiry counters"""
+        if not self._is_connected:
+            return {}
+        
+        try:
+            info = await self._send("INFO", self._redis.info("stats"))
+            return {
+                "evicted_keys": info.get("evicted_keys", 0),
+                "expired_keys": info.get("expired_keys", 0)
+            }
+        except Exception as e:
+            logger.error(f"Redis eviction stats error: {e}")
+            return {}
+    
     async def get_redis_info(self) -> Dict[str, Any]:
         """Get Redis server information"""
         if not self._is_connected:
             return {"error": "Redis not connected"}
         
         try:
-            info = await self._redis.info()
+            info = await self._send("INFO", self._redis.info())
             return {
                 "version": info.get("redis_version"),
                 "connected_clients": info.get("connected_clients"),
@@ -288,7 +942,7 @@ class RedisManager:
             return False
         
         try:
-            await self._redis.ping()
+            await self._send("PING", self._redis.ping())
             return True
         except Exception as e:
             logger.error(f"Redis health check failed: {e}")
@@ -0,0 +1,97 @@
+"""
+Request Round-Trip Counters
+Handled by: Backend Team
+Purpose: Count the Redis and database round trips each request makes
+
+This module provides:
+- A request-scoped counter carried in a context variable, shared with the
+  tasks a request starts
+- record(), called by the Redis and database managers for every round trip
+- RoundTripMiddleware, which reports each request's counts in the
+  X-Round-Trips response header and keeps per-route totals
+
+Round trips made outside a request (startup, background work started with
+a fresh context) are not counted. Counts are taken when the response
+starts, so the rest of a streamed body is not included in the header.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+# Round trips made so far by the current request, by kind ("redis", "db")
+_counts: ContextVar[Optional[Dict[str, int]]] = ContextVar("request_round_trips", default=None)
+
+ROUND_TRIP_HEADER = b"x-round-trips"
+
+_route_stats: Dict[str, Dict[str, int]] = {}
+
+def record(kind: str, count: int = 1):
+    """Count round trips against the current request, if there is one"""
+    counts = _counts.get()
+    if counts is not None:
+        counts[kind] = counts.get(kind, 0) + count
+
+def current() -> Optional[Dict[str, int]]:
+    """The current request's counters, or None outside a request"""
+    return _counts.get()
+
+@contextmanager
+def round_trip_scope():
+    """Count round trips made within a block, e.g. one request"""
+    counts: Dict[str, int] = {}
+    token = _counts.set(counts)
+    try:
+        yield counts
+    finally:
+        _counts.reset(token)
+
+def format_counts(counts: Dict[str, int]) -> str:
+    return ", ".join(f"{kind}={count}" for kind, count in sorted(counts.items())) or "none"
+
+class RoundTripMiddleware:
+    """ASGI middleware counting each request's round trips, reported per response and per route"""
+    def __init__(self, app, header: bool = True):
+        self.app = app
+        self.header = header
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        with round_trip_scope() as counts:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start" and self.header:
+                    headers = [*message.get("headers", []), (ROUND_TRIP_HEADER, format_counts(counts).encode())]
+                    message = {**message, "headers": headers}
+                await send(message)
+            
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                _record_route(scope, counts)
+
+def _record_route(scope, counts: Dict[str, int]):
+    # Route templates keep the number of entries bounded
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    stats = _route_stats.setdefault(path, {"requests": 0})
+    stats["requests"] += 1
+    for kind, count in counts.items():
+        stats[kind] = stats.get(kind, 0) + count
+        stats[f"max_{kind}"] = max(stats.get(f"max_{kind}", 0), count)
+
+def get_round_trip_stats() -> Dict[str, Any]:
+    """Per-route request counts, total and average round trips by kind"""
+    routes = {}
+    for path, stats in _route_stats.items():
+        requests = stats["requests"]
+        routes[path] = {
+            **stats,
+            **{
+                f"avg_{kind}": round(count / requests, 2)
+                for kind, count in stats.items()
+                if kind != "requests" and not kind.startswith("max_")
+            }
+        }
+    return {"routes": routes}
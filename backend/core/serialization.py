@@ -0,0 +1,75 @@
+"""
+Fast JSON Serialization
+Handled by: Backend Team
+Purpose: Serialize query results and API responses straight to bytes
+
+This module provides:
+- dumps(), an orjson-based encoder that understands asyncpg Records,
+  Decimals, sets and Pydantic models
+- FastJSONResponse, the application's default response class
+- Postgres json/jsonb codecs for pool connections
+
+Endpoints on hot paths can return FastJSONResponse(...) directly: FastAPI
+then skips jsonable_encoder and the payload is encoded in a single pass.
+orjson is optional; without it the stdlib json module is used.
+"""
+import json
+from decimal import Decimal
+from typing import Any
+
+import asyncpg
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+def _default(obj: Any) -> Any:
+    """Convert values orjson (or json) cannot encode natively"""
+    if isinstance(obj, asyncpg.Record):
+        return dict(obj)
+    if isinstance(obj, Decimal):
+        # Same convention as FastAPI's jsonable_encoder
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(value: Any) -> bytes:
+    """Encode a value, including lists of asyncpg Records, as UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+def loads(data: Any) -> Any:
+    """Decode JSON text or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps()"""
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def _encode_json_column(value: Any) -> str:
+    # Callers that already serialized the value (json.dumps) pass it through
+    if isinstance(value, str):
+        return value
+    return dumps(value).decode()
+
+async def register_json_codecs(conn: asyncpg.Connection):
+    """Decode json/jsonb columns to Python objects (and encode them back) on a connection"""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name,
+            encoder=_encode_json_column,
+            decoder=loads,
+            schema="pg_catalog",
+            format="text"
+        )
@@ -0,0 +1,79 @@
+"""
+Streaming Response Helpers
+Handled by: Backend Team
+Purpose: Encode row streams for FastAPI StreamingResponse with constant memory
+
+This module provides:
+- NDJSON and CSV encoders over async row iterators
+- Chunk buffering so responses are sent in reasonably sized writes
+
+Use with db.stream():
+
+    rows = db.stream(query, batch_size=1000)
+    return StreamingResponse(ndjson_stream(rows), media_type=NDJSON_MEDIA_TYPE)
+"""
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+
+from .redis_manager import DateTimeEncoder
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+# Flush to the client once this many characters are buffered
+CHUNK_SIZE = 64 * 1024
+
+async def buffered(chunks: AsyncIterator[str], chunk_size: int = CHUNK_SIZE) -> AsyncIterator[str]:
+    """Join small string pieces into chunks of roughly chunk_size characters"""
+    buffer = []
+    size = 0
+    async for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+async def ndjson_stream(rows: AsyncIterator[Dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> AsyncIterator[str]:
+    """Encode rows as newline-delimited JSON"""
+    async def lines():
+        async for row in rows:
+            yield json.dumps(row, cls=DateTimeEncoder) + "\n"
+    
+    async for chunk in buffered(lines(), chunk_size):
+        yield chunk
+
+async def csv_stream(rows: AsyncIterator[Dict[str, Any]], columns: Optional[Sequence[str]] = None,
+                     chunk_size: int = CHUNK_SIZE) -> AsyncIterator[str]:
+    """
+    Encode rows as CSV with a header line.
+    
+    Columns default to the keys of the first row. Lists are written as
+    JSON so they survive a round trip.
+    """
+    async def lines():
+        output = io.StringIO()
+        writer = None
+        async for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(output, fieldnames=list(columns or row.keys()), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow({
+                key: json.dumps(value, cls=DateTimeEncoder) if isinstance(value, (list, dict)) else value
+                for key, value in row.items()
+            })
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+        
+        if writer is None and columns:
+            # No rows: still send the header
+            yield ",".join(columns) + "\r\n"
+    
+    async for chunk in buffered(lines(), chunk_size):
+        yield chunk
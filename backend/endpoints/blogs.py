@@ -10,9 +10,15 @@ This module provides RESTful API endpoints for blog management including:
 - SEO-friendly URL structure for blog posts
 """
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
+import asyncio
 import logging
 from core.database import db
+from core import queries
+from core.bloom import blog_slugs
+from core.streaming import ndjson_stream, csv_stream, NDJSON_MEDIA_TYPE, CSV_MEDIA_TYPE
+from core.serialization import FastJSONResponse
 from models import BlogPost
 from datetime import datetime
 
@@ -22,12 +28,14 @@ logger = logging.getLogger(__name__)
 # Router configuration with prefix and OpenAPI tags
 router = APIRouter(prefix="/blogs", tags=["blogs"])
 
+# Blog posts written per /blogs/generate call, one Gemini call each
+GENERATED_BLOGS_PER_RUN = 4
+
 def format_blog_response(row) -> dict:
     """
     Format database row into standardized blog response.
     Handles both datetime and string for date fields.
     """
-    print(row)
     date_value = row.get('date', row['created_at'])
     date_str = None
     if date_value:
@@ -94,18 +102,32 @@ def format_blog_preview(row) -> dict:
 
 
 
+@router.get("/export")
+async def export_blogs(format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv")):
+    """
+    Export every blog post as NDJSON or CSV.
+    
+    Rows are streamed from a server-side cursor, so memory use stays
+    constant regardless of the number of posts.
+    
+    Returns:
+        StreamingResponse: One blog per line (NDJSON) or per row (CSV)
+    """
+    rows = db.stream(queries.BLOGS_EXPORT, batch_size=500)
+    if format == "csv":
+        return StreamingResponse(
+            csv_stream(rows),
+            media_type=CSV_MEDIA_TYPE,
+            headers={"Content-Disposition": 'attachment; filename="blogs.csv"'}
+        )
+    return StreamingResponse(ndjson_stream(rows), media_type=NDJSON_MEDIA_TYPE)
+
 @router.get("/{blog_id}")
 async def get_blog_by_id(blog_id: int):
     try:
-        print("here")
         # Query for specific blog by ID - only select columns that exist
-        query = """
-        SELECT id, title, author, content, image, created_at, tags, slug, avatar, date
-        FROM blogs
-        WHERE id = $1
-        """
-        
-        row = await db.fetchrow(query, blog_id)
+        # Misses are cached too (DB_NEGATIVE_CACHE_TTL) so bots retrying dead URLs don't reach Postgres
+        row = await db.fetchrow(queries.BLOGS_BY_ID, blog_id, cache_ttl=600, stale_ttl=3600, negative_ttl=True)
 
         
         if not row:
@@ -116,15 +138,12 @@ async def get_blog_by_id(blog_id: int):
         
         # Try to increment view count if the column exists
         try:
-            await db.execute(
-                "UPDATE blogs SET view_count = COALESCE(view_count, 0) + 1 WHERE id = $1",
-                blog_id
-            )
+            await db.execute(queries.BLOGS_INCREMENT_VIEWS_BY_ID, blog_id)
         except Exception as e:
             logger.warning(f"Failed to increment view count for blog {blog_id}: {e}")
         
-        print(row)
-        return format_blog_response(row)
+        # Returning the response directly skips FastAPI's jsonable_encoder pass
+        return FastJSONResponse(format_blog_response(row))
         
     except HTTPException:
         # Re-raise HTTP exceptions (like 404) without modification
@@ -159,41 +178,27 @@ async def get_blogs(
         HTTPException: If database query fails
     """
     try:
-        print("here")
-        # Optimized query with caching - only fetch essential fields that exist
-        query = """
-        SELECT id, title, author, content, image, created_at, tags, slug, avatar, date
-        FROM blogs
-        ORDER BY created_at DESC 
-        LIMIT $1 OFFSET $2
-        """
-        
-        # Use caching for better performance
-        rows = await db.fetch(query, limit, offset, use_cache=True, cache_ttl=600)  # 10 minutes cache
+        # Use caching for better performance; previews skip the content column
+        # 1 hour cache, invalidated on write; stale entries are served while refreshing.
+        # The page and the total count are looked up together so their cache
+        # reads can share one Redis round trip when auto-batching is on
+        rows, total_result = await asyncio.gather(
+            db.fetch(queries.BLOGS_LIST, limit, offset, use_cache=True, cache_ttl=3600, stale_ttl=3600),
+            db.fetchrow(queries.BLOGS_COUNT, use_cache=True, cache_ttl=3600, stale_ttl=3600)
+        )
         
         # Optimize response formatting
-        blogs = []
-        for row in rows:
-            blogs.append(format_blog_preview(row))
-
-
-
-        
-        # Get total count for pagination
-        count_query = """
-        SELECT COUNT(*) as total
-        FROM blogs
-        """
-        total_result = await db.fetchrow(count_query, use_cache=True, cache_ttl=600)
+        blogs = [format_blog_preview(row) for row in rows]
         total = total_result['total'] if total_result else len(blogs)
         
-        return {
+        # Returning the response directly skips FastAPI's jsonable_encoder pass
+        return FastJSONResponse({
             "blogs": blogs, 
             "total": total,
             "limit": limit,
             "offset": offset,
             "cached": True  # Indicate if response was cached
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error fetching blogs: {e}")
@@ -236,20 +241,12 @@ async def create_blog(
         HTTPException: If blog creation fails
     """
     try:
-        # Insert new blog with current timestamp
-        # Using NOW() ensures consistent timezone handling
-        query = """
-        INSERT INTO blogs (title, author, content, image, tags, slug, avatar, date)
-        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-        RETURNING id
-        """
-        
         # Generate slug from title
         slug = title.lower().replace(' ', '-').replace(':', '').replace(',', '').replace('.', '')
         slug = ''.join(c for c in slug if c.isalnum() or c == '-')
         
         blog_id = await db.fetchval(
-            query, 
+            queries.BLOGS_INSERT,
             title, 
             author, 
             content, 
@@ -260,7 +257,8 @@ async def create_blog(
             date
         )
         
-        # Invalidate cache
+        # Invalidate cache, including cached misses for this id or slug;
+        # the known-slug filter rebuilds on the same invalidation
         await db.invalidate_blogs_cache()
         
         return {
@@ -295,14 +293,15 @@ async def get_blog_by_slug(slug: str):
     Raises:
         HTTPException: If blog not found or database error occurs
     """
+    # Slugs missing from the known-slug filter certainly don't exist
+    if not blog_slugs.might_contain(slug):
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Blog post with slug '{slug}' not found"
+        )
+    
     try:
-        query = """
-        SELECT id, title, author, content, image, created_at, tags, slug, avatar, date
-        FROM blogs
-        WHERE slug = $1
-        """
-        
-        row = await db.fetchrow(query, slug)
+        row = await db.fetchrow(queries.BLOGS_BY_SLUG, slug, cache_ttl=600, stale_ttl=3600, negative_ttl=True)
         
         if not row:
             raise HTTPException(
@@ -312,14 +311,11 @@ async def get_blog_by_slug(slug: str):
         
         # Try to increment view count if the column exists
         try:
-            await db.execute(
-                "UPDATE blogs SET view_count = COALESCE(view_count, 0) + 1 WHERE slug = $1",
-                slug
-            )
+            await db.execute(queries.BLOGS_INCREMENT_VIEWS_BY_SLUG, slug)
         except Exception as e:
             logger.warning(f"Failed to increment view count for blog {slug}: {e}")
         
-        return format_blog_response(row)
+        return FastJSONResponse(format_blog_response(row))
         
     except HTTPException:
         raise
@@ -350,8 +346,8 @@ async def generate_blogs():
         
         generator = BlogGenerator()
         
-        # Generate 4 new blogs
-        generated_blogs = await generator.generate_blogs(count=4)
+        # Generate new blogs
+        generated_blogs = await generator.generate_blogs(count=GENERATED_BLOGS_PER_RUN)
         
         # Invalidate cache
         await db.invalidate_blogs_cache()
@@ -15,6 +15,8 @@ import time
 import psutil
 import os
 from core.database import db
+from core.cache_warmer import cache_warmer
+from core.serialization import FastJSONResponse
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -112,7 +114,9 @@ async def readiness_check():
     This endpoint checks if the application is ready to receive traffic:
     - Database connection is established
     - All required services are available
-    - Application is fully initialized
+    - Application is fully initialized and the startup cache warm-up finished
+    
+    Responds with 503 while not ready so load balancers hold traffic back.
     
     Returns:
         dict: Readiness status
@@ -121,25 +125,30 @@ async def readiness_check():
         # Check database readiness
         db_health = await db.get_health_report()
         
-        is_ready = db_health["status"] == "healthy"
+        database_ready = db_health["status"] == "healthy"
+        cache_warm = cache_warmer.is_ready()
+        is_ready = database_ready and cache_warm
         
-        return {
+        return FastJSONResponse({
             "ready": is_ready,
             "timestamp": time.time(),
             "checks": {
-                "database": db_health["status"] == "healthy"
-            }
-        }
+                "database": database_ready,
+                "cache_warm": cache_warm
+            },
+            "warmup": cache_warmer.get_stats()
+        }, status_code=200 if is_ready else 503)
         
     except Exception as e:
-        return {
+        return FastJSONResponse({
             "ready": False,
             "timestamp": time.time(),
             "error": str(e),
             "checks": {
-                "database": False
+                "database": False,
+                "cache_warm": cache_warmer.is_ready()
             }
-        }
+        }, status_code=503)
 
 @router.get("/live")
 async def liveness_check():
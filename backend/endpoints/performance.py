@@ -9,12 +9,16 @@ This module provides performance monitoring endpoints that:
 - Provide cache statistics
 - Help identify bottlenecks
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import Dict, Any
 import time
 import psutil
 import asyncio
 from core.database import db
+from core.deadline import get_deadline_stats
+from core.round_trips import get_round_trip_stats
+from core.rate_limit import get_rate_limit_stats
+from core.bloom import blog_slugs
 
 router = APIRouter(prefix="/performance", tags=["performance"])
 
@@ -61,6 +65,9 @@ async def get_performance_metrics():
                 "cache_misses": _cache_misses
             },
             "database": db_health,
+            "deadlines": get_deadline_stats(),
+            "round_trips": get_round_trip_stats(),
+            "rate_limits": get_rate_limit_stats(),
             "system": system_metrics,
             "optimizations": {
                 "connection_pooling": True,
@@ -90,7 +97,12 @@ async def get_cache_stats():
             "cache_misses": _cache_misses,
             "total_requests": total_cache_requests,
             "hit_rate_percent": round(cache_hit_rate, 2),
-            "efficiency": "excellent" if cache_hit_rate > 80 else "good" if cache_hit_rate > 60 else "needs_optimization"
+            "efficiency": "excellent" if cache_hit_rate > 80 else "good" if cache_hit_rate > 60 else "needs_optimization",
+            "single_flight": db.get_single_flight_stats(),
+            "stale_while_revalidate": db.get_revalidation_stats(),
+            "negative_cache": db.get_negative_cache_stats(),
+            "blog_slug_filter": blog_slugs.get_stats(),
+            "table_notifications": db.get_notify_stats()
         }
         
     except Exception as e:
@@ -114,6 +126,47 @@ async def clear_cache():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to clear cache: {e}")
 
+@router.get("/queries")
+async def get_query_stats(sort_by: str = "total_ms", limit: int = Query(50, ge=1, le=500)):
+    """
+    Get per-query telemetry and the slow-query log.
+    
+    Queries are grouped by fingerprint (SQL with literals stripped). Sort by
+    total_ms, calls, executions, rows_returned, p50_ms, p95_ms, p99_ms or max_ms.
+    
+    Returns:
+        dict: Per-fingerprint calls, cache hit ratio, latency and acquire-wait
+        percentiles, rows returned, recent slow queries with captured plans,
+        and per-query timing for the named query registry
+    """
+    try:
+        return {
+            "timestamp": time.time(),
+            **db.get_fingerprint_stats(sort_by, limit),
+            "named_queries": db.get_query_stats()
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get query stats: {e}")
+
+@router.post("/queries/reset")
+async def reset_query_stats():
+    """
+    Reset per-fingerprint telemetry and the slow-query log.
+    
+    Returns:
+        dict: Reset status
+    """
+    try:
+        db.reset_fingerprint_stats()
+        return {
+            "message": "Query statistics reset",
+            "timestamp": time.time()
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to reset query stats: {e}")
+
 @router.get("/optimization/recommendations")
 async def get_optimization_recommendations():
     """
@@ -8,11 +8,17 @@ This module provides endpoints for:
 - Cache management operations
 - Performance optimization
 - Health checks
+- Per-namespace cache counters and per-command latency, per worker and
+  across workers (JSON and Prometheus text)
+- Hot-key reports
 """
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Dict, Any, List
 import time
 from core.redis_manager import redis_manager
+from core.database import db
+from core.cache_stats import summarize_keyspace, format_prometheus
 
 router = APIRouter(prefix="/redis", tags=["redis"])
 
@@ -41,21 +47,101 @@ async def get_redis_stats():
     """
     Get Redis cache performance statistics.
     
+    Includes per-tier counters for the in-process L1 cache and Redis, and
+    for this worker: counters per key namespace and query tag, and latency
+    per Redis command.
+    
     Returns:
         dict: Cache performance statistics including hit rate
     """
     try:
         stats = redis_manager.get_cache_stats()
+        eviction_stats = await redis_manager.get_eviction_stats()
         
         return {
             "timestamp": time.time(),
             "stats": stats,
+            "tiers": {
+                "l1": db.get_local_cache_stats(),
+                "redis": {**stats, **eviction_stats}
+            },
             "recommendations": get_cache_recommendations(stats)
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get Redis stats: {e}")
 
+@router.get("/stats/cluster")
+async def get_redis_cluster_stats():
+    """
+    Get cache counters and command latency added up across all workers.
+    
+    Each worker publishes its counters to Redis every
+    REDIS_METRICS_PUBLISH_SECONDS, so other workers' figures can be that old.
+    
+    Returns:
+        dict: Keyspace counters by namespace and tag, and command histograms
+    """
+    try:
+        merged = await redis_manager.get_cluster_metrics()
+        
+        return {
+            "timestamp": time.time(),
+            "workers": merged["workers"],
+            "keyspace": summarize_keyspace(merged["keyspace"]),
+            "commands": {
+                command: {
+                    "count": stats["count"],
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 2) if stats["count"] else 0,
+                    "max_ms": round(stats["max_ms"], 2),
+                    "buckets": stats["buckets"]
+                }
+                for command, stats in sorted(merged["commands"].items())
+            }
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get Redis cluster stats: {e}")
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_redis_metrics():
+    """
+    Cache and command metrics across all workers, for Prometheus to scrape.
+    
+    Returns:
+        str: Counters and histograms in the Prometheus text format
+    """
+    try:
+        merged = await redis_manager.get_cluster_metrics()
+        return PlainTextResponse(format_prometheus(merged), media_type="text/plain; version=0.0.4")
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get Redis metrics: {e}")
+
+@router.get("/hot-keys")
+async def get_hot_keys(limit: int = Query(20, ge=1, le=100)):
+    """
+    Get this worker's hottest cache keys.
+    
+    Reads are sampled into a count-min sketch, so rates are estimates and
+    may overcount. Keys marked hot are served from process memory for
+    REDIS_HOT_KEY_TTL seconds instead of Redis.
+    
+    Args:
+        limit: Number of keys to return
+        
+    Returns:
+        dict: Top keys by estimated reads per second, and promotion counters
+    """
+    try:
+        return {
+            "timestamp": time.time(),
+            **redis_manager.get_hot_keys(limit)
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get hot keys: {e}")
+
 @router.get("/info")
 async def get_redis_info():
     """
@@ -175,22 +261,32 @@ async def clear_jobs_cache():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to clear jobs cache: {e}")
 
+@router.get("/keys")
 @router.get("/keys/{pattern}")
-async def get_cache_keys(pattern: str = "*"):
+async def get_cache_keys(pattern: str = "*", cursor: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
     """
-    Get cache keys matching pattern.
+    Get one page of cache keys matching pattern.
+    
+    Keys are listed with SCAN, so each call does a bounded amount of work.
+    Pass next_cursor back as cursor for the following page until complete
+    is true; a page can be short or empty before the scan completes.
     
     Args:
         pattern: Redis key pattern (default: "*")
+        cursor: Cursor returned by the previous page (0 to start)
+        limit: Approximate number of keys per page
         
     Returns:
-        dict: Matching cache keys and their values
+        dict: Matching cache keys and their values, and the next cursor
     """
     try:
-        keys_data = await redis_manager.get_pattern(pattern)
+        next_cursor, keys_data = await redis_manager.get_pattern_page(pattern, cursor, limit)
         
         return {
             "pattern": pattern,
+            "cursor": cursor,
+            "next_cursor": next_cursor,
+            "complete": next_cursor == 0,
             "keys_count": len(keys_data),
             "keys": keys_data,
             "timestamp": time.time()
@@ -204,6 +300,9 @@ async def delete_cache_keys(pattern: str):
     """
     Delete cache keys matching pattern.
     
+    Keys are found with SCAN and removed with batched UNLINK, so Redis is
+    never blocked for the whole keyspace.
+    
     Args:
         pattern: Redis key pattern to delete
         
@@ -254,6 +353,8 @@ async def get_cache_optimization_recommendations():
                 "target_value": ">80%"
             })
         
+        recommendations.extend(get_namespace_recommendations(stats))
+        
         # Check connection status
         if not stats.get("connected", False):
             recommendations.append({
@@ -300,4 +401,37 @@ def get_cache_recommendations(stats: Dict[str, Any]) -> list:
     if not stats.get("connected", False):
         recommendations.append("Check Redis connection and configuration")
     
+    recommendations.extend(item["description"] for item in get_namespace_recommendations(stats))
+    return recommendations
+
+def get_namespace_recommendations(stats: Dict[str, Any], min_lookups: int = 100) -> List[Dict[str, Any]]:
+    """TTL and entry-size recommendations for the namespaces and tags with enough traffic to judge"""
+    recommendations = []
+    keyspace = stats.get("keyspace", {})
+    for section, label in (("namespaces", "namespace"), ("tags", "tag")):
+        for name, counts in keyspace.get(section, {}).items():
+            lookups = counts["hits"] + counts["misses"]
+            hit_rate = counts["hit_rate_percent"]
+            if lookups >= min_lookups and hit_rate is not None and hit_rate < 50:
+                recommendations.append({
+                    "type": f"{label}_hit_rate",
+                    "priority": "medium",
+                    "description": (
+                        f"Cache {label} '{name}' hits only {hit_rate}% of {lookups} lookups. "
+                        "Raise its TTL if entries expire before reuse, or stop caching it."
+                    ),
+                    "current_value": f"{hit_rate}%",
+                    "target_value": ">80%"
+                })
+            if counts["avg_bytes_written"] > 100 * 1024:
+                recommendations.append({
+                    "type": f"{label}_entry_size",
+                    "priority": "low",
+                    "description": (
+                        f"Cache {label} '{name}' writes {counts['avg_bytes_written'] // 1024}KB entries on average. "
+                        "Cache smaller projections or lower REDIS_COMPRESS_THRESHOLD."
+                    ),
+                    "current_value": f"{counts['avg_bytes_written']} bytes",
+                    "target_value": "<100KB"
+                })
     return recommendations 
\ No newline at end of file
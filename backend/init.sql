@@ -87,6 +87,46 @@ CREATE TRIGGER update_blogs_updated_at BEFORE UPDATE ON blogs
 CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON users
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Notify the backend of row changes so it evicts cached queries
+-- (kept in sync with cache_invalidation_triggers.sql)
+-- Payload: {"table": "blogs", "op": "UPDATE", "id": 42}
+-- Trigger arguments name columns whose changes alone don't affect cached
+-- results (e.g. view counters); updates touching only those are skipped.
+CREATE OR REPLACE FUNCTION notify_cache_invalidation()
+RETURNS TRIGGER AS $$
+DECLARE
+    row_id BIGINT;
+BEGIN
+    IF TG_OP = 'UPDATE' AND (to_jsonb(OLD) - TG_ARGV) = (to_jsonb(NEW) - TG_ARGV) THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        row_id := OLD.id;
+    ELSE
+        row_id := NEW.id;
+    END IF;
+
+    PERFORM pg_notify(
+        'cache_invalidation',
+        json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'id', row_id)::text
+    );
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS blogs_cache_invalidation ON blogs;
+CREATE TRIGGER blogs_cache_invalidation AFTER INSERT OR UPDATE OR DELETE ON blogs
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation('view_count', 'updated_at');
+
+DROP TRIGGER IF EXISTS users_cache_invalidation ON users;
+CREATE TRIGGER users_cache_invalidation AFTER INSERT OR UPDATE OR DELETE ON users
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation('last_login', 'updated_at');
+
+DROP TRIGGER IF EXISTS jobs_cache_invalidation ON jobs;
+CREATE TRIGGER jobs_cache_invalidation AFTER INSERT OR UPDATE OR DELETE ON jobs
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation();
+
 -- Insert sample data
 INSERT INTO blogs (title, author, content, tags, status, slug) VALUES
 ('Welcome to PrepNexus', 'Admin', 'Welcome to our AI-powered career preparation platform!', ARRAY['welcome', 'getting-started'], 'published', 'welcome-to-prepnexus'),
@@ -1,18 +1,37 @@
 
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 # Database connection management
 from core.database import db
+from core.deadline import DeadlineMiddleware
+from core.round_trips import RoundTripMiddleware
+from core.rate_limit import RateLimitMiddleware, RateLimitPolicy, TOKEN_BUCKET
+from core.serialization import FastJSONResponse
+from core.cache_warmer import cache_warmer, WarmEndpoint, WarmQuery, RowsOf
+from core.bloom import blog_slugs
+from core import queries
 
 from endpoints import blogs, jobs, aptitude, users, dsa, resume, interview
 
 from modules.seo.rss import  router as rss_router
 from modules.seo.sitemap import router as sitemap_router
+from modules.analytics.tracker import router as analytics_router
 
 
 
+# Cache warm-up manifest: what the first users would otherwise load cold.
+# Query entries must match the endpoint's method, arguments and TTLs;
+# blog pages are warmed by query so warming doesn't count as views.
+WARMUP_MANIFEST = [
+    WarmEndpoint("/api/blogs/"),   # First page of the listing plus the total count
+    WarmEndpoint("/seo/rss.xml"),
+    WarmQuery("fetchrow", queries.BLOGS_BY_ID, RowsOf(queries.BLOGS_TOP_VIEWED_IDS, (10,)), cache_ttl=600, stale_ttl=3600),
+    WarmQuery("fetchrow", queries.BLOGS_BY_SLUG, RowsOf(queries.BLOGS_TOP_VIEWED_SLUGS, (10,)), cache_ttl=600, stale_ttl=3600),
+]
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     
@@ -20,10 +39,23 @@ async def lifespan(app: FastAPI):
     await db.initialize()
     print("🚀 Application started - Database initialized")
     
+    # Warm hot caches in the background; /health/ready reports not ready
+    # until this finishes, and it runs again whenever the cache is cleared
+    cache_warmer.manifest = WARMUP_MANIFEST
+    cache_warmer.start(app)
+    db.add_cache_clear_listener(cache_warmer.rewarm)
+    
+    # Known-slug Bloom filter: built in the background, rebuilt whenever
+    # blogs are invalidated here or on another worker
+    db.add_invalidation_listener(blog_slugs.on_invalidation)
+    blog_slugs.rebuild()
+    
     # Application runs here
     yield
     
     # Application shutdown - cleanup database connections
+    await cache_warmer.stop()
+    await blog_slugs.stop()
     await db.close()
     print("🛑 Application shutdown - Database closed")
 
@@ -35,10 +67,53 @@ app = FastAPI(
                 "interview practice, DSA preparation, and job matching services",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,  # orjson-rendered JSON for every endpoint
     docs_url="/docs",  # Swagger UI documentation
     redoc_url="/redoc"  # ReDoc documentation
 )
 
+# Blog generation makes its Gemini calls one after another. Its budget covers
+# every call's full timeout plus the pauses and the save, so the deadline
+# never cancels it halfway and drops posts already generated.
+GENERATE_BUDGET = blogs.GENERATED_BLOGS_PER_RUN * (float(os.getenv('GENAI_REQUEST_TIMEOUT', '60')) + 1) + 30.0
+
+# Request deadlines: every request gets a time budget that its database,
+# Redis and outbound HTTP calls honor. First matching path prefix wins;
+# None disables the deadline (long-running streaming exports).
+REQUEST_BUDGETS = [
+    ("/api/blogs/generate", GENERATE_BUDGET),
+    ("/api/resume/analyze", 60.0),    # PDF parsing plus one Groq call
+    ("/api/blogs/export", None),
+    ("/analytics/export", None),
+    ("/seo/sitemap.xml", 60.0),
+    ("/health", 5.0),
+]
+app.add_middleware(
+    DeadlineMiddleware,
+    default_budget=float(os.getenv('REQUEST_TIMEOUT', '15')),
+    budgets=REQUEST_BUDGETS
+)
+
+# Reports each request's Redis/database round trips in X-Round-Trips
+app.add_middleware(RoundTripMiddleware)
+
+# LLM-backed endpoints: a per-client limit, plus a shared quota for blog
+# generation. Excess requests get 429 + Retry-After instead of queueing.
+# Added after the deadline and round-trip middleware so rejections skip them,
+# but before CORS so browsers can read the 429.
+RATE_LIMITS = [
+    RateLimitPolicy("/api/blogs/generate", limit=int(os.getenv('RATE_LIMIT_GENERATE_PER_MINUTE', '5')),
+                    algorithm=TOKEN_BUCKET),
+    RateLimitPolicy("/api/blogs/generate", limit=int(os.getenv('RATE_LIMIT_GENERATE_GLOBAL_PER_MINUTE', '30')),
+                    per_client=False),
+    RateLimitPolicy("/api/resume/analyze", limit=int(os.getenv('RATE_LIMIT_ANALYZE_PER_MINUTE', '10'))),
+]
+app.add_middleware(
+    RateLimitMiddleware,
+    policies=RATE_LIMITS,
+    enabled=os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true',
+    trust_proxy=os.getenv('RATE_LIMIT_TRUST_PROXY', 'false').lower() == 'true'
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -80,6 +155,9 @@ app.include_router(redis.router)  # Redis cache management endpoints
 app.include_router(sitemap_router)   # XML sitemap generation
 app.include_router(rss_router)       # RSS feed generation
 
+# User behavior tracking and event export
+app.include_router(analytics_router)
+
 @app.get("/")
 async def root():
     """
@@ -4,11 +4,14 @@ Handled by: Analytics Team
 Responsibilities: User behavior tracking, performance metrics, business intelligence
 """
 from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 import json
 
 from core.database import db
+from core import queries
+from core.streaming import ndjson_stream, NDJSON_MEDIA_TYPE
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
@@ -38,15 +41,49 @@ class AnalyticsTracker:
         if len(self.events) > 1000:
             self.events = self.events[-1000:]
     
+    async def track_events(self, events: List[Dict[str, Any]]) -> int:
+        """Track a batch of user events with a single COPY"""
+        timestamp = datetime.utcnow()
+        batch = [
+            {
+                "event_type": data.get("event_type", "page_view"),
+                "user_id": data.get("user_id"),
+                "data": data,
+                "timestamp": timestamp,
+                "session_id": data.get("session_id"),
+                "page_url": data.get("page_url"),
+                "user_agent": data.get("user_agent")
+            }
+            for data in events
+        ]
+        
+        # Store in database
+        count = await db.copy_records(
+            "analytics_events",
+            [
+                (
+                    event["event_type"],
+                    event["user_id"],
+                    json.dumps(event["data"]),
+                    event["timestamp"],
+                    event["session_id"],
+                    event["page_url"],
+                    event["user_agent"]
+                )
+                for event in batch
+            ],
+            columns=["event_type", "user_id", "data", "timestamp", "session_id", "page_url", "user_agent"]
+        )
+        
+        # Add to memory for real-time analytics, keeping only the last 1000
+        self.events = (self.events + batch)[-1000:]
+        
+        return count
+    
     async def _store_event(self, event: Dict):
         """Store event in database"""
-        query = """
-        INSERT INTO analytics_events (event_type, user_id, data, timestamp, session_id, page_url, user_agent)
-        VALUES ($1, $2, $3, $4, $5, $6, $7)
-        """
-        
         await db.execute(
-            query,
+            queries.ANALYTICS_INSERT_EVENT,
             event["event_type"],
             event["user_id"],
             json.dumps(event["data"]),
@@ -58,32 +95,12 @@ class AnalyticsTracker:
     
     async def get_user_metrics(self, user_id: str) -> Dict[str, Any]:
         """Get user-specific metrics"""
-        query = """
-        SELECT 
-            COUNT(*) as total_events,
-            COUNT(DISTINCT session_id) as total_sessions,
-            MIN(timestamp) as first_visit,
-            MAX(timestamp) as last_visit
-        FROM analytics_events 
-        WHERE user_id = $1
-        """
-        
-        result = await db.fetchrow(query, user_id)
+        result = await db.fetchrow(queries.ANALYTICS_USER_METRICS, user_id)
         return dict(result) if result else {}
     
     async def get_page_analytics(self, page_url: str, days: int = 30) -> Dict[str, Any]:
         """Get page-specific analytics"""
-        query = """
-        SELECT 
-            COUNT(*) as page_views,
-            COUNT(DISTINCT user_id) as unique_users,
-            COUNT(DISTINCT session_id) as unique_sessions
-        FROM analytics_events 
-        WHERE page_url = $1 
-        AND timestamp >= NOW() - INTERVAL '$2 days'
-        """
-        
-        result = await db.fetchrow(query, page_url, days)
+        result = await db.fetchrow(queries.ANALYTICS_PAGE_METRICS, page_url, days)
         return dict(result) if result else {}
     
     async def get_blog_analytics(self, blog_id: int) -> Dict[str, Any]:
@@ -108,6 +125,19 @@ async def track_event(request: Request):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+@router.post("/track/batch")
+async def track_events(request: Request):
+    """Track a batch of user events"""
+    try:
+        data = await request.json()
+        tracker = AnalyticsTracker()
+        
+        count = await tracker.track_events(data.get("events", []))
+        
+        return {"success": True, "message": f"{count} events tracked successfully"}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
 @router.get("/metrics/user/{user_id}")
 async def get_user_metrics(user_id: str):
     """Get user metrics"""
@@ -136,4 +166,10 @@ async def get_blog_analytics(blog_id: int):
         analytics = await tracker.get_blog_analytics(blog_id)
         return {"success": True, "analytics": analytics}
     except Exception as e:
-        return {"success": False, "error": str(e)} 
\ No newline at end of file
+        return {"success": False, "error": str(e)} 
+
+@router.get("/export")
+async def export_events(days: int = 30):
+    """Stream raw events from the last N days as NDJSON"""
+    rows = db.stream(queries.ANALYTICS_EXPORT, days, batch_size=1000)
+    return StreamingResponse(ndjson_stream(rows), media_type=NDJSON_MEDIA_TYPE)
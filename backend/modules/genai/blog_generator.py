@@ -5,21 +5,29 @@ Responsibilities: AI-powered blog content generation using Gemini
 """
 import os
 import aiohttp
+import hashlib
 import json
 import logging
 from typing import Dict, List, Optional
 from datetime import datetime
 import asyncio
+import contextvars
 
 from core.database import db
+from core import queries
+from core.deadline import DeadlineExceeded, timeout as deadline_timeout
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Saves still running, referenced so a cancelled request's save isn't garbage collected
+_pending_saves = set()
+
 class BlogGenerator:
     def __init__(self):
         self.gemini_api_key = os.getenv('GEMINI_API_KEY')
         self.base_url = "https://generativelanguage.googleapis.com/v1/models/gemini-2.5-flash:generateContent"
+        self.request_timeout = float(os.getenv('GENAI_REQUEST_TIMEOUT', '60'))  # Seconds, capped by the request deadline
         
         # Blog topics for generation
         self.blog_topics = [
@@ -122,7 +130,8 @@ Include SEO keywords naturally: placement, internship, interview, resume, DSA, a
         
         prompt = self._get_prompt(author, topic)
         
-        async with aiohttp.ClientSession() as session:
+        timeout = aiohttp.ClientTimeout(total=deadline_timeout(self.request_timeout))
+        async with aiohttp.ClientSession(timeout=timeout) as session:
             async with session.post(
                 f"{self.base_url}?key={self.gemini_api_key}",
                 json={"contents": [{"parts": [{"text": prompt}]}]},
@@ -150,79 +159,138 @@ Include SEO keywords naturally: placement, internship, interview, resume, DSA, a
         query = topic.replace(' ', '+')
         return f"https://source.unsplash.com/800x400/?{query}"
     
+    async def build_blog_post(self, author: Dict, topic: str) -> Dict:
+        """Generate a single blog post's row, without saving it"""
+        logger.info(f"Generating blog post: '{topic}' by {author['name']}")
+        
+        # Generate content
+        content = await self.generate_blog_content(author, topic)
+        
+        # Get image
+        image = await self.get_random_image(topic)
+        
+        # Generate slug
+        slug = f"{datetime.now().strftime('%Y-%m-%d')}-{author['name'].lower().replace(' ', '-')}-{topic.lower().replace(' ', '-').replace(':', '').replace(',', '').replace('.', '')}"
+        slug = ''.join(c for c in slug if c.isalnum() or c == '-')
+        slug = slug[:60]  # Limit length
+        
+        return {
+            "title": topic,
+            "author": author['name'],
+            "avatar": author['avatar'],
+            "content": content,
+            "image": image,
+            "slug": slug
+        }
+    
     async def generate_blog_post(self, author: Dict, topic: str) -> Dict:
-        """Generate a single blog post"""
+        """Generate and save a single blog post"""
         try:
-            logger.info(f"Generating blog post: '{topic}' by {author['name']}")
-            
-            # Generate content
-            content = await self.generate_blog_content(author, topic)
-            
-            # Get image
-            image = await self.get_random_image(topic)
-            
-            # Generate slug
-            slug = f"{datetime.now().strftime('%Y-%m-%d')}-{author['name'].lower().replace(' ', '-')}-{topic.lower().replace(' ', '-').replace(':', '').replace(',', '').replace('.', '')}"
-            slug = ''.join(c for c in slug if c.isalnum() or c == '-')
-            slug = slug[:60]  # Limit length
-            
-            # Save to database
-            blog_id = await self._save_blog_to_db(topic, author, content, image, slug)
-            
-            logger.info(f"Blog post generated successfully: {slug}")
-            
-            return {
-                "id": blog_id,
-                "title": topic,
-                "author": author['name'],
-                "slug": slug,
-                "url": f"https://prepnexus.netlify.app/blog/{blog_id}"
-            }
+            post = await self.build_blog_post(author, topic)
+            saved = await self._save_blogs_to_db([post])
+            if not saved:
+                raise Exception(f"Blog with slug {post['slug']} already exists")
+            return saved[0]
             
         except Exception as e:
             logger.error(f"Failed to generate blog post: {e}")
             raise
     
     async def generate_blogs(self, count: int = 4) -> List[Dict]:
-        """Generate multiple blogs"""
-        generated_blogs = []
+        """Generate multiple blogs, then save them together"""
+        posts = []
         
-        for i in range(count):
-            try:
-                author = self.blog_authors[i % len(self.blog_authors)]
-                topic = self.blog_topics[i % len(self.blog_topics)]
-                
-                blog = await self.generate_blog_post(author, topic)
-                generated_blogs.append(blog)
-                
-                # Small delay between generations
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Failed to generate blog {i+1}: {e}")
-                continue
+        try:
+            for i in range(count):
+                try:
+                    author = self.blog_authors[i % len(self.blog_authors)]
+                    topic = self.blog_topics[i % len(self.blog_topics)]
+                    
+                    posts.append(await self.build_blog_post(author, topic))
+                    
+                    # Small delay between generations
+                    await asyncio.sleep(1)
+                    
+                except DeadlineExceeded:
+                    # Out of time: save what was generated instead of failing every remaining blog
+                    logger.warning(f"Blog generation stopped after {len(posts)} blogs: request deadline reached")
+                    break
+                except Exception as e:
+                    logger.error(f"Failed to generate blog {i+1}: {e}")
+                    continue
+        except asyncio.CancelledError:
+            # The request was cancelled mid-generation: still keep the posts already generated
+            if posts:
+                logger.warning(f"Blog generation cancelled after {len(posts)} blogs, saving them")
+                self._start_save(posts)
+            raise
         
-        return generated_blogs
+        if not posts:
+            return []
+        return await asyncio.shield(self._start_save(posts))
+    
+    def _start_save(self, posts: List[Dict]) -> asyncio.Task:
+        """
+        Save posts in a task of their own.
+        
+        The generated content is the expensive part, so the save runs outside
+        the request deadline and finishes even if the request is cancelled.
+        """
+        task = asyncio.create_task(self._save_blogs_to_db(posts), context=contextvars.Context())
+        _pending_saves.add(task)
+        task.add_done_callback(_pending_saves.discard)
+        return task
     
-    async def _save_blog_to_db(self, title: str, author: Dict, content: str, image: str, slug: str) -> int:
-        """Save blog to database"""
-        query = """
-        INSERT INTO blogs (title, author, avatar, content, image, slug, tags, date)
-        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-        RETURNING id
+    async def _save_blogs_to_db(self, posts: List[Dict]) -> List[Dict]:
         """
+        Save blogs with one bulk insert and return the saved ones with their ids.
         
+        Posts whose slug is already taken are skipped, as a per-post insert
+        would have failed on them, rather than failing the whole batch. The
+        slug check, insert and id lookup run in one transaction on a single
+        connection; its reads bypass the query cache, which can be minutes
+        behind, and the blogs cache is invalidated once on commit.
+        """
+        slugs = [post["slug"] for post in posts]
         tags = ['Career', 'Tips', 'Interview']
-        date = datetime.now().strftime('%Y-%m-%d')
+        today = datetime.now().date()
+        
+        async with db.transaction() as tx:
+            existing = {row["slug"] for row in await tx.fetch(queries.BLOGS_IDS_BY_SLUGS, slugs)}
+            
+            new_posts = []
+            for post in posts:
+                if post["slug"] in existing:
+                    logger.warning(f"Skipping blog post {post['slug']}: slug already exists")
+                    continue
+                existing.add(post["slug"])
+                new_posts.append(post)
+            if not new_posts:
+                return []
+            
+            # ON CONFLICT skips a slug another save took since the check above
+            await tx.executemany(queries.BLOGS_INSERT_IF_NEW, [
+                (post["title"], post["author"], post["content"], post["image"], tags, post["slug"], post["avatar"], today)
+                for post in new_posts
+            ])
+            
+            # executemany does not return rows; slugs are unique, so look the ids up by them
+            new_slugs = [post["slug"] for post in new_posts]
+            rows = {row["slug"]: row for row in await tx.fetch(queries.BLOGS_IDS_BY_SLUGS, new_slugs)}
         
-        return await db.fetchval(
-            query, 
-            title, 
-            author['name'], 
-            author['avatar'], 
-            content, 
-            image,
-            slug,
-            tags,
-            date
-        ) 
\ No newline at end of file
+        saved = []
+        for post in new_posts:
+            row = rows.get(post["slug"])
+            if row is None or row["content_md5"] != hashlib.md5(post["content"].encode()).hexdigest():
+                logger.warning(f"Skipping blog post {post['slug']}: slug taken by a concurrent save")
+                continue
+            blog_id = row["id"]
+            logger.info(f"Blog post generated successfully: {post['slug']}")
+            saved.append({
+                "id": blog_id,
+                "title": post["title"],
+                "author": post["author"],
+                "slug": post["slug"],
+                "url": f"https://prepnexus.netlify.app/blog/{blog_id}"
+            })
+        return saved 
\ No newline at end of file
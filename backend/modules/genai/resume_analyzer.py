@@ -10,6 +10,8 @@ import asyncio
 from typing import Dict, List, Optional, Any
 from dotenv import load_dotenv
 
+from core.deadline import timeout as deadline_timeout
+
 # Load environment variables
 load_dotenv()
 
@@ -18,6 +20,7 @@ class ResumeAnalyzer:
         self.groq_api_key = os.getenv('GROQ_API_KEY')
         self.groq_model = os.getenv('GROQ_MODEL', 'llama3-8b-8192')
         self.base_url = "https://api.groq.com/openai/v1/chat/completions"
+        self.request_timeout = float(os.getenv('GENAI_REQUEST_TIMEOUT', '60'))  # Seconds, capped by the request deadline
         
         if not self.groq_api_key:
             print("⚠️ Warning: GROQ_API_KEY not found. Resume analysis will use fallback mode.")
@@ -32,7 +35,8 @@ class ResumeAnalyzer:
             prompt = self._create_analysis_prompt(resume_text)
             
             # Call Groq API
-            async with aiohttp.ClientSession() as session:
+            timeout = aiohttp.ClientTimeout(total=deadline_timeout(self.request_timeout))
+            async with aiohttp.ClientSession(timeout=timeout) as session:
                 headers = {
                     "Authorization": f"Bearer {self.groq_api_key}",
                     "Content-Type": "application/json"
@@ -11,6 +11,7 @@ import xml.etree.ElementTree as ET
 from xml.dom import minidom
 
 from core.database import db
+from core import queries
 
 router = APIRouter(prefix="/seo", tags=["seo"])
 
@@ -87,13 +88,7 @@ class RSSGenerator:
     
     async def _get_recent_blogs(self, limit: int = 20) -> List[Dict]:
         """Get recent blogs from database"""
-        query = """
-        SELECT id, title, content, created_at 
-        FROM blogs 
-        ORDER BY created_at DESC 
-        LIMIT $1
-        """
-        return await db.fetch(query, limit)
+        return await db.fetch(queries.BLOGS_RECENT_FOR_FEED, limit)
 
 @router.get("/rss.xml")
 async def get_rss():
@@ -3,38 +3,51 @@ Sitemap Generation Service
 Handled by: SEO Team
 Responsibilities: Generate dynamic sitemap.xml, ping search engines
 """
-from fastapi import APIRouter, Response
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator
+from xml.sax.saxutils import escape
+
+from core.database import db
+from core import queries
+from core.streaming import buffered
 
 router = APIRouter(prefix="/seo", tags=["seo"])
 
-@router.get("/sitemap.xml")
-async def get_sitemap():
-    # Minimal, hardcoded sitemap with only a few working URLs
-    sitemap_content = '''<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-  <url>
-    <loc>https://prepnexus.netlify.app/</loc>
-    <changefreq>daily</changefreq>
-    <priority>1.0</priority>
-  </url>
-  <url>
-    <loc>https://prepnexus.netlify.app/blog</loc>
-    <changefreq>weekly</changefreq>
-    <priority>0.8</priority>
-  </url>
-  <url>
-    <loc>https://prepnexus.netlify.app/blog/40</loc>
-    <changefreq>weekly</changefreq>
-    <priority>0.7</priority>
-  </url>
-  <url>
-    <loc>https://prepnexus.netlify.app/blog/39</loc>
-    <changefreq>weekly</changefreq>
-    <priority>0.7</priority>
+BASE_URL = "https://prepnexus.netlify.app"
+
+# Pages that are always listed, with their change frequency and priority
+STATIC_PAGES = [
+    ("/", "daily", "1.0"),
+    ("/blog", "weekly", "0.8"),
+]
+
+def _url_entry(loc: str, changefreq: str, priority: str, lastmod: str = None) -> str:
+    """Render a single <url> element"""
+    lastmod_tag = f"\n    <lastmod>{lastmod}</lastmod>" if lastmod else ""
+    return f'''  <url>
+    <loc>{escape(loc)}</loc>{lastmod_tag}
+    <changefreq>{changefreq}</changefreq>
+    <priority>{priority}</priority>
   </url>
-</urlset>
 '''
-    return Response(content=sitemap_content, media_type="application/xml")
+
+async def _sitemap_lines() -> AsyncIterator[str]:
+    """Static pages followed by every blog post, streamed from the database"""
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for path, changefreq, priority in STATIC_PAGES:
+        yield _url_entry(f"{BASE_URL}{path}", changefreq, priority)
+    
+    async for blog in db.stream(queries.BLOGS_FOR_SITEMAP, batch_size=1000):
+        lastmod = blog["created_at"].strftime("%Y-%m-%d") if blog["created_at"] else None
+        yield _url_entry(f"{BASE_URL}/blog/{blog['id']}", "weekly", "0.7", lastmod)
+    
+    yield '</urlset>\n'
+
+@router.get("/sitemap.xml")
+async def get_sitemap():
+    """Generate sitemap.xml with every blog post, streamed with constant memory"""
+    return StreamingResponse(buffered(_sitemap_lines()), media_type="application/xml")
 
 @router.post("/ping-sitemap")
 async def ping_search_engines():
@@ -0,0 +1,93 @@
+"""
+Cache Codec Tests
+Purpose: Cached values keep their Python types through every serializer and
+compression combination, and values in older formats stay readable
+"""
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from core import cache_codec, queries
+from core.cache_codec import CacheCodec
+from core.redis_manager import redis_manager
+
+ROW = {
+    "id": 7,
+    "title": "Typed values",
+    "created_at": datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+    "updated_at": datetime(2024, 1, 2, 3, 4, 5),
+    "date": date(2024, 1, 2),
+    "price": Decimal("1234.5600"),
+    "session_id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "tags": ["Career", "Tips"],
+    "meta": {"nested": [Decimal("0.1"), None, True]},
+    "avatar": None
+}
+
+def _require(serializer: str, compression: str):
+    if serializer == "orjson" and cache_codec.orjson is None:
+        pytest.skip("orjson is not installed")
+    if serializer == "msgpack" and cache_codec.msgpack is None:
+        pytest.skip("msgpack is not installed")
+    if compression == "zstd" and cache_codec.zstandard is None:
+        pytest.skip("zstandard is not installed")
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "zstd"])
+@pytest.mark.parametrize("serializer", ["json", "orjson", "msgpack"])
+def test_round_trip_keeps_types(serializer, compression):
+    _require(serializer, compression)
+    codec = CacheCodec(serializer=serializer, compression=compression, compress_threshold=0)
+    value = [ROW, dict(ROW, id=8)]
+    
+    decoded = codec.decode(codec.encode(value))
+    
+    assert decoded == value
+    for key, item in ROW.items():
+        assert type(decoded[0][key]) is type(item), key
+    assert decoded[0]["created_at"].tzinfo is not None
+    assert str(decoded[0]["price"]) == "1234.5600"
+
+@pytest.mark.parametrize("serializer", ["json", "orjson", "msgpack"])
+def test_large_values_are_compressed(serializer):
+    _require(serializer, "auto")
+    codec = CacheCodec(serializer=serializer, compress_threshold=1024)
+    value = [dict(ROW, id=i, content="<p>placement tips</p>" * 50) for i in range(20)]
+    
+    data = codec.encode(value)
+    
+    assert codec.get_stats()["compressed"] == 1
+    assert len(data) < len(json.dumps(value, default=str))
+    assert codec.decode(data) == value
+
+def test_values_are_readable_by_any_codec():
+    writer = CacheCodec(serializer="json", compression="zlib", compress_threshold=0)
+    reader = CacheCodec()
+    
+    assert reader.decode(writer.encode(ROW)) == ROW
+
+def test_legacy_json_is_readable():
+    codec = CacheCodec()
+    
+    assert codec.decode(json.dumps({"a": 1, "b": [1, 2]})) == {"a": 1, "b": [1, 2]}
+    assert codec.get_stats()["legacy_decoded"] == 1
+
+def test_plain_dicts_that_look_like_tags_are_kept():
+    codec = CacheCodec(serializer="json")
+    
+    assert codec.decode(codec.encode({"$dt": 5, "other": {"$uuid": 1}})) == {"$dt": 5, "other": {"$uuid": 1}}
+
+@pytest.mark.anyio
+async def test_rows_read_back_from_redis_keep_their_types(database):
+    row = await database.fetchrow(queries.BLOGS_BY_ID, 1)
+    database._local_cache.clear()  # Force the next read through Redis
+    hits = redis_manager.get_cache_stats()["hits"]
+    
+    cached = await database.fetchrow(queries.BLOGS_BY_ID, 1)
+    
+    assert redis_manager.get_cache_stats()["hits"] == hits + 1
+    assert cached == row
+    assert type(cached["created_at"]) is type(row["created_at"])
+    assert type(cached["date"]) is type(row["date"])
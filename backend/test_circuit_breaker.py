@@ -0,0 +1,116 @@
+"""
+Circuit Breaker Tests
+Purpose: The database breaker opens after repeated outages, serves cached
+SELECTs from the stale cache while open and closes after a half-open probe
+"""
+import asyncio
+import time
+
+import pytest
+
+from core import queries
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def outage(database, monkeypatch):
+    """Toggle a database outage; counts the statements that reached the tables meanwhile"""
+    class Outage:
+        down = False
+        attempts = 0
+    
+    run = database._memory_db.run
+    
+    def maybe_fail(sql, args):
+        if Outage.down:
+            Outage.attempts += 1
+            raise ConnectionRefusedError("database unreachable")
+        return run(sql, args)
+    
+    monkeypatch.setattr(database._memory_db, "run", maybe_fail)
+    database._breaker.failure_threshold = 2
+    database._breaker.reset_timeout = 0.2
+    return Outage
+
+@pytest.fixture
+def expire_cache(monkeypatch):
+    """Move time.time() past every cache TTL used here; the breaker runs on monotonic time"""
+    real_time = time.time
+    
+    def expire():
+        monkeypatch.setattr(time, "time", lambda: real_time() + 30)
+    
+    return expire
+
+async def open_breaker(database, outage):
+    outage.down = True
+    for _ in range(database._breaker.failure_threshold):
+        with pytest.raises(ConnectionRefusedError):
+            await database.fetchrow(queries.USERS_PROFILE, 1, use_cache=False)
+
+async def test_opens_and_fails_fast(database, outage):
+    await open_breaker(database, outage)
+    attempts = outage.attempts
+    
+    with pytest.raises(CircuitOpenError):
+        await database.fetchrow(queries.USERS_PROFILE, 1, use_cache=False)
+    
+    assert outage.attempts == attempts
+    stats = database.get_circuit_breaker_stats()
+    assert stats["state"] == "open"
+    assert stats["transitions"] == {"closed_to_open": 1}
+
+async def test_serves_stale_cache_while_open(database, outage, expire_cache):
+    rows = await database.fetch(queries.BLOGS_LIST, 20, 0, cache_ttl=10)
+    expire_cache()
+    await open_breaker(database, outage)
+    attempts = outage.attempts
+    
+    assert await database.fetch(queries.BLOGS_LIST, 20, 0, cache_ttl=10) == rows
+    
+    assert outage.attempts == attempts
+    assert database.get_circuit_breaker_stats()["stale_if_error_served"] == 1
+
+async def test_serves_stale_cache_when_a_query_fails(database, outage, expire_cache):
+    rows = await database.fetch(queries.BLOGS_LIST, 20, 0, cache_ttl=10)
+    expire_cache()
+    outage.down = True
+    
+    assert await database.fetch(queries.BLOGS_LIST, 20, 0, cache_ttl=10) == rows
+    
+    assert outage.attempts > 0
+    assert database.get_circuit_breaker_stats()["stale_if_error_served"] == 1
+
+async def test_half_open_probe_closes_the_circuit(database, outage):
+    await open_breaker(database, outage)
+    outage.down = False
+    await asyncio.sleep(0.25)
+    
+    assert database.get_circuit_breaker_stats()["state"] == "half_open"
+    assert await database.fetchrow(queries.USERS_PROFILE, 1, use_cache=False) is not None
+    
+    stats = database.get_circuit_breaker_stats()
+    assert stats["state"] == "closed"
+    assert stats["transitions"] == {"closed_to_open": 1, "open_to_half_open": 1, "half_open_to_closed": 1}
+
+async def test_failed_probe_reopens_the_circuit(database, outage):
+    await open_breaker(database, outage)
+    await asyncio.sleep(0.25)
+    
+    with pytest.raises(ConnectionRefusedError):
+        await database.fetchrow(queries.USERS_PROFILE, 1, use_cache=False)
+    
+    stats = database.get_circuit_breaker_stats()
+    assert stats["state"] == "open"
+    assert stats["transitions"]["half_open_to_open"] == 1
+
+def test_half_open_admits_limited_probes():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.0, half_open_max_calls=1)
+    breaker.record_failure(ConnectionRefusedError())
+    
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.release()
+    breaker.before_call()
@@ -0,0 +1,103 @@
+"""
+Request Deadline Tests
+Purpose: Requests that run past their time budget are cancelled and answered
+with 504, without leaking connections or tripping the database breaker
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+import main
+from core import queries
+from core.deadline import DeadlineExceeded, DeadlineMiddleware, deadline_scope, get_deadline_stats
+from endpoints import blogs
+from modules.genai.blog_generator import BlogGenerator
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def client(database):
+    app = FastAPI()
+    app.add_middleware(DeadlineMiddleware, default_budget=0.1, budgets=[("/export", None), ("/slow-ok", 0.5)])
+    
+    @app.get("/sleep")
+    async def sleep():
+        await asyncio.sleep(1)
+        return {}
+    
+    @app.get("/slow-ok")
+    async def slow_ok():
+        await asyncio.sleep(0.2)
+        return {"ok": True}
+    
+    @app.get("/export")
+    async def export():
+        await asyncio.sleep(0.2)
+        return {"ok": True}
+    
+    @app.get("/query")
+    async def query():
+        try:
+            return await database.fetch(queries.BLOGS_LIST, 20, 0, use_cache=False)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to fetch blogs: {e}")
+    
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+async def test_request_over_budget_gets_504(client):
+    timed_out = get_deadline_stats()["timed_out"]
+    started = time.perf_counter()
+    
+    response = await client.get("/sleep")
+    
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request deadline exceeded"}
+    assert time.perf_counter() - started < 0.5
+    assert get_deadline_stats()["timed_out"] == timed_out + 1
+
+async def test_route_budgets_override_the_default(client):
+    assert (await client.get("/slow-ok")).status_code == 200
+    assert (await client.get("/export")).status_code == 200
+
+async def test_upstream_header_shortens_the_budget(client):
+    response = await client.get("/slow-ok", headers={"x-request-timeout-ms": "50"})
+    
+    assert response.status_code == 504
+
+async def test_slow_query_gets_504_and_releases_its_connection(database, client):
+    database._pool._latency = 0.5
+    
+    response = await client.get("/query")
+    
+    assert response.status_code == 504
+    assert database._pool_controller.get_stats()["in_use"] == 0
+    # Running out of time is not a database outage
+    assert database.get_circuit_breaker_stats()["failures"] == 0
+
+async def test_expired_deadline_fails_before_querying(database, statements):
+    with deadline_scope(0.001):
+        await asyncio.sleep(0.01)
+        with pytest.raises(DeadlineExceeded):
+            await database.fetch(queries.BLOGS_LIST, 20, 0, use_cache=False)
+    
+    assert statements == []
+
+async def test_stale_entry_served_when_the_deadline_hits(database, monkeypatch):
+    rows = await database.fetch(queries.BLOGS_LIST, 20, 0, cache_ttl=10)
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 30)
+    database._pool._latency = 0.5
+    
+    with deadline_scope(0.1):
+        assert await database.fetch(queries.BLOGS_LIST, 20, 0, cache_ttl=10) == rows
+    
+    assert database.get_circuit_breaker_stats()["stale_if_error_served"] == 1
+
+def test_generate_budget_covers_every_ai_call():
+    budgets = dict(main.REQUEST_BUDGETS)
+    
+    assert budgets["/api/blogs/generate"] > blogs.GENERATED_BLOGS_PER_RUN * BlogGenerator().request_timeout
@@ -0,0 +1,127 @@
+"""
+Negative Cache and Known-Slug Filter Tests
+Purpose: Lookups for blogs that don't exist are answered without reaching
+the database, and stop being cached as missing once the blog is created
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from core import bloom, queries
+from core.bloom import BloomFilter, KnownKeys
+from endpoints import blogs
+
+pytestmark = pytest.mark.anyio
+
+BY_ID_SQL = " ".join(queries.BLOGS_BY_ID.sql.split())
+BY_SLUG_SQL = " ".join(queries.BLOGS_BY_SLUG.sql.split())
+
+@pytest.fixture
+def slugs(database, monkeypatch):
+    """A known-slug filter over the test database, wired to its invalidations"""
+    known = KnownKeys("blog_slugs", queries.BLOGS_ALL_SLUGS, "slug", tables=("blogs",))
+    monkeypatch.setattr(bloom, "db", database)
+    monkeypatch.setattr(blogs, "db", database)
+    monkeypatch.setattr(blogs, "blog_slugs", known)
+    database.add_invalidation_listener(known.on_invalidation)
+    return known
+
+@pytest.fixture
+async def client(slugs):
+    app = FastAPI()
+    app.include_router(blogs.router, prefix="/api")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    await slugs.stop()
+
+async def test_unknown_slug_is_rejected_without_a_query(database, statements, slugs, client):
+    await slugs.rebuild()
+    statements.clear()
+    
+    response = await client.get("/api/blogs/slug/no-such-post")
+    
+    assert response.status_code == 404
+    assert statements == []
+    assert slugs.get_stats()["rejected"] == 1
+
+async def test_known_slug_is_looked_up(database, statements, slugs, client):
+    await slugs.rebuild()
+    slug = next(iter(database._memory_db.blogs.values()))["slug"]
+    
+    response = await client.get(f"/api/blogs/slug/{slug}")
+    
+    assert response.status_code == 200
+    assert response.json()["slug"] == slug
+    assert BY_SLUG_SQL in statements
+
+async def test_unknown_slug_is_negatively_cached_until_the_filter_is_ready(database, statements, slugs, client):
+    slugs.retry_interval = 3600  # Keep the filter unbuilt
+    slugs._last_attempt = time.monotonic()
+    
+    for _ in range(3):
+        assert (await client.get("/api/blogs/slug/no-such-post")).status_code == 404
+    
+    assert statements.count(BY_SLUG_SQL) == 1
+    assert slugs.get_stats()["unavailable"] == 3
+
+async def test_unknown_id_is_negatively_cached(database, statements, client):
+    for _ in range(3):
+        assert (await client.get("/api/blogs/9999")).status_code == 404
+    
+    assert statements.count(BY_ID_SQL) == 1
+    assert database.get_negative_cache_stats()["hits"] == 2
+
+async def test_expired_negative_entry_is_a_miss(database, statements, client, monkeypatch):
+    assert (await client.get("/api/blogs/9999")).status_code == 404
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + database._negative_cache_ttl + 1)
+    
+    assert (await client.get("/api/blogs/9999")).status_code == 404
+    
+    assert statements.count(BY_ID_SQL) == 2
+
+async def test_creating_a_blog_clears_its_negative_entries(database, slugs, client):
+    await slugs.rebuild()
+    next_id = database._memory_db._next_ids["blogs"]
+    assert (await client.get(f"/api/blogs/{next_id}")).status_code == 404
+    assert (await client.get("/api/blogs/slug/fresh-post")).status_code == 404
+    
+    created = await client.post("/api/blogs/", params={"title": "Fresh Post", "author": "Test", "content": "<p>Hi</p>"})
+    assert created.status_code == 200
+    assert created.json()["id"] == next_id
+    await slugs.rebuild()  # Joins the rebuild the invalidation started
+    
+    assert slugs.is_ready()
+    assert (await client.get(f"/api/blogs/{next_id}")).status_code == 200
+    assert (await client.get("/api/blogs/slug/fresh-post")).status_code == 200
+
+async def test_invalidation_during_a_build_builds_again(database, slugs):
+    database._pool._latency = 0.05  # Keep the first build streaming
+    task = slugs.rebuild()
+    await asyncio.sleep(0.01)
+    
+    slugs.on_invalidation(("blogs",))
+    assert not slugs.is_ready()
+    await task
+    
+    assert slugs.get_stats()["builds"] == 2
+    assert slugs.is_ready()
+
+async def test_other_tables_leave_the_filter_alone(database, slugs):
+    await slugs.rebuild()
+    
+    slugs.on_invalidation(("users",))
+    
+    assert slugs.is_ready()
+    assert slugs.get_stats()["builds"] == 1
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom_filter = BloomFilter(1000, 0.01)
+    for i in range(1000):
+        bloom_filter.add(f"slug-{i}")
+    
+    assert all(f"slug-{i}" in bloom_filter for i in range(1000))
+    assert sum(f"other-{i}" in bloom_filter for i in range(10000)) < 300
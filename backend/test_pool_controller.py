@@ -0,0 +1,125 @@
+"""
+Pool Controller Tests
+Purpose: The admission gate holds callers to the adaptive limit, hands
+released slots to queued callers in order and never loses a slot or a wakeup
+"""
+import asyncio
+
+import pytest
+
+from core.memory_database import MemoryDatabase, MemoryPool
+from core.pool_controller import PoolController
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def controller():
+    pool = MemoryPool(MemoryDatabase(seed_blogs=0), min_size=1, max_size=8)
+    return PoolController("test", pool, min_size=1, max_size=4, initial_size=1, acquire_timeout=1.0)
+
+class Holder:
+    """A caller holding a connection until released"""
+    def __init__(self, controller: PoolController):
+        self.acquired = asyncio.Event()
+        self.done = asyncio.Event()
+        self.task = asyncio.create_task(self._hold(controller))
+    
+    async def _hold(self, controller: PoolController):
+        async with controller.acquire():
+            self.acquired.set()
+            await self.done.wait()
+    
+    async def release(self):
+        self.done.set()
+        await self.task
+
+async def wait_until(condition):
+    while not condition():
+        await asyncio.sleep(0)
+
+async def test_callers_queue_at_the_limit_and_are_admitted_in_order(controller):
+    holders = [Holder(controller) for _ in range(3)]
+    await holders[0].acquired.wait()
+    await wait_until(lambda: controller.get_stats()["waiting"] == 2)
+    
+    assert controller.get_stats()["in_use"] == 1
+    assert not holders[1].acquired.is_set()
+    
+    await holders[0].release()
+    await holders[1].acquired.wait()
+    assert not holders[2].acquired.is_set()
+    await holders[1].release()
+    await holders[2].release()
+    
+    stats = controller.get_stats()
+    assert (stats["in_use"], stats["waiting"], stats["acquires"]) == (0, 0, 3)
+
+async def test_acquire_times_out_at_the_limit(controller):
+    controller.acquire_timeout = 0.05
+    holder = Holder(controller)
+    await holder.acquired.wait()
+    
+    with pytest.raises(asyncio.TimeoutError):
+        async with controller.acquire():
+            pass
+    # A caller's own shorter timeout is not a pool timeout
+    with pytest.raises(asyncio.TimeoutError):
+        async with controller.acquire(timeout=0.01):
+            pass
+    
+    assert controller.get_stats()["timeouts"] == 1
+    assert controller.get_stats()["waiting"] == 0
+    await holder.release()
+    async with controller.acquire():
+        pass
+
+async def test_cancelled_waiter_does_not_strand_the_next_one(controller):
+    async with controller.acquire():
+        cancelled = Holder(controller)
+        waiting = Holder(controller)
+        await wait_until(lambda: controller.get_stats()["waiting"] == 2)
+    # Leaving the block handed the slot to the first waiter; cancel it
+    # before it gets to run
+    cancelled.task.cancel()
+    await asyncio.gather(cancelled.task, return_exceptions=True)
+    
+    assert cancelled.task.cancelled()
+    await asyncio.wait_for(waiting.acquired.wait(), 0.5)
+    await waiting.release()
+    assert controller.get_stats()["in_use"] == 0
+
+async def test_cancelled_callers_never_leak_slots(controller):
+    holders = [Holder(controller) for _ in range(4)]
+    await holders[0].acquired.wait()
+    await wait_until(lambda: controller.get_stats()["waiting"] == 3)
+    
+    for holder in holders:
+        holder.task.cancel()
+    await asyncio.gather(*(holder.task for holder in holders), return_exceptions=True)
+    
+    assert controller.get_stats()["in_use"] == 0
+    assert controller.get_stats()["waiting"] == 0
+    async with controller.acquire():
+        pass
+
+async def test_growing_the_limit_admits_queued_callers(controller):
+    holder = Holder(controller)
+    await holder.acquired.wait()
+    waiting = Holder(controller)
+    await wait_until(lambda: controller.get_stats()["waiting"] == 1)
+    
+    assert await controller.evaluate() == 2
+    
+    await asyncio.wait_for(waiting.acquired.wait(), 0.5)
+    assert controller.get_stats()["grows"] == 1
+    await holder.release()
+    await waiting.release()
+
+async def test_limit_shrinks_after_idle_windows(controller):
+    controller.limit = 4
+    controller.shrink_after = 2
+    
+    assert await controller.evaluate() == 4
+    assert await controller.evaluate() == 3
+    
+    assert controller.get_stats()["shrinks"] == 1
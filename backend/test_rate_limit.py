@@ -0,0 +1,163 @@
+"""
+Rate Limiting Tests
+Purpose: Rate-limit policies answer 429 with an accurate Retry-After, using
+atomic Redis scripts and an in-process limiter while Redis is down
+"""
+import asyncio
+import math
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from core.memory_redis import MemoryRedis
+from core.rate_limit import (
+    RateLimitMiddleware, RateLimitPolicy, TOKEN_BUCKET, get_rate_limit_stats,
+    sliding_window_step, token_bucket_step
+)
+from core.redis_manager import redis_manager
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(params=["memory", "lua"])
+def redis_client(request, monkeypatch):
+    """The Redis manager on the in-memory client, or on fakeredis running the real Lua scripts"""
+    if request.param == "lua":
+        fakeredis = pytest.importorskip("fakeredis.aioredis")
+        pytest.importorskip("lupa")
+        client = fakeredis.FakeRedis(decode_responses=False)
+    else:
+        client = MemoryRedis()
+    monkeypatch.setattr(redis_manager, "_redis", client)
+    monkeypatch.setattr(redis_manager, "_is_connected", True)
+    monkeypatch.setattr(redis_manager, "_scripts", {})
+    return client
+
+@pytest.fixture
+async def make_client(redis_client):
+    """An HTTP client for an app limited by the given policies"""
+    clients = []
+    
+    def make(*policies, **options):
+        app = FastAPI()
+        
+        @app.post("/limited")
+        async def limited():
+            return {"ok": True}
+        
+        @app.get("/limited")
+        async def unlimited():
+            return {"ok": True}
+        
+        app.add_middleware(RateLimitMiddleware, policies=policies, **options)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        clients.append(client)
+        return client
+    
+    yield make
+    for client in clients:
+        await client.aclose()
+
+def test_sliding_window_retry_after_is_when_the_request_fits():
+    state = None
+    for _ in range(3):
+        state, (allowed, _, _) = sliding_window_step(state, 100, 3, 1000)
+        assert allowed
+    
+    state, (allowed, remaining, retry_ms) = sliding_window_step(state, 100, 3, 1000)
+    
+    assert (allowed, remaining) == (False, 0)
+    # The next window starts at 1000 with 3 previous hits; a fourth fits once
+    # a third of it has passed
+    assert retry_ms == math.ceil(1000 - 100 + 1000 / 3)
+    assert not sliding_window_step(state, 100 + retry_ms - 2, 3, 1000)[1][0]
+    assert sliding_window_step(state, 100 + retry_ms, 3, 1000)[1][0]
+
+def test_token_bucket_retry_after_is_when_a_token_refills():
+    state = None
+    for _ in range(3):
+        state, (allowed, _, _) = token_bucket_step(state, 0, 3, 3)
+        assert allowed
+    
+    state, (allowed, _, retry_ms) = token_bucket_step(state, 0, 3, 3)
+    
+    assert not allowed
+    assert retry_ms == 334
+    assert not token_bucket_step(state, retry_ms - 10, 3, 3)[1][0]
+    assert token_bucket_step(state, retry_ms, 3, 3)[1][0]
+
+async def test_sliding_window_script(redis_client):
+    results = [await redis_manager.sliding_window("test:sliding", 3, 1000) for _ in range(4)]
+    
+    assert [result[:2] for result in results[:3]] == [(True, 2), (True, 1), (True, 0)]
+    allowed, remaining, retry_ms = results[3]
+    assert (allowed, remaining) == (False, 0)
+    assert 0 < retry_ms <= math.ceil(1000 + 1000 / 3)
+
+async def test_token_bucket_script(redis_client):
+    results = [await redis_manager.token_bucket("test:bucket", 3, 10) for _ in range(4)]
+    
+    assert [result[0] for result in results] == [True, True, True, False]
+    assert 0 < results[3][2] <= 100
+    await asyncio.sleep(0.15)
+    assert (await redis_manager.token_bucket("test:bucket", 3, 10))[0]
+
+async def test_fixed_window_script_keeps_its_expiry(redis_client):
+    assert await redis_manager.increment_rate_limit("test:fixed", 10) == 1
+    ttl = await redis_client.ttl("test:fixed")
+    
+    assert await redis_manager.increment_rate_limit("test:fixed", 10) == 2
+    
+    assert 0 < await redis_client.ttl("test:fixed") <= ttl
+
+async def test_limit_exceeded_answers_429_with_retry_after(make_client):
+    client = make_client(RateLimitPolicy("/limited", limit=3, window_seconds=60))
+    limited = get_rate_limit_stats()["limited"]
+    if time.time() % 60 > 59:
+        await asyncio.sleep(60 - time.time() % 60)  # Keep every hit in one window
+    
+    responses = [await client.post("/limited") for _ in range(3)]
+    started = time.time()
+    responses.append(await client.post("/limited"))
+    finished = time.time()
+    
+    assert [response.status_code for response in responses] == [200, 200, 200, 429]
+    assert [response.headers["x-ratelimit-remaining"] for response in responses] == ["2", "1", "0", "0"]
+    # Until the window ends, then a third of the next one for the 3 hits to slide out
+    retry_after = int(responses[3].headers["retry-after"])
+    assert math.ceil(60 - finished % 60 + 20) <= retry_after <= math.ceil(60 - started % 60 + 20)
+    assert get_rate_limit_stats()["limited"] == limited + 1
+
+async def test_policies_apply_per_client_and_method(make_client):
+    client = make_client(RateLimitPolicy("/limited", limit=1), trust_proxy=True)
+    
+    assert (await client.post("/limited", headers={"x-forwarded-for": "10.0.0.1"})).status_code == 200
+    assert (await client.post("/limited", headers={"x-forwarded-for": "10.0.0.1"})).status_code == 429
+    assert (await client.post("/limited", headers={"x-forwarded-for": "10.0.0.2"})).status_code == 200
+    assert (await client.get("/limited", headers={"x-forwarded-for": "10.0.0.1"})).status_code == 200
+
+async def test_global_quota_is_shared_by_clients(make_client):
+    client = make_client(RateLimitPolicy("/limited", limit=2, per_client=False), trust_proxy=True)
+    
+    codes = [(await client.post("/limited", headers={"x-forwarded-for": f"10.0.0.{i}"})).status_code for i in range(3)]
+    
+    assert codes == [200, 200, 429]
+
+async def test_token_bucket_policy_retry_after(make_client):
+    client = make_client(RateLimitPolicy("/limited", limit=2, window_seconds=10, algorithm=TOKEN_BUCKET))
+    
+    responses = [await client.post("/limited") for _ in range(3)]
+    
+    assert responses[2].status_code == 429
+    assert responses[2].headers["retry-after"] == "5"  # One token every 5 seconds
+
+async def test_falls_back_to_the_local_limiter_without_redis(make_client, monkeypatch):
+    client = make_client(RateLimitPolicy("/limited", limit=2))
+    monkeypatch.setattr(redis_manager, "_is_connected", False)
+    fallback = get_rate_limit_stats()["fallback"]
+    
+    codes = [(await client.post("/limited")).status_code for _ in range(3)]
+    
+    assert codes == [200, 200, 429]
+    assert get_rate_limit_stats()["fallback"] == fallback + 3
@@ -0,0 +1,71 @@
+"""
+Single-Flight Cache Tests
+Purpose: Concurrent cache misses on one key share a single database query
+"""
+import asyncio
+
+import pytest
+
+from core import queries
+from core.optimized_database import OptimizedDatabaseManager
+
+pytestmark = pytest.mark.anyio
+
+LIST_SQL = " ".join(queries.BLOGS_LIST.sql.split())
+
+async def test_concurrent_misses_run_one_query(database, statements):
+    database._pool._latency = 0.05  # Keep the first query in flight while the rest arrive
+    
+    results = await asyncio.gather(*[database.fetch(queries.BLOGS_LIST, 20, 0) for _ in range(50)])
+    
+    assert statements.count(LIST_SQL) == 1
+    assert all(result == results[0] for result in results)
+    stats = database.get_single_flight_stats()
+    assert stats["queries"] == 1
+    assert stats["coalesced_waiters"] == 49
+    assert stats["in_flight"] == 0
+
+async def test_later_calls_hit_the_cache(database, statements):
+    await database.fetch(queries.BLOGS_LIST, 20, 0)
+    await database.fetch(queries.BLOGS_LIST, 20, 0)
+    
+    assert statements.count(LIST_SQL) == 1
+
+async def test_different_arguments_are_not_coalesced(database, statements):
+    database._pool._latency = 0.05
+    
+    await asyncio.gather(database.fetch(queries.BLOGS_LIST, 20, 0), database.fetch(queries.BLOGS_LIST, 20, 20))
+    
+    assert statements.count(LIST_SQL) == 2
+
+async def test_a_failed_query_fails_every_waiter(database, monkeypatch):
+    database._pool._latency = 0.05
+    
+    def fail(sql, args):
+        raise ValueError("boom")
+    
+    monkeypatch.setattr(database._memory_db, "run", fail)
+    results = await asyncio.gather(*[database.fetch(queries.BLOGS_LIST, 20, 0) for _ in range(5)], return_exceptions=True)
+    
+    assert all(isinstance(result, ValueError) for result in results)
+    assert database.get_single_flight_stats()["in_flight"] == 0
+
+async def test_lease_coalesces_across_workers(database, statements):
+    # A second manager over its own tables stands in for another worker
+    # sharing the same Redis
+    other = OptimizedDatabaseManager()
+    other._pool = other._create_memory_pool(1, 5)
+    other_statements = []
+    run = other._memory_db.run
+    other._memory_db.run = lambda sql, args: other_statements.append(sql) or run(sql, args)
+    database._pool._latency = 0.05
+    other._pool._latency = 0.05
+    
+    first, second = await asyncio.gather(
+        database.fetchval(queries.BLOGS_COUNT),
+        other.fetchval(queries.BLOGS_COUNT)
+    )
+    
+    assert first == second
+    assert len(statements) + len(other_statements) == 1
+    assert database.get_single_flight_stats()["lease_waits"] + other.get_single_flight_stats()["lease_waits"] == 1
@@ -0,0 +1,72 @@
+"""
+Stale-While-Revalidate Tests
+Purpose: Expired cache entries inside their grace window are served at once
+while a single background refresh updates them
+"""
+import asyncio
+import time
+
+import pytest
+
+from core import queries
+
+pytestmark = pytest.mark.anyio
+
+BY_ID_SQL = " ".join(queries.BLOGS_BY_ID.sql.split())
+
+@pytest.fixture
+def advance_clock(monkeypatch):
+    """Move time.time() forward so cached entries expire without sleeping"""
+    real_time = time.time
+    offset = 0.0
+    
+    def advance(seconds: float):
+        nonlocal offset
+        offset += seconds
+    
+    monkeypatch.setattr(time, "time", lambda: real_time() + offset)
+    return advance
+
+async def wait_for_refreshes(database):
+    while database.get_revalidation_stats()["refreshing"]:
+        await asyncio.sleep(0.01)
+
+async def test_stale_entry_served_while_one_refresh_runs(database, statements, advance_clock):
+    first = await database.fetchrow(queries.BLOGS_BY_ID, 1, cache_ttl=10, stale_ttl=60)
+    database._memory_db.blogs[1]["title"] = "Updated title"
+    database._pool._latency = 0.05  # Keep the refresh running while reads arrive
+    advance_clock(15)
+    
+    rows = await asyncio.gather(*[
+        database.fetchrow(queries.BLOGS_BY_ID, 1, cache_ttl=10, stale_ttl=60) for _ in range(10)
+    ])
+    
+    assert all(row["title"] == first["title"] for row in rows)
+    assert database.get_revalidation_stats()["stale_served"] == 10
+    await wait_for_refreshes(database)
+    assert statements.count(BY_ID_SQL) == 2
+    
+    refreshed = await database.fetchrow(queries.BLOGS_BY_ID, 1, cache_ttl=10, stale_ttl=60)
+    assert refreshed["title"] == "Updated title"
+    assert statements.count(BY_ID_SQL) == 2
+
+async def test_expired_entry_without_grace_is_a_miss(database, statements, advance_clock):
+    await database.fetchrow(queries.BLOGS_BY_ID, 1, cache_ttl=10)
+    database._memory_db.blogs[1]["title"] = "Updated title"
+    advance_clock(15)
+    
+    row = await database.fetchrow(queries.BLOGS_BY_ID, 1, cache_ttl=10)
+    
+    assert row["title"] == "Updated title"
+    assert statements.count(BY_ID_SQL) == 2
+    assert database.get_revalidation_stats()["stale_served"] == 0
+
+async def test_entry_past_grace_window_is_a_miss(database, statements, advance_clock):
+    await database.fetchrow(queries.BLOGS_BY_ID, 1, cache_ttl=10, stale_ttl=60)
+    database._memory_db.blogs[1]["title"] = "Updated title"
+    advance_clock(100)
+    
+    row = await database.fetchrow(queries.BLOGS_BY_ID, 1, cache_ttl=10, stale_ttl=60)
+    
+    assert row["title"] == "Updated title"
+    assert database.get_revalidation_stats()["stale_served"] == 0